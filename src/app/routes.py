@@ -23,13 +23,7 @@ from modules.BinanceClient import BinanceClient
 from modules.logging_setup import LOG_JSON_FILE, read_structured_logs
 from persistence.state_store import StateStore
 from services.order_sync import DEFAULT_PROFIT_CUTOFF, sync_filled_orders_from_binance
-from services.outcome_history import (
-    META_REBUILT,
-    build_outcome_board,
-    kind_hints_from_log,
-    match_trades_and_open_lots,
-    rebuild_outcomes_from_orders,
-)
+from services.outcome_history import stored_outcome_board, update_outcomes_from_orders
 from services.portfolio import fetch_portfolio
 
 routes = Blueprint("routes", __name__)
@@ -42,6 +36,8 @@ _history_lock = threading.Lock()
 _history_cache = {"ts": 0.0, "data": None}
 _spot_client = None
 _spot_client_key = None
+_state_store = None
+_state_store_lock = threading.Lock()
 
 
 def _create_spot_client(api_key: str, secret_key: str, testnet: bool):
@@ -65,8 +61,17 @@ def get_spot_client(api_key: str, secret_key: str, testnet: bool):
         return _spot_client
 
 
+def get_state_store() -> StateStore:
+    """One store per process, so request threads reuse their pooled connections."""
+    global _state_store
+    with _state_store_lock:
+        if _state_store is None:
+            _state_store = StateStore()
+        return _state_store
+
+
 def _last_buy_prices(assets) -> dict:
-    store = StateStore()
+    store = get_state_store()
     prices = {}
     for asset in assets:
         state = store.load_state(asset.operation_code)
@@ -113,7 +118,7 @@ def get_profit_board(force_refresh: bool = False):
             return cached
 
     # Sync/rebuild outside the lock so Binance latency does not block other readers.
-    store = StateStore()
+    store = get_state_store()
     settings, env = load_settings()
     take_profit_at = [float(level.at) for level in settings.risk.take_profit]
     stop_loss_pct = float(settings.risk.stop_loss_pct or 0)
@@ -132,28 +137,16 @@ def get_profit_board(force_refresh: bool = False):
             cutoff_iso=DEFAULT_PROFIT_CUTOFF,
         )
 
-    force_rebuild = (
-        force_refresh
-        or sync_info.get("inserted", 0) > 0
-        or store.get_meta(META_REBUILT) != "1"
-    )
-    rebuild_outcomes_from_orders(
+    # Incremental: only orders logged since the last refresh are matched.
+    update_outcomes_from_orders(
         store,
         take_profit_at=take_profit_at,
         stop_loss_pct=stop_loss_pct,
         log_path=LOG_JSON_FILE,
         cutoff_iso=DEFAULT_PROFIT_CUTOFF,
-        force=force_rebuild,
-    )
-    orders = store.list_orders(since=DEFAULT_PROFIT_CUTOFF)
-    hints = kind_hints_from_log(LOG_JSON_FILE, orders=orders)
-    closed, open_lots = match_trades_and_open_lots(
-        orders,
-        take_profit_at=take_profit_at,
-        stop_loss_pct=stop_loss_pct,
-        kind_hints=hints,
+        force=force_refresh,
     )
-    board = build_outcome_board(closed, open_lots=open_lots)
+    board = stored_outcome_board(store, DEFAULT_PROFIT_CUTOFF)
     board["sync"] = sync_info
 
     with _history_lock:
@@ -0,0 +1,189 @@
+from typing import Optional
+
+from backtest.replay import MemoryBroker, fill_record
+from services.market_data import MarketDataService
+from tests.backtestRunner import DEFAULT_FEE_RATE
+
+
+class MatchingBroker(MemoryBroker):
+    """
+    Replay broker with an order book of one account:
+
+    - MARKET orders and marketable LIMIT orders fill at once at the mark
+      price (the last close);
+    - other LIMIT orders rest until a later candle trades through them: a
+      BUY fills when ``low <= price``, a SELL when ``high >= price``, at the
+      limit or at the open if the candle gapped past it;
+    - resting fills per candle share ``participation * volume`` in time
+      priority, so large orders fill partially over several candles;
+    - quantities and prices are floored to ``step_size``/``tick_size``, and
+      ``fee_rate`` is charged in the received asset, as Binance does.
+
+    The broker settles the attached account's balances itself; orders the
+    free balance cannot cover come back ``REJECTED``.
+    """
+
+    settles_fills = True
+
+    def __init__(
+        self,
+        *,
+        fee_rate: float = DEFAULT_FEE_RATE,
+        participation: Optional[float] = 0.1,
+        tick_size: Optional[float] = None,
+        step_size: Optional[float] = None,
+        mark_price: float = 100.0,
+        clock=None,
+    ):
+        super().__init__(mark_price=mark_price, clock=clock)
+        self.fee_rate = fee_rate
+        self.participation = participation
+        self.tick_size = tick_size
+        self.step_size = step_size
+        self.account = None
+
+    def attach(self, account) -> None:
+        """Settle fills into ``account`` (base/quote balances, last prices)."""
+        self.account = account
+        self.tick_size = self.tick_size or account.tick_size
+        self.step_size = self.step_size or account.step_size
+
+    def _now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
+    @staticmethod
+    def _remaining(order: dict) -> float:
+        return float(order["origQty"]) - float(order["executedQty"])
+
+    def locked_balances(self) -> tuple[float, float]:
+        base = quote = 0.0
+        for order in self.open_orders:
+            if order["side"] == "BUY":
+                quote += self._remaining(order) * float(order["price"])
+            else:
+                base += self._remaining(order)
+        return round(base, 8), round(quote, 8)
+
+    def _free(self, side: str) -> float:
+        locked_base, locked_quote = self.locked_balances()
+        if side == "BUY":
+            return self.account.quote_balance - locked_quote
+        return self.account.base_balance - locked_base
+
+    def create_order(self, **kwargs):
+        side = kwargs["side"]
+        order_type = kwargs.get("type", "MARKET")
+        quantity = MarketDataService.adjust_to_step(
+            float(kwargs.get("quantity") or 0), self.step_size
+        )
+        if order_type == "MARKET" or not kwargs.get("price"):
+            price = self.mark_price
+        else:
+            price = MarketDataService.adjust_to_step(float(kwargs["price"]), self.tick_size)
+
+        now = self._now_ms()
+        order = {
+            "orderId": self._next_id,
+            "symbol": kwargs.get("symbol", "BTCUSDT"),
+            "side": side,
+            "type": order_type,
+            "status": "NEW",
+            "origQty": str(quantity),
+            "executedQty": "0",
+            "cummulativeQuoteQty": "0",
+            "price": str(price),
+            "transactTime": now,
+            "time": now,
+            "fills": [],
+        }
+        self._next_id += 1
+        self.orders.append(order)
+
+        needed = quantity * price if side == "BUY" else quantity
+        if quantity <= 0 or price <= 0 or needed > self._free(side) + 1e-9:
+            order["status"] = "REJECTED"
+            return dict(order)
+
+        marketable = order_type == "MARKET" or (
+            price >= self.mark_price if side == "BUY" else price <= self.mark_price
+        )
+        if marketable:
+            # Takers fill in full at the current price, never worse than the limit.
+            self._fill(order, quantity, self.mark_price)
+        else:
+            self.open_orders.append(order)
+            self.account._sync_account()
+        return dict(order)
+
+    def get_open_orders(self, symbol=None):
+        return [dict(order) for order in self.open_orders]
+
+    def cancel_order(self, symbol, orderId):
+        for order in self.open_orders:
+            if order["orderId"] == orderId:
+                order["status"] = "CANCELED"
+                self.open_orders.remove(order)
+                self.account._sync_account()
+                return dict(order)
+        return {"orderId": orderId, "status": "CANCELED"}
+
+    def match(self, open_price: float, high: float, low: float, close: float, volume: float):
+        capacity = float("inf") if self.participation is None else volume * self.participation
+        for order in list(self.open_orders):
+            if capacity <= 0:
+                break
+            price = float(order["price"])
+            if order["side"] == "BUY":
+                if low > price:
+                    continue
+                fill_price = min(price, open_price)
+            else:
+                if high < price:
+                    continue
+                fill_price = max(price, open_price)
+            quantity = MarketDataService.adjust_to_step(
+                min(self._remaining(order), capacity), self.step_size
+            )
+            if quantity <= 0:
+                break
+            capacity -= quantity
+            self._fill(order, quantity, fill_price)
+        self.mark_price = close
+
+    def _fill(self, order: dict, quantity: float, price: float) -> None:
+        quote = quantity * price
+        account = self.account
+        if order["side"] == "BUY":
+            commission, asset = quantity * self.fee_rate, account.stock_code
+            account.base_balance = round(account.base_balance + quantity - commission, 8)
+            account.quote_balance = round(account.quote_balance - quote, 8)
+        else:
+            commission, asset = quote * self.fee_rate, account.quote_asset
+            account.base_balance = round(account.base_balance - quantity, 8)
+            account.quote_balance = round(account.quote_balance + quote - commission, 8)
+
+        executed = round(float(order["executedQty"]) + quantity, 8)
+        cumulative = float(order["cummulativeQuoteQty"]) + quote
+        order["executedQty"] = str(executed)
+        order["cummulativeQuoteQty"] = str(cumulative)
+        order["fills"].append(
+            {
+                "price": str(price),
+                "qty": str(quantity),
+                "commission": str(commission),
+                "commissionAsset": asset,
+            }
+        )
+        if executed >= float(order["origQty"]):
+            order["status"] = "FILLED"
+            if order in self.open_orders:
+                self.open_orders.remove(order)
+        else:
+            order["status"] = "PARTIALLY_FILLED"
+
+        if order["side"] == "BUY":
+            account.last_buy_price = cumulative / executed
+        else:
+            account.last_sell_price = cumulative / executed
+        self.fills.append(fill_record(order, quantity, price, quote * self.fee_rate, self._now_ms()))
+        account._sync_account()
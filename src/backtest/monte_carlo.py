@@ -0,0 +1,223 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+import numpy as np
+
+METHODS = ("shuffle", "bootstrap")
+# Paths per task depend only on the inputs, so a seed gives the same
+# distribution with any worker count. Chunks hold up to CHUNK_PATHS paths and
+# at most CHUNK_CELLS values per (paths x steps) array: a chunk builds several
+# of them, so long equity curves get fewer paths per task.
+CHUNK_PATHS = 5_000
+CHUNK_CELLS = 4_000_000
+
+
+@dataclass
+class MonteCarloResult:
+    """Per-path outcomes of ``n_paths`` resampled equity paths."""
+
+    final_return_pct: np.ndarray
+    max_drawdown_pct: np.ndarray
+    ruined: np.ndarray
+    daily_limit_hit: Optional[np.ndarray] = None
+
+    @property
+    def n_paths(self) -> int:
+        return len(self.final_return_pct)
+
+    @property
+    def prob_ruin(self) -> float:
+        return float(self.ruined.mean()) if self.n_paths else 0.0
+
+    @property
+    def prob_daily_limit(self) -> Optional[float]:
+        if self.daily_limit_hit is None:
+            return None
+        return float(self.daily_limit_hit.mean()) if self.n_paths else 0.0
+
+    def summary(self, percentiles: Iterable[float] = (5, 25, 50, 75, 95)) -> dict:
+        percentiles = list(percentiles)
+        return {
+            "paths": self.n_paths,
+            "return_pct": dict(zip(percentiles, np.percentile(self.final_return_pct, percentiles))),
+            "max_drawdown_pct": dict(zip(percentiles, np.percentile(self.max_drawdown_pct, percentiles))),
+            "prob_ruin": self.prob_ruin,
+            "prob_daily_limit": self.prob_daily_limit,
+        }
+
+
+def _trade_day(trade: dict) -> str:
+    if trade.get("occurred_at"):
+        return str(trade["occurred_at"])[:10]
+    if trade.get("time") is not None:
+        return datetime.fromtimestamp(int(trade["time"]) / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+    return ""
+
+
+def trade_pnls(trades: Iterable[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Realized P&L (USD) of the closed trades in chronological order, and the
+    position of each trade's UTC day. Takes ``match_closed_trades`` rows,
+    ``trade_outcomes`` rows or portfolio backtest trades; rows without
+    ``pnl_usd`` (buys, open lots) are skipped.
+    """
+    closed = [trade for trade in trades if trade.get("pnl_usd") is not None]
+    closed.sort(key=lambda trade: (_trade_day(trade), str(trade.get("occurred_at") or trade.get("time") or "")))
+    pnls = np.fromiter((float(trade["pnl_usd"]) for trade in closed), dtype=np.float64, count=len(closed))
+    _days, day_index = np.unique([_trade_day(trade) for trade in closed], return_inverse=True)
+    return pnls, day_index.astype(np.int64).reshape(-1)
+
+
+def _max_drawdown_pct(equity: np.ndarray) -> np.ndarray:
+    peaks = np.maximum.accumulate(equity, axis=1)
+    drawdown = np.divide(peaks - equity, peaks, out=np.zeros_like(equity), where=peaks > 0)
+    return drawdown.max(axis=1) * 100
+
+
+def _trade_chunk(args) -> tuple:
+    pnls, day_index, n_paths, method, initial_balance, ruin_equity, max_daily_loss, seed = args
+    rng = np.random.default_rng(seed)
+    n = len(pnls)
+    if method == "shuffle":
+        order = np.argsort(rng.random((n_paths, n)), axis=1)
+    else:
+        order = rng.integers(0, n, size=(n_paths, n))
+    paths = pnls[order]
+
+    equity = np.empty((n_paths, n + 1))
+    equity[:, 0] = initial_balance
+    np.cumsum(paths, axis=1, out=equity[:, 1:])
+    equity[:, 1:] += initial_balance
+
+    daily_hit = None
+    if max_daily_loss is not None:
+        # Trades keep the original day slots; RiskManager counts losses only.
+        starts = np.flatnonzero(np.diff(day_index, prepend=-1))
+        daily_loss = np.add.reduceat(np.maximum(-paths, 0.0), starts, axis=1)
+        daily_hit = (daily_loss >= max_daily_loss).any(axis=1)
+    return (
+        (equity[:, -1] - initial_balance) / initial_balance * 100,
+        _max_drawdown_pct(equity),
+        (equity <= ruin_equity).any(axis=1),
+        daily_hit,
+    )
+
+
+def _returns_chunk(args) -> tuple:
+    returns, n_paths, length, block_size, ruin_fraction, seed = args
+    rng = np.random.default_rng(seed)
+    n = len(returns)
+    blocks = -(-length // block_size)
+    # Circular block bootstrap: random block starts, contiguous returns inside a block.
+    starts = rng.integers(0, n, size=(n_paths, blocks, 1))
+    index = ((starts + np.arange(block_size)) % n).reshape(n_paths, -1)[:, :length]
+    growth = np.cumprod(1.0 + returns[index], axis=1)
+    equity = np.concatenate([np.ones((n_paths, 1)), growth], axis=1)
+    return (
+        (equity[:, -1] - 1.0) * 100,
+        _max_drawdown_pct(equity),
+        (equity <= ruin_fraction).any(axis=1),
+        None,
+    )
+
+
+def chunk_paths(steps: int) -> int:
+    """Paths per task for paths of ``steps`` steps."""
+    return max(1, min(CHUNK_PATHS, CHUNK_CELLS // (steps + 1)))
+
+
+def _run_chunks(
+    worker, make_args, n_paths: int, steps: int, seed, max_workers: Optional[int]
+) -> MonteCarloResult:
+    per_chunk = chunk_paths(steps)
+    sizes = [per_chunk] * (n_paths // per_chunk)
+    if n_paths % per_chunk:
+        sizes.append(n_paths % per_chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [make_args(size, child) for size, child in zip(sizes, seeds)]
+    if max_workers is None or max_workers <= 1 or len(tasks) == 1:
+        parts = [worker(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parts = list(executor.map(worker, tasks))
+
+    daily = [part[3] for part in parts]
+    return MonteCarloResult(
+        final_return_pct=np.concatenate([part[0] for part in parts]),
+        max_drawdown_pct=np.concatenate([part[1] for part in parts]),
+        ruined=np.concatenate([part[2] for part in parts]),
+        daily_limit_hit=None if daily[0] is None else np.concatenate(daily),
+    )
+
+
+def monte_carlo_trades(
+    trades: Iterable[dict],
+    *,
+    initial_balance: float,
+    n_paths: int = 10_000,
+    method: str = "shuffle",
+    max_daily_loss_usdt: Optional[float] = None,
+    ruin_pct: float = 50.0,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Resample the closed-trade P&L sequence ``n_paths`` times: ``shuffle``
+    reorders the same trades (path risk of the realized results),
+    ``bootstrap`` draws them with replacement. A path is ruined when equity
+    touches ``ruin_pct`` % below ``initial_balance``; with
+    ``max_daily_loss_usdt`` each trade keeps its original day slot and the
+    result also gives the probability of a day hitting that limit.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Available: {', '.join(METHODS)}")
+    pnls, day_index = trade_pnls(trades)
+    if len(pnls) == 0:
+        raise ValueError("no closed trades with pnl_usd to resample")
+    ruin_equity = initial_balance * (1 - ruin_pct / 100)
+    return _run_chunks(
+        _trade_chunk,
+        lambda size, child: (
+            pnls, day_index, size, method, initial_balance, ruin_equity, max_daily_loss_usdt, child
+        ),
+        n_paths,
+        len(pnls),
+        seed,
+        max_workers,
+    )
+
+
+def bootstrap_equity(
+    equity_curve,
+    *,
+    n_paths: int = 10_000,
+    block_size: int = 20,
+    length: Optional[int] = None,
+    ruin_pct: float = 50.0,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Block-bootstrap the per-candle returns of ``equity_curve`` (e.g. a
+    ``backtestRunner`` result): blocks of ``block_size`` candles keep the
+    short-term autocorrelation of in-position stretches. Paths have the
+    curve's length unless ``length`` is given.
+    """
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    if len(equity) < 2:
+        raise ValueError("equity curve needs at least two points")
+    returns = equity[1:] / equity[:-1] - 1.0
+    length = length or len(returns)
+    block_size = max(1, min(block_size, len(returns)))
+    ruin_fraction = 1 - ruin_pct / 100
+    return _run_chunks(
+        _returns_chunk,
+        lambda size, child: (returns, size, length, block_size, ruin_fraction, child),
+        n_paths,
+        # The block index is built for whole blocks before it is trimmed to length.
+        -(-length // block_size) * block_size,
+        seed,
+        max_workers,
+    )
@@ -0,0 +1,242 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+from config.settings import RiskConfig
+from services.candle_frame import CandleFrame
+from services.risk_manager import RiskManager
+from tests.backtestRunner import (
+    DEFAULT_FEE_RATE,
+    DEFAULT_SLIPPAGE,
+    _max_drawdown,
+    _sharpe_approx,
+    _signal_series,
+)
+
+
+@dataclass
+class PortfolioAsset:
+    operation_code: str
+    candles: CandleFrame
+    traded_percentage: float = 100.0
+    traded_quantity: float = 0.0
+    # Binance's finest LOT_SIZE step; flooring keeps a 100% buy within the balance.
+    step_size: float = 1e-8
+    min_notional: float = 0.0
+
+
+@dataclass
+class PortfolioResult:
+    timeline: np.ndarray
+    equity_curve: np.ndarray
+    exposure: np.ndarray
+    asset_exposure: dict[str, np.ndarray]
+    trades: list[dict]
+    blocked: list[dict]
+    initial_balance: float
+    final_equity: float = field(init=False)
+    profit_percentage: float = field(init=False)
+    max_drawdown_pct: float = field(init=False)
+    sharpe_approx: float = field(init=False)
+    avg_exposure_pct: float = field(init=False)
+    max_exposure_pct: float = field(init=False)
+
+    def __post_init__(self):
+        curve = [self.initial_balance, *self.equity_curve.tolist()]
+        self.final_equity = curve[-1]
+        self.profit_percentage = (self.final_equity - self.initial_balance) / self.initial_balance * 100
+        self.max_drawdown_pct = _max_drawdown(curve)
+        self.sharpe_approx = _sharpe_approx(curve)
+        self.avg_exposure_pct = float(self.exposure.mean() * 100) if len(self.exposure) else 0.0
+        self.max_exposure_pct = float(self.exposure.max() * 100) if len(self.exposure) else 0.0
+
+
+def signal_events(signals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Candles where the carried-forward signal flips, and the side it flips to
+    (True = buy). Flat before the first signal, so an initial sell is no event.
+    """
+    signals = np.asarray(signals, dtype=np.float64)
+    index = np.flatnonzero(~np.isnan(signals))
+    values = signals[index] > 0
+    previous = np.concatenate(([False], values[:-1]))
+    changed = values != previous
+    return index[changed], values[changed]
+
+
+def _asset_signals(asset: PortfolioAsset, strategy, strategy_kwargs: dict) -> np.ndarray:
+    frame = asset.candles.to_frame()
+    signals = _signal_series(frame, strategy, None, strategy_kwargs)
+    if signals is not None:
+        return np.asarray(signals, dtype=np.float64)
+    # Strategies without ``signal_series``: one call per prefix, as backtestRunner does.
+    out = np.full(len(frame), np.nan)
+    for i in range(1, len(frame)):
+        signal = strategy(frame.iloc[: i + 1], verbose=False, **strategy_kwargs)
+        if signal is not None:
+            out[i] = float(bool(signal))
+    return out
+
+
+def _risk_manager(risk: RiskConfig, clock) -> RiskManager:
+    return RiskManager(
+        acceptable_loss_pct=risk.acceptable_loss_pct,
+        stop_loss_pct=risk.stop_loss_pct,
+        take_profit_at=[level.at for level in risk.take_profit],
+        take_profit_amount=[level.amount for level in risk.take_profit],
+        max_daily_loss_usdt=risk.max_daily_loss_usdt,
+        max_trades_per_day=risk.max_trades_per_day,
+        max_open_orders=risk.max_open_orders,
+        max_grid_trades_per_day=risk.max_grid_trades_per_day,
+        clock=clock,
+    )
+
+
+def portfolio_backtest(
+    assets: list[PortfolioAsset],
+    strategy,
+    *,
+    initial_balance: float = 1000.0,
+    risk: Optional[RiskConfig] = None,
+    fee_rate: float = DEFAULT_FEE_RATE,
+    slippage: float = DEFAULT_SLIPPAGE,
+    **strategy_kwargs,
+) -> PortfolioResult:
+    """
+    Trade ``strategy`` on every asset against one quote balance.
+
+    Signals are computed per asset in one vectorized pass and reduced to
+    their flips; the flips of all assets are merged by candle time (sells
+    first, freeing quote for the buys of the same instant) and only those
+    events run through a Python loop, sized like live with
+    ``compute_trade_quantity`` and gated by one ``RiskManager`` per asset
+    (``risk`` daily limits, on the candle's UTC day). Equity and exposure
+    are then rebuilt on the merged timeline with array lookups.
+
+    An order refused by the risk limits or the balance is dropped: the asset
+    waits for its next signal flip.
+    """
+    risk = risk or RiskConfig()
+    codes = [asset.operation_code for asset in assets]
+    open_times, closes = [], []
+    event_parts = []
+    for position, asset in enumerate(assets):
+        if asset.candles.open_time is None:
+            raise ValueError(f"{asset.operation_code}: portfolio candles need open_time")
+        open_time = np.asarray(asset.candles.open_time, dtype=np.int64)
+        close = np.asarray(asset.candles.column("close_price"), dtype=np.float64)
+        open_times.append(open_time)
+        closes.append(close)
+        bars, buys = signal_events(_asset_signals(asset, strategy, strategy_kwargs))
+        event_parts.append(
+            np.stack([open_time[bars], buys.astype(np.int64), np.full(len(bars), position), bars])
+        )
+
+    events = np.concatenate(event_parts, axis=1) if event_parts else np.empty((4, 0), np.int64)
+    # By time, then sells (0) before buys (1), then asset order.
+    events = events[:, np.lexsort((events[2], events[1], events[0]))]
+
+    now = [datetime.fromtimestamp(0, tz=timezone.utc)]
+    risk_managers = [_risk_manager(risk, lambda: now[0]) for _ in assets]
+    cash = initial_balance
+    quantities = np.zeros(len(assets))
+    costs = np.zeros(len(assets))
+    # Row 0 is the starting state, row k + 1 the state after event k.
+    cash_after = np.full(events.shape[1] + 1, initial_balance)
+    quantities_after = np.zeros((events.shape[1] + 1, len(assets)))
+    trades: list[dict] = []
+    blocked: list[dict] = []
+
+    for k, (time_ms, buy, position, bar) in enumerate(events.T):
+        asset = assets[position]
+        manager = risk_managers[position]
+        now[0] = datetime.fromtimestamp(time_ms / 1000, tz=timezone.utc)
+        side = "BUY" if buy else "SELL"
+        if buy != (quantities[position] > 0):
+            # Quote that still covers the fee once spent.
+            spendable = cash / (1 + fee_rate)
+            if buy:
+                price = closes[position][bar] * (1 + slippage)
+                quantity = manager.compute_trade_quantity(
+                    asset.traded_quantity,
+                    asset.traded_percentage,
+                    0.0,
+                    spendable,
+                    price,
+                    side,
+                    min_notional=asset.min_notional,
+                    step_size=asset.step_size,
+                )
+            else:
+                price = closes[position][bar] * (1 - slippage)
+                quantity = quantities[position]
+            ok, reason = manager.validate_order(
+                side=side,
+                quantity=quantity,
+                price=price,
+                quote_balance=spendable,
+                base_balance=quantities[position],
+                min_notional=asset.min_notional,
+                step_size=asset.step_size,
+                open_orders_count=0,
+            )
+            if not ok:
+                blocked.append(
+                    {"time": int(time_ms), "operation_code": codes[position], "side": side, "reason": reason}
+                )
+            else:
+                notional = quantity * price
+                fee = notional * fee_rate
+                if buy:
+                    cash -= notional + fee
+                    quantities[position] = quantity
+                    costs[position] = notional + fee
+                    manager.record_trade_pnl(0)
+                    pnl = None
+                else:
+                    cash += notional - fee
+                    pnl = notional - fee - costs[position]
+                    quantities[position] = 0.0
+                    costs[position] = 0.0
+                    manager.record_trade_pnl(pnl)
+                trades.append(
+                    {
+                        "time": int(time_ms),
+                        "operation_code": codes[position],
+                        "side": side,
+                        "quantity": float(quantity),
+                        "price": float(price),
+                        "fee": float(fee),
+                        "pnl_usd": pnl,
+                    }
+                )
+        cash_after[k + 1] = cash
+        quantities_after[k + 1] = quantities
+
+    timeline = np.unique(np.concatenate(open_times)) if open_times else np.empty(0, np.int64)
+    # State after the last event at or before each instant of the timeline.
+    state = np.searchsorted(events[0], timeline, side="right")
+    values = np.zeros((len(timeline), len(assets)))
+    for position in range(len(assets)):
+        bar = np.searchsorted(open_times[position], timeline, side="right") - 1
+        marks = np.where(bar >= 0, closes[position][np.maximum(bar, 0)], 0.0)
+        # Marked at the exit price, like backtestRunner.
+        values[:, position] = quantities_after[state, position] * marks * (1 - slippage)
+
+    equity = cash_after[state] + values.sum(axis=1)
+    exposure = np.divide(values.sum(axis=1), equity, out=np.zeros_like(equity), where=equity > 0)
+    asset_exposure = {
+        code: np.divide(values[:, i], equity, out=np.zeros_like(equity), where=equity > 0)
+        for i, code in enumerate(codes)
+    }
+    return PortfolioResult(
+        timeline=timeline,
+        equity_curve=equity,
+        exposure=exposure,
+        asset_exposure=asset_exposure,
+        trades=trades,
+        blocked=blocked,
+        initial_balance=initial_balance,
+    )
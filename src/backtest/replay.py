@@ -1,21 +1,45 @@
+import logging
+import sys
+import threading
 import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timezone
 
 import pandas as pd
 
 from core.state_fields import PersistedTradeFields
-from persistence.state_store import StateStore
+from indicators.streaming import IndicatorStream
+from persistence.state_store import MEMORY_DB, StateStore
+from services.candle_frame import FRAME_COLUMNS, PRICE_COLUMNS, CandleFrame
 from services.order_executor import OrderExecutor
 from services.risk_manager import RiskManager
 from services.regime_detector import RegimeDetector
+from tests.backtestRunner import _max_drawdown
 
 
 class ReplayMarketData:
-    def __init__(self, frame: pd.DataFrame, end_index: int | None = None):
+    """
+    Serves ``frame`` as if ``end_index`` candles had closed so far. Each fetch
+    returns the last ``limit`` (default ``window``) of them as a view (no
+    copy), re-indexed from 0 like the live kline window.
+    """
+
+    def __init__(self, frame: pd.DataFrame, end_index: int | None = None, window: int = 1000):
         self.frame = frame
         self.end_index = len(frame) if end_index is None else end_index
-
-    def fetch_klines(self, limit: int = 1000) -> pd.DataFrame:
-        return self.frame.iloc[: self.end_index].copy().reset_index(drop=True)
+        self.window = window
+        if set(frame.columns) <= set(FRAME_COLUMNS) and set(PRICE_COLUMNS) <= set(frame.columns):
+            # One float64 block shared by every window.
+            self._source = CandleFrame.from_frame(frame).to_frame()
+        else:
+            self._source = frame
+
+    def fetch_klines(self, limit: int | None = None) -> pd.DataFrame:
+        start = max(self.end_index - (self.window if limit is None else limit), 0)
+        window = self._source.iloc[start : self.end_index]
+        window.index = pd.RangeIndex(len(window))
+        return window
 
     def get_account_balance(self, asset_code: str, account_data: dict) -> float:
         for stock in account_data.get("balances", []):
@@ -27,13 +51,43 @@ class ReplayMarketData:
         return balance >= step_size
 
 
+def fill_record(order: dict, quantity: float, price: float, fee: float, time_ms: int) -> dict:
+    return {
+        "order_id": order["orderId"],
+        "side": order["side"],
+        "type": order["type"],
+        "quantity": quantity,
+        "price": price,
+        "fee": fee,
+        "time": time_ms,
+    }
+
+
 class MemoryBroker:
-    def __init__(self, mark_price: float = 100.0):
+    """
+    Fills every order in full, at once, at its price; the executor settles
+    the balances (``fill_buy``/``fill_sell``). See ``MatchingBroker`` for
+    resting limit orders.
+    """
+
+    settles_fills = False
+
+    def __init__(self, mark_price: float = 100.0, clock=None):
         self.mark_price = mark_price
+        self.clock = clock or time.time
         self.orders: list[dict] = []
+        self.fills: list[dict] = []
         self._next_id = 1
         self.open_orders: list[dict] = []
 
+    def match(self, open_price: float, high: float, low: float, close: float, volume: float):
+        """Called with each replayed candle before the engine cycle."""
+        self.mark_price = close
+
+    def locked_balances(self) -> tuple[float, float]:
+        """(base, quote) held by resting orders."""
+        return 0.0, 0.0
+
     def create_order(self, **kwargs):
         quantity = float(kwargs.get("quantity") or 0)
         price = float(kwargs.get("price") or self.mark_price)
@@ -48,12 +102,13 @@ class MemoryBroker:
             "executedQty": str(quantity),
             "cummulativeQuoteQty": str(quantity * price),
             "price": str(price),
-            "transactTime": int(time.time() * 1000),
-            "time": int(time.time() * 1000),
+            "transactTime": int(self.clock() * 1000),
+            "time": int(self.clock() * 1000),
             "fills": [{"price": str(price), "commissionAsset": "USDT"}],
         }
         self._next_id += 1
         self.orders.append(order)
+        self.fills.append(fill_record(order, quantity, price, 0.0, order["transactTime"]))
         return order
 
     def get_open_orders(self, symbol=None):
@@ -83,6 +138,8 @@ class FakeBot(PersistedTradeFields):
         stop_loss_pct: float = 2.0,
         take_profit_at=None,
         take_profit_amount=None,
+        traded_percentage: float = 100.0,
+        broker=None,
     ):
         self.engine = None
         self.operation_code = "BTCUSDT"
@@ -93,7 +150,7 @@ class FakeBot(PersistedTradeFields):
         self.quote_balance = quote_balance
         self.base_balance = base_balance
         self.traded_quantity = 0.0
-        self.traded_percentage = 100.0
+        self.traded_percentage = traded_percentage
         self.min_notional = 5.0
         self.step_size = 0.001
         self.tick_size = 0.01
@@ -112,22 +169,23 @@ class FakeBot(PersistedTradeFields):
         self.open_orders = []
         self.account_data = {"balances": []}
         self.last_stock_account_balance = base_balance
-        self.broker = MemoryBroker(
+        self.broker = broker or MemoryBroker(
             mark_price=float(stock_data["close_price"].iloc[-1]) if len(stock_data) else 100.0
         )
 
     def _sync_account(self):
+        locked_base, locked_quote = self.broker.locked_balances()
         self.account_data = {
             "balances": [
                 {
                     "asset": self.stock_code,
-                    "free": str(self.base_balance),
-                    "locked": "0",
+                    "free": str(round(self.base_balance - locked_base, 8)),
+                    "locked": str(locked_base),
                 },
                 {
                     "asset": self.quote_asset,
-                    "free": str(self.quote_balance),
-                    "locked": "0",
+                    "free": str(round(self.quote_balance - locked_quote, 8)),
+                    "locked": str(locked_quote),
                 },
             ]
         }
@@ -150,11 +208,13 @@ class FakeBot(PersistedTradeFields):
         return float(self.last_sell_price or 0)
 
     def getOpenOrders(self):
-        return list(self.broker.open_orders)
+        return self.broker.get_open_orders(self.operation_code)
 
     def cancelAllOrders(self):
-        self.broker.open_orders = []
+        for order in self.broker.get_open_orders(self.operation_code):
+            self.broker.cancel_order(symbol=self.operation_code, orderId=order["orderId"])
         self.open_orders = []
+        self._sync_account()
 
     def sellMarketOrder(self, quantity=None):
         qty = float(quantity or self.base_balance)
@@ -166,17 +226,21 @@ class FakeBot(PersistedTradeFields):
             quantity=qty,
             price=price,
         )
-        proceeds = qty * price
-        self.base_balance = round(self.base_balance - qty, 8)
-        self.quote_balance = round(self.quote_balance + proceeds, 8)
+        if not self.broker.settles_fills:
+            proceeds = qty * price
+            self.base_balance = round(self.base_balance - qty, 8)
+            self.quote_balance = round(self.quote_balance + proceeds, 8)
         self._sync_account()
         return order
 
+    def _has_open_order(self, side: str) -> bool:
+        return any(o["side"] == side for o in self.broker.get_open_orders(self.operation_code))
+
     def hasOpenBuyOrder(self):
-        return False
+        return self._has_open_order("BUY")
 
     def hasOpenSellOrder(self):
-        return False
+        return self._has_open_order("SELL")
 
     def getMinimumPriceToSell(self):
         return float(self.last_buy_price or 0) * 0.99
@@ -210,7 +274,11 @@ def fill_sell(bot: FakeBot, order: dict):
 
 
 class ReplayOrderExecutor(OrderExecutor):
-    def buy_limited(self, stock_data, traded_quantity: float, price: float = 0):
+    def buy_limited(
+        self, stock_data, traded_quantity: float, price: float = 0, indicators=None
+    ):
+        if self.client.settles_fills:
+            return super().buy_limited(stock_data, traded_quantity, price, indicators)
         close_price = float(stock_data["close_price"].iloc[-1])
         self.client.mark_price = close_price
         order = self.client.create_order(
@@ -233,7 +301,18 @@ class ReplayOrderExecutor(OrderExecutor):
         acceptable_loss_pct: float,
         min_sell_price_fn,
         price: float = 0,
+        indicators=None,
     ):
+        if self.client.settles_fills:
+            return super().sell_limited(
+                stock_data,
+                balance,
+                last_buy_price,
+                acceptable_loss_pct,
+                min_sell_price_fn,
+                price,
+                indicators,
+            )
         close_price = float(stock_data["close_price"].iloc[-1])
         self.client.mark_price = close_price
         order = self.client.create_order(
@@ -256,11 +335,29 @@ def build_replay_engine(
     quote_balance: float = 1000.0,
     base_balance: float = 0.0,
     main_strategy=None,
+    main_strategy_args: dict | None = None,
     fallback_activated: bool = False,
     regime_enabled: bool = False,
     stop_loss_pct: float = 2.0,
+    take_profit_at=None,
+    take_profit_amount=None,
+    traded_percentage: float = 100.0,
     max_daily_loss_usdt: float = 10_000.0,
+    max_trades_per_day: int = 50,
+    grid_manager=None,
+    breakout_detector=None,
+    indicator_stream=None,
+    clock=None,
+    broker=None,
+    window: int = 1000,
 ):
+    """
+    Real ``TradingEngine`` over in-memory fakes. ``clock`` (UTC datetime
+    source) drives order timestamps and the daily risk counters. ``broker``
+    replaces the instant-fill ``MemoryBroker``, e.g. with a ``MatchingBroker``
+    whose limit orders rest until a later candle crosses them. ``window`` is
+    the number of candles each kline fetch returns.
+    """
     from core.trading_engine import TradingEngine
 
     bot = FakeBot(
@@ -270,8 +367,18 @@ def build_replay_engine(
         main_strategy=main_strategy,
         fallback_activated=fallback_activated,
         stop_loss_pct=stop_loss_pct,
+        take_profit_at=take_profit_at,
+        take_profit_amount=take_profit_amount,
+        traded_percentage=traded_percentage,
+        broker=broker,
     )
-    market = ReplayMarketData(stock_data)
+    if broker is not None:
+        broker.attach(bot)
+    if main_strategy_args:
+        bot.main_strategy_args = dict(main_strategy_args)
+    if clock is not None:
+        bot.broker.clock = lambda: clock().timestamp()
+    market = ReplayMarketData(stock_data, window=window)
     executor = ReplayOrderExecutor(
         bot.broker, bot.operation_code, bot.stock_code, bot.tick_size, bot.step_size
     )
@@ -279,12 +386,13 @@ def build_replay_engine(
     risk = RiskManager(
         acceptable_loss_pct=1.0,
         stop_loss_pct=stop_loss_pct,
-        take_profit_at=[],
-        take_profit_amount=[],
+        take_profit_at=take_profit_at or [],
+        take_profit_amount=take_profit_amount or [],
         max_daily_loss_usdt=max_daily_loss_usdt,
-        max_trades_per_day=50,
+        max_trades_per_day=max_trades_per_day,
         state_store=store,
         operation_code=bot.operation_code,
+        clock=clock,
     )
     regime = RegimeDetector(enabled=regime_enabled, min_candles=60)
     engine = TradingEngine(
@@ -294,7 +402,176 @@ def build_replay_engine(
         risk_manager=risk,
         state_store=store,
         regime_detector=regime,
+        grid_manager=grid_manager,
+        breakout_detector=breakout_detector,
         sleep=lambda _s: None,
+        indicator_stream=indicator_stream,
+        clock=clock,
     )
     bot._sync_account()
     return bot, engine
+
+
+@dataclass
+class ReplayResult:
+    equity_curve: list[float]
+    trades: list[dict]
+    outcomes: list[dict]
+    initial_equity: float
+
+    @property
+    def final_equity(self) -> float:
+        return self.equity_curve[-1] if self.equity_curve else self.initial_equity
+
+    @property
+    def profit_percentage(self) -> float:
+        return (self.final_equity - self.initial_equity) / self.initial_equity * 100
+
+    @property
+    def max_drawdown_pct(self) -> float:
+        return _max_drawdown([self.initial_equity, *self.equity_curve])
+
+
+# Threads inside a quiet replay; other threads keep their stdout and logging.
+_quiet_threads: set[int] = set()
+_quiet_lock = threading.Lock()
+_quiet_stdout = None
+
+
+def _not_quiet(record: logging.LogRecord) -> bool:
+    return record.thread not in _quiet_threads
+
+
+class _ThreadQuietStdout:
+    """``sys.stdout`` stand-in that drops writes from quiet replay threads."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        if threading.get_ident() in _quiet_threads:
+            return len(text)
+        return self.stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _log_filterers() -> list[logging.Filterer]:
+    loggers = [logging.getLogger(), logging.getLogger("traderbot")]
+    loggers += [item for item in logging.root.manager.loggerDict.values() if isinstance(item, logging.Logger)]
+    filterers = {id(logger): logger for logger in loggers}
+    for logger in loggers:
+        filterers.update((id(handler), handler) for handler in logger.handlers)
+    if logging.lastResort is not None:
+        filterers[id(logging.lastResort)] = logging.lastResort
+    return list(filterers.values())
+
+
+@contextmanager
+def _quiet():
+    """
+    Silence engine banners (stdout) and log records of the calling thread for
+    the duration of a replay. Records are dropped on the record's thread by a
+    filter on every logger, so a handler that ``basicConfig`` installs mid-replay
+    still sees nothing; handler (and ``lastResort``) filters cover records of
+    loggers created during the replay.
+    """
+    global _quiet_stdout
+    thread = threading.get_ident()
+    with _quiet_lock:
+        if not _quiet_threads:
+            _quiet_stdout = _ThreadQuietStdout(sys.stdout)
+            sys.stdout = _quiet_stdout
+        _quiet_threads.add(thread)
+        for filterer in _log_filterers():
+            filterer.addFilter(_not_quiet)
+    try:
+        yield
+    finally:
+        with _quiet_lock:
+            _quiet_threads.discard(thread)
+            if not _quiet_threads:
+                for filterer in _log_filterers():
+                    filterer.removeFilter(_not_quiet)
+                if sys.stdout is _quiet_stdout:
+                    sys.stdout = _quiet_stdout.stream
+                _quiet_stdout = None
+
+
+def replay_history(
+    stock_data: pd.DataFrame,
+    *,
+    warmup: int = 200,
+    window: int = 1000,
+    store: StateStore | None = None,
+    quiet: bool = True,
+    quote_balance: float = 1000.0,
+    **engine_kwargs,
+) -> ReplayResult:
+    """
+    Walk ``stock_data`` candle by candle through the real engine: one
+    ``execute()`` per candle after ``warmup``, each seeing the last ``window``
+    candles. State lives in an in-memory ``StateStore`` unless one is given;
+    ``outcomes`` holds every outcome of this replay, oldest first.
+    With an ``open_time`` column the candle time is the engine's clock, so
+    daily limits reset as they would live. Each newly closed candle is
+    matched against the broker's resting orders before the cycle runs. Other
+    keyword arguments go to ``build_replay_engine``.
+    """
+    frame = stock_data.reset_index(drop=True)
+    store = store or StateStore(MEMORY_DB)
+    open_times = None
+    if "open_time" in frame.columns:
+        open_times = pd.DatetimeIndex(pd.to_datetime(frame["open_time"], utc=True)).to_pydatetime()
+    end = max(1, min(warmup, len(frame)))
+    # Reads ``end`` at call time: the loop below advances it candle by candle.
+    clock = None if open_times is None else (lambda: open_times[end - 1])
+
+    engine_kwargs.setdefault("indicator_stream", IndicatorStream())
+    bot, engine = build_replay_engine(
+        frame,
+        store=store,
+        quote_balance=quote_balance,
+        clock=clock,
+        window=window,
+        **engine_kwargs,
+    )
+    # Outcomes are stamped with the engine clock; a given store may hold older ones.
+    since = (clock or (lambda: datetime.now(timezone.utc)))().isoformat()
+    market = engine.market_data
+    candles = market._source[["open_price", "high_price", "low_price", "close_price", "volume"]]
+    candles = candles.to_numpy(dtype=float)
+    closes = candles[:, 3]
+    initial_equity = bot.quote_balance + bot.base_balance * closes[end - 1]
+    equity_curve: list[float] = []
+    trades: list[dict] = []
+
+    with _quiet() if quiet else nullcontext():
+        market.end_index = end
+        engine.bootstrap()
+        for end in range(end, len(frame) + 1):
+            market.end_index = end
+            seen = len(bot.broker.fills)
+            bot.broker.match(*candles[end - 1])
+            engine.execute()
+            for fill in bot.broker.fills[seen:]:
+                trades.append(
+                    {
+                        "index": end - 1,
+                        "time": None if open_times is None else open_times[end - 1].isoformat(),
+                        "side": fill["side"],
+                        "quantity": fill["quantity"],
+                        "price": fill["price"],
+                        "fee": fill["fee"],
+                        "order_id": fill["order_id"],
+                    }
+                )
+            equity_curve.append(bot.quote_balance + bot.base_balance * closes[end - 1])
+
+    return ReplayResult(
+        equity_curve=equity_curve,
+        trades=trades,
+        outcomes=store.outcomes_since(since),
+        initial_equity=initial_equity,
+    )
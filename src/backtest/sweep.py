@@ -0,0 +1,230 @@
+import csv
+import itertools
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import yaml
+
+from persistence.backtest_results import data_range
+from services.candle_frame import PRICE_COLUMNS, CandleFrame
+from strategies.registry import resolve_strategy
+from tests.backtestRunner import DEFAULT_FEE_RATE, DEFAULT_SLIPPAGE, backtestRunner
+
+METRIC_COLUMNS = (
+    "profit_percentage",
+    "trades",
+    "max_drawdown_pct",
+    "total_fees",
+    "sharpe_approx",
+    "final_balance",
+)
+
+
+@dataclass
+class SweepSpec:
+    strategy: str
+    grid: dict[str, list]
+    fixed: dict = field(default_factory=dict)
+    periods: int = 900
+    initial_balance: float = 1000
+    fee_rate: float = DEFAULT_FEE_RATE
+    slippage: float = DEFAULT_SLIPPAGE
+    candle_period: Optional[str] = None
+    symbol: Optional[str] = None
+    data: Optional[str] = None
+
+    @classmethod
+    def from_yaml(cls, path) -> "SweepSpec":
+        with open(path, "r", encoding="utf-8") as f:
+            raw = yaml.safe_load(f) or {}
+        if not raw.get("strategy"):
+            raise ValueError("sweep config requires 'strategy'")
+        grid = raw.get("grid") or {}
+        if not grid:
+            raise ValueError("sweep config requires a non-empty 'grid'")
+        raw["grid"] = {
+            name: values if isinstance(values, list) else [values]
+            for name, values in grid.items()
+        }
+        resolve_strategy(raw["strategy"])
+        return cls(**raw)
+
+    def combinations(self) -> list[dict]:
+        names = sorted(self.grid)
+        return [
+            dict(zip(names, values))
+            for values in itertools.product(*(self.grid[name] for name in names))
+        ]
+
+
+def param_key(params: dict) -> str:
+    return json.dumps(params, sort_keys=True)
+
+
+def run_inputs(spec: SweepSpec, candles: CandleFrame) -> dict:
+    """
+    Everything besides the grid values that a row's metrics depend on. Rows
+    of one output file must share these, so a sweep only resumes on them.
+    """
+    return {
+        "strategy": spec.strategy,
+        "params": sorted(spec.grid),
+        "fixed": spec.fixed,
+        "periods": spec.periods,
+        "initial_balance": spec.initial_balance,
+        "fee_rate": spec.fee_rate,
+        "slippage": spec.slippage,
+        "data": data_range(candles),
+    }
+
+
+def run_path(out_path) -> Path:
+    """Sidecar holding the ``run_inputs`` the rows of ``out_path`` were computed under."""
+    return Path(f"{out_path}.run.json")
+
+
+def _check_resumable(out_path, inputs: dict) -> None:
+    path = Path(out_path)
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    sidecar = run_path(out_path)
+    if not sidecar.exists():
+        raise ValueError(f"{out_path} has no {sidecar.name}; cannot tell which inputs its rows used")
+    stored = json.loads(sidecar.read_text(encoding="utf-8"))
+    current = json.loads(json.dumps(inputs, default=str))
+    changed = sorted(name for name in stored.keys() | current.keys() if stored.get(name) != current.get(name))
+    if changed:
+        raise ValueError(
+            f"{out_path} holds results for other sweep inputs ({', '.join(changed)}); "
+            "use another output file"
+        )
+
+
+class MappedCandles:
+    """
+    Candles written once to ``.npy`` files and memory-mapped by every worker,
+    so each task receives only its parameter dict instead of a pickled frame.
+    """
+
+    def __init__(self, candles: CandleFrame, directory=None):
+        self._tmp = tempfile.TemporaryDirectory(prefix="sweep-candles-", dir=directory)
+        self.path = self._tmp.name
+        values = np.stack([candles.column(col) for col in PRICE_COLUMNS])
+        np.save(os.path.join(self.path, "values.npy"), values)
+        if candles.open_time is not None:
+            np.save(os.path.join(self.path, "open_time.npy"), candles.open_time)
+
+    @staticmethod
+    def load(path: str) -> CandleFrame:
+        values = np.load(os.path.join(path, "values.npy"), mmap_mode="r")
+        open_time_path = os.path.join(path, "open_time.npy")
+        open_time = None
+        if os.path.exists(open_time_path):
+            open_time = np.load(open_time_path, mmap_mode="r")
+        return CandleFrame(values, open_time)
+
+    def close(self) -> None:
+        self._tmp.cleanup()
+
+    def __enter__(self) -> "MappedCandles":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_worker: dict = {}
+
+
+def _init_worker(candles_path: str, spec: SweepSpec) -> None:
+    _worker["stock_data"] = MappedCandles.load(candles_path).to_frame()
+    _worker["strategy"] = resolve_strategy(spec.strategy)
+    _worker["spec"] = spec
+
+
+def _run_combination(params: dict) -> tuple[dict, dict]:
+    spec: SweepSpec = _worker["spec"]
+    result = backtestRunner(
+        stock_data=_worker["stock_data"],
+        strategy_function=_worker["strategy"],
+        periods=spec.periods,
+        initial_balance=spec.initial_balance,
+        fee_rate=spec.fee_rate,
+        slippage=spec.slippage,
+        verbose=False,
+        **{**spec.fixed, **params},
+    )
+    return params, result
+
+
+def completed_keys(out_path) -> set[str]:
+    """Keys already present in ``out_path``; a torn last line is dropped."""
+    path = Path(out_path)
+    if not path.exists() or path.stat().st_size == 0:
+        return set()
+    _truncate_partial_line(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return {row["key"] for row in csv.DictReader(f) if row.get("key")}
+
+
+def _truncate_partial_line(path: Path) -> None:
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data.endswith(b"\n"):
+            return
+        f.truncate(data.rfind(b"\n") + 1)
+
+
+def run_sweep(
+    spec: SweepSpec,
+    candles: CandleFrame,
+    out_path,
+    *,
+    max_workers: Optional[int] = None,
+    on_result=None,
+) -> int:
+    """
+    Run every grid combination not yet in ``out_path`` on a process pool and
+    append one CSV row per finished backtest (flushed, so a stopped sweep
+    resumes from the rows on disk). Resuming requires the same
+    ``run_inputs``, else ``ValueError``. Returns the number of combinations run.
+    """
+    inputs = run_inputs(spec, candles)
+    _check_resumable(out_path, inputs)
+    done = completed_keys(out_path)
+    pending = [params for params in spec.combinations() if param_key(params) not in done]
+    if not pending:
+        return 0
+
+    param_names = sorted(spec.grid)
+    columns = ["key", *param_names, *METRIC_COLUMNS]
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    write_header = not Path(out_path).exists() or Path(out_path).stat().st_size == 0
+    if write_header:
+        run_path(out_path).write_text(json.dumps(inputs, indent=2, default=str), encoding="utf-8")
+
+    with MappedCandles(candles) as mapped, open(out_path, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        if write_header:
+            writer.writeheader()
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(mapped.path, spec),
+        ) as executor:
+            futures = [executor.submit(_run_combination, params) for params in pending]
+            for future in as_completed(futures):
+                params, result = future.result()
+                row = {"key": param_key(params), **params}
+                row.update({name: result[name] for name in METRIC_COLUMNS})
+                writer.writerow(row)
+                f.flush()
+                if on_result is not None:
+                    on_result(params, result)
+    return len(pending)
@@ -0,0 +1,156 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from backtest.sweep import MappedCandles, SweepSpec
+from services.candle_frame import CandleFrame
+from strategies.registry import resolve_strategy
+from tests.backtestRunner import _max_drawdown, _sharpe_approx, backtestRunner
+
+
+def _calmar(result: dict) -> float:
+    return result["profit_percentage"] / max(result["max_drawdown_pct"], 1e-9)
+
+
+OBJECTIVES = {
+    "sharpe": lambda result: result["sharpe_approx"],
+    "profit": lambda result: result["profit_percentage"],
+    "calmar": _calmar,
+}
+
+
+@dataclass
+class WalkForwardWindow:
+    index: int
+    train_start: int
+    test_start: int
+    test_end: int
+    params: dict
+    train: dict
+    test: dict
+
+
+@dataclass
+class WalkForwardResult:
+    windows: list[WalkForwardWindow]
+    equity_curve: list[float]
+    initial_balance: float
+    profit_percentage: float = field(init=False)
+    max_drawdown_pct: float = field(init=False)
+    sharpe_approx: float = field(init=False)
+
+    def __post_init__(self):
+        final = self.equity_curve[-1]
+        self.profit_percentage = (final - self.initial_balance) / self.initial_balance * 100
+        self.max_drawdown_pct = _max_drawdown(self.equity_curve)
+        self.sharpe_approx = _sharpe_approx(self.equity_curve)
+
+
+def window_bounds(total: int, train_size: int, test_size: int, step: Optional[int] = None):
+    """(train_start, test_start, test_end) of each rolling window over ``total`` candles."""
+    step = step or test_size
+    if step < test_size:
+        raise ValueError("step must be >= test_size: out-of-sample windows cannot overlap")
+    bounds = []
+    test_start = train_size
+    while test_start + test_size <= total:
+        bounds.append((test_start - train_size, test_start, test_start + test_size))
+        test_start += step
+    return bounds
+
+
+_worker: dict = {}
+
+
+def _init_worker(candles_path: str, spec: SweepSpec, objective: str) -> None:
+    _worker["stock_data"] = MappedCandles.load(candles_path).to_frame()
+    _worker["strategy"] = resolve_strategy(spec.strategy)
+    _worker["spec"] = spec
+    _worker["objective"] = OBJECTIVES[objective]
+
+
+def _backtest(stock_data, params: dict, warmup: int = 0) -> dict:
+    spec: SweepSpec = _worker["spec"]
+    return backtestRunner(
+        stock_data=stock_data,
+        strategy_function=_worker["strategy"],
+        periods=len(stock_data),
+        initial_balance=spec.initial_balance,
+        fee_rate=spec.fee_rate,
+        slippage=spec.slippage,
+        verbose=False,
+        warmup=warmup,
+        **{**spec.fixed, **params},
+    )
+
+
+def _run_window(index: int, bounds: tuple[int, int, int]) -> WalkForwardWindow:
+    train_start, test_start, test_end = bounds
+    stock_data = _worker["stock_data"]
+    spec: SweepSpec = _worker["spec"]
+    score = _worker["objective"]
+
+    train_data = stock_data.iloc[train_start:test_start]
+    best_params, best_train, best_key = None, None, None
+    for params in spec.combinations():
+        result = _backtest(train_data, params)
+        # Ties go to the shallower drawdown, then to the first combination.
+        key = (score(result), -result["max_drawdown_pct"])
+        if best_key is None or key > best_key:
+            best_params, best_train, best_key = params, result, key
+
+    # The training window is the indicators' history for the out-of-sample run.
+    test = _backtest(
+        stock_data.iloc[train_start:test_end], best_params, warmup=test_start - train_start
+    )
+    best_train = {k: v for k, v in best_train.items() if k != "equity_curve"}
+    return WalkForwardWindow(
+        index, train_start, test_start, test_end, best_params, best_train, test
+    )
+
+
+def stitch_equity(windows: list[WalkForwardWindow], initial_balance: float) -> list[float]:
+    """Chain the out-of-sample curves, compounding each window from the previous end."""
+    curve = [initial_balance]
+    for window in windows:
+        window_curve = window.test["equity_curve"]
+        scale = curve[-1] / window_curve[0]
+        curve.extend(value * scale for value in window_curve[1:])
+    return curve
+
+
+def walk_forward(
+    spec: SweepSpec,
+    candles: CandleFrame,
+    *,
+    train_size: int,
+    test_size: int,
+    step: Optional[int] = None,
+    objective: str = "sharpe",
+    max_workers: Optional[int] = None,
+) -> WalkForwardResult:
+    """
+    Optimize ``spec.grid`` on each training window, trade the winner on the
+    following ``test_size`` candles and roll forward. Windows run in parallel
+    processes sharing the memory-mapped candles.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}'. Available: {', '.join(OBJECTIVES)}")
+    bounds = window_bounds(len(candles), train_size, test_size, step)
+    if not bounds:
+        raise ValueError(
+            f"{len(candles)} candles are not enough for train={train_size} + test={test_size}"
+        )
+
+    with MappedCandles(candles) as mapped, ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(mapped.path, spec, objective),
+    ) as executor:
+        windows = list(executor.map(_run_window, range(len(bounds)), bounds))
+
+    return WalkForwardResult(
+        windows=windows,
+        equity_curve=stitch_equity(windows, spec.initial_balance),
+        initial_balance=spec.initial_balance,
+    )
@@ -1,6 +1,9 @@
+import argparse
+
 from config.settings import load_settings
 from modules.BinanceTraderBot import BinanceTraderBot
 from binance.client import Client
+from persistence.kline_archive import KlineArchive
 from tests.backtestRunner import backtestRunner
 from strategies.ut_bot_alerts import *
 from strategies.moving_average_antecipation import getMovingAverageAntecipationTradeStrategy
@@ -9,6 +12,10 @@ from strategies.rsi_strategy import getRsiTradeStrategy
 from strategies.vortex_strategy import getVortexTradeStrategy
 from strategies.ma_rsi_volume_strategy import getMovingAverageRSIVolumeStrategy
 
+parser = argparse.ArgumentParser()
+parser.add_argument("--offline", action="store_true", help="usar data/klines local (ver klines_import.py)")
+args = parser.parse_args()
+
 settings, env = load_settings()
 asset = settings.assets[0]
 
@@ -24,23 +31,28 @@ SLOW_WINDOW       = 30
 # ------------------------------------------------------------------------
 # ⏬ SELEÇÃO DE ESTRATÉGIAS ⏬
 
-devTrader = BinanceTraderBot(
-    stock_code=STOCK_CODE,
-    operation_code=OPERATION_CODE,
-    traded_quantity=0,
-    traded_percentage=100,
-    candle_period=CANDLE_PERIOD,
-    api_key=env.api_key,
-    secret_key=env.secret_key,
-    testnet=settings.environment == "testnet",
-)
-
-
-devTrader.updateAllData()
+if args.offline:
+    archive = KlineArchive(OPERATION_CODE, CANDLE_PERIOD)
+    if len(archive) == 0:
+        raise SystemExit(f"Arquivo vazio em {archive.path}; rode klines_import.py antes.")
+    stock_data = archive.read().to_frame()
+else:
+    devTrader = BinanceTraderBot(
+        stock_code=STOCK_CODE,
+        operation_code=OPERATION_CODE,
+        traded_quantity=0,
+        traded_percentage=100,
+        candle_period=CANDLE_PERIOD,
+        api_key=env.api_key,
+        secret_key=env.secret_key,
+        testnet=settings.environment == "testnet",
+    )
+    devTrader.updateAllData()
+    stock_data = devTrader.stock_data
 
 print(f"\n{STOCK_CODE} - UT BOTS - {str(CANDLE_PERIOD)}")
 result = backtestRunner(
-    stock_data        = devTrader.stock_data,
+    stock_data        = stock_data,
     strategy_function = utBotAlerts,
     periods           = CLANDES_RODADOS,
     initial_balance   = INITIAL_BALANCE,
@@ -52,7 +64,7 @@ print(f"Lucro: {result['profit_percentage']:.2f}%")
 
 print(f"\n{STOCK_CODE} - MA RSI e VOLUME - {str(CANDLE_PERIOD)}")
 backtestRunner(
-    stock_data        = devTrader.stock_data,
+    stock_data        = stock_data,
     strategy_function = getMovingAverageRSIVolumeStrategy,
     periods           = CLANDES_RODADOS,
     initial_balance   = INITIAL_BALANCE,
@@ -62,7 +74,7 @@ backtestRunner(
   
 print(f"\n{STOCK_CODE} - MA ANTECIPATION - {str(CANDLE_PERIOD)}")
 backtestRunner(
-    stock_data        = devTrader.stock_data,
+    stock_data        = stock_data,
     strategy_function = getMovingAverageAntecipationTradeStrategy,
     periods           = CLANDES_RODADOS,
     initial_balance   = INITIAL_BALANCE,
@@ -74,7 +86,7 @@ backtestRunner(
 
 print(f"\n{STOCK_CODE} - MA SIMPLES FALLBACK - {str(CANDLE_PERIOD)}")
 backtestRunner(
-    stock_data        = devTrader.stock_data,
+    stock_data        = stock_data,
     strategy_function = getMovingAverageTradeStrategy,
     periods           = CLANDES_RODADOS,
     initial_balance   = INITIAL_BALANCE,
@@ -85,7 +97,7 @@ backtestRunner(
 
 print(f"\n{STOCK_CODE} - RSI - {str(CANDLE_PERIOD)}")
 backtestRunner(
-    stock_data        = devTrader.stock_data,
+    stock_data        = stock_data,
     strategy_function = getRsiTradeStrategy,
     periods           = CLANDES_RODADOS,
     initial_balance   = INITIAL_BALANCE,
@@ -96,7 +108,7 @@ backtestRunner(
 
 print(f"\n{STOCK_CODE} - VORTEX - {str(CANDLE_PERIOD)}")
 backtestRunner(
-    stock_data        = devTrader.stock_data,
+    stock_data        = stock_data,
     strategy_function = getVortexTradeStrategy,
     periods           = CLANDES_RODADOS,
     initial_balance   = INITIAL_BALANCE,
@@ -1,15 +1,26 @@
 """
 Comparacao de estrategias em 4h para validar atr_trend vs alternativas.
+
+Com ``--offline`` usa o arquivo local de candles (ver ``klines_import.py``)
+em vez de buscar os ultimos 1000 na Binance.
+
+Cada execucao fica salva em data/backtests.db (ver ``backtests_results.py``);
+a mesma estrategia, parametros, candles e versao do codigo reaproveitam o
+resultado salvo. ``--no-cache`` recalcula tudo.
 """
+import argparse
+
 from binance.client import Client
 
 from config.settings import load_settings
 from modules.BinanceTraderBot import BinanceTraderBot
+from persistence.backtest_results import BacktestResultStore, cached_backtest
+from persistence.kline_archive import KlineArchive
+from services.candle_frame import CandleFrame
 from strategies.atr_trend import getAtrTrendStrategy
 from strategies.moving_average import getMovingAverageTradeStrategy
 from strategies.ut_bot_alerts import utBotAlerts
 from strategies.weapon_candle_trade_strategy import getWeaponCandleTradeStrategy
-from tests.backtestRunner import backtestRunner
 
 PERIODS_4H_180_DAYS = 180 * 6  # 6 candles de 4h por dia
 
@@ -37,12 +48,14 @@ SCENARIOS = [
 ]
 
 
-def main():
-    settings, env = load_settings()
-    asset = settings.assets[0]
-
-    candle_period = Client.KLINE_INTERVAL_4HOUR
-    initial_balance = asset.traded_quantity or 0.001
+def _load_stock_data(settings, env, asset, candle_period, offline: bool):
+    if offline:
+        archive = KlineArchive(asset.operation_code, candle_period)
+        if len(archive) == 0:
+            raise SystemExit(
+                f"Arquivo vazio em {archive.path}; rode klines_import.py antes."
+            )
+        return archive.read().to_frame()
 
     bot = BinanceTraderBot(
         stock_code=asset.stock_code,
@@ -55,20 +68,44 @@ def main():
         testnet=settings.environment == "testnet",
     )
     bot.updateAllData()
+    return bot.stock_data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--offline", action="store_true", help="usar data/klines local")
+    parser.add_argument("--no-cache", action="store_true", help="ignorar resultados salvos")
+    args = parser.parse_args()
+
+    settings, env = load_settings()
+    asset = settings.assets[0]
+
+    candle_period = Client.KLINE_INTERVAL_4HOUR
+    initial_balance = asset.traded_quantity or 0.001
+
+    stock_data = _load_stock_data(settings, env, asset, candle_period, args.offline)
+    candles = CandleFrame.from_frame(stock_data)
+    store = BacktestResultStore()
 
     print(f"\nComparacao de estrategias — {asset.operation_code} — 4h")
     print(f"Periodo: ultimos ~180 dias ({PERIODS_4H_180_DAYS} candles)\n")
 
     rows = []
+    hits = 0
     for scenario in SCENARIOS:
-        result = backtestRunner(
-            stock_data=bot.stock_data,
+        result, cached = cached_backtest(
+            store,
+            refresh=args.no_cache,
+            strategy_name=scenario["fn"].__name__,
             strategy_function=scenario["fn"],
+            candles=candles,
+            params=scenario["kwargs"],
+            symbol=asset.operation_code,
+            interval=candle_period,
             periods=PERIODS_4H_180_DAYS,
             initial_balance=initial_balance,
-            verbose=False,
-            **scenario["kwargs"],
         )
+        hits += cached
         rows.append(
             {
                 "strategy": scenario["name"],
@@ -81,6 +118,8 @@ def main():
         )
 
     _print_table(rows)
+    if hits:
+        print(f"{hits} resultado(s) reaproveitado(s) de {store.db_path}")
     _export_csv(rows)
 
 
@@ -0,0 +1,77 @@
+"""
+Monte Carlo sobre resultados de backtest ou operacoes reais: distribuicao de retorno e drawdown e probabilidade de ruina.
+
+Uso:
+    PYTHONPATH=src python src/backtests_monte_carlo.py run <run_key> [--paths 10000] [--block 20]
+    PYTHONPATH=src python src/backtests_monte_carlo.py live [--balance 1000] [--method shuffle|bootstrap]
+
+``run`` reamostra em blocos os retornos da curva de capital de uma execucao
+salva em data/backtests.db (ver ``backtests_results.py list``). ``live``
+embaralha (ou reamostra com reposicao) as operacoes fechadas em
+``trade_outcomes`` e estima a chance de um dia atingir ``risk.max_daily_loss_usdt``.
+"""
+import argparse
+
+from backtest.monte_carlo import METHODS, bootstrap_equity, monte_carlo_trades
+from config.settings import load_settings
+from persistence.backtest_results import DEFAULT_RESULTS_PATH, BacktestResultStore
+from persistence.state_store import StateStore
+
+
+def _print_summary(result, daily_limit=None):
+    summary = result.summary()
+    print(f"Caminhos simulados: {summary['paths']}")
+    print(f"{'Percentil':>10} {'Retorno%':>10} {'MaxDD%':>10}")
+    for p in summary["return_pct"]:
+        print(f"{p:>10} {summary['return_pct'][p]:>10.2f} {summary['max_drawdown_pct'][p]:>10.2f}")
+    print(f"Probabilidade de ruina: {summary['prob_ruin']:.2%}")
+    if summary["prob_daily_limit"] is not None:
+        print(f"Probabilidade de atingir a perda diaria de {daily_limit} USDT: {summary['prob_daily_limit']:.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paths", type=int, default=10_000)
+    parser.add_argument("--ruin-pct", type=float, default=50.0, help="queda do capital que conta como ruina")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int, help="processos em paralelo (padrao: 1)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    stored = commands.add_parser("run", help="execucao salva no banco de resultados")
+    stored.add_argument("run_key")
+    stored.add_argument("--db", default=str(DEFAULT_RESULTS_PATH))
+    stored.add_argument("--block", type=int, default=20, help="tamanho do bloco em candles")
+    live = commands.add_parser("live", help="operacoes fechadas do bot")
+    live.add_argument("--balance", type=float, default=1000.0, help="saldo inicial em USDT")
+    live.add_argument("--method", choices=METHODS, default="shuffle")
+    args = parser.parse_args()
+
+    common = {"n_paths": args.paths, "ruin_pct": args.ruin_pct, "seed": args.seed, "max_workers": args.workers}
+    if args.command == "run":
+        try:
+            run = BacktestResultStore(args.db).get(args.run_key)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        if run is None:
+            raise SystemExit(f"Execucao '{args.run_key}' nao encontrada em {args.db}")
+        print(f"{run.strategy} {run.symbol} {run.interval} {run.params}")
+        _print_summary(bootstrap_equity(run.equity_curve, block_size=args.block, **common))
+        return
+
+    settings, _ = load_settings()
+    outcomes = StateStore().list_outcomes(limit=1000)
+    daily_limit = settings.risk.max_daily_loss_usdt
+    try:
+        result = monte_carlo_trades(
+            outcomes,
+            initial_balance=args.balance,
+            method=args.method,
+            max_daily_loss_usdt=daily_limit,
+            **common,
+        )
+    except ValueError as e:
+        raise SystemExit(str(e))
+    _print_summary(result, daily_limit)
+
+
+if __name__ == "__main__":
+    main()
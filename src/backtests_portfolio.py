@@ -0,0 +1,90 @@
+"""
+Backtest de carteira: todos os ativos do config/trading.yaml contra um unico
+saldo em USDT, com os limites diarios de ``risk`` e o ``traded_percentage`` de
+cada ativo.
+
+Uso:
+    PYTHONPATH=src python src/backtests_portfolio.py [--balance 1000] [--interval 4h] \
+        [--out data/portfolio_equity.csv]
+
+Le os candles do arquivo local (ver ``klines_import.py``).
+"""
+import argparse
+import csv
+from pathlib import Path
+
+import pandas as pd
+
+from backtest.portfolio import PortfolioAsset, portfolio_backtest
+from config.settings import load_settings
+from persistence.kline_archive import KlineArchive
+from strategies.registry import resolve_strategy
+
+
+def _load_assets(settings, interval: str) -> list[PortfolioAsset]:
+    assets = []
+    for asset in settings.assets:
+        archive = KlineArchive(asset.operation_code, interval)
+        if len(archive) == 0:
+            raise SystemExit(f"Arquivo vazio em {archive.path}; rode klines_import.py antes.")
+        assets.append(
+            PortfolioAsset(
+                operation_code=asset.operation_code,
+                candles=archive.read(),
+                traded_percentage=asset.traded_percentage,
+                traded_quantity=asset.traded_quantity,
+            )
+        )
+    return assets
+
+
+def _print_summary(result):
+    print(f"Retorno: {result.profit_percentage:.2f}% (${result.final_equity:.2f})")
+    print(f"Max drawdown da carteira: {result.max_drawdown_pct:.2f}%")
+    print(f"Sharpe aprox.: {result.sharpe_approx:.2f}")
+    print(f"Exposicao media/maxima: {result.avg_exposure_pct:.1f}% / {result.max_exposure_pct:.1f}%")
+    by_asset = pd.DataFrame(result.trades or None, columns=["operation_code", "side", "fee"])
+    for code, exposure in result.asset_exposure.items():
+        trades = by_asset[by_asset["operation_code"] == code]
+        print(
+            f" - {code}: {len(trades)} ordens, exposicao media {exposure.mean() * 100:.1f}%, "
+            f"taxas ${trades['fee'].sum():.2f}"
+        )
+    if result.blocked:
+        reasons = pd.Series([b["reason"] for b in result.blocked]).value_counts()
+        print("Ordens bloqueadas:")
+        for reason, count in reasons.items():
+            print(f" - {reason}: {count}")
+
+
+def _export_equity(result, path):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["open_time", "equity", "exposure"])
+        writer.writerows(zip(result.timeline.tolist(), result.equity_curve, result.exposure))
+    print(f"Curva de equity da carteira exportada para {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--balance", type=float, default=1000.0, help="saldo inicial em USDT")
+    parser.add_argument("--interval", help="padrao: timing.candle_period")
+    parser.add_argument("--out", default="data/portfolio_equity.csv")
+    args = parser.parse_args()
+
+    settings, _ = load_settings()
+    interval = args.interval or settings.timing.candle_period
+    result = portfolio_backtest(
+        _load_assets(settings, interval),
+        resolve_strategy(settings.strategy.main),
+        initial_balance=args.balance,
+        risk=settings.risk,
+        **settings.strategy.main_args,
+    )
+    _print_summary(result)
+    _export_equity(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
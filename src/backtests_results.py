@@ -0,0 +1,100 @@
+"""
+Consulta o banco de resultados de backtests (data/backtests.db).
+
+Uso:
+    PYTHONPATH=src python src/backtests_results.py list [--by profit|drawdown|sharpe] \
+        [--strategy atr_trend] [--symbol BTCUSDT] [--limit 20]
+    PYTHONPATH=src python src/backtests_results.py diff <run_a> <run_b>
+
+As chaves aceitam prefixo (os 12 caracteres mostrados no ``list`` bastam).
+"""
+import argparse
+
+import numpy as np
+
+from persistence.backtest_results import (
+    DEFAULT_RESULTS_PATH,
+    METRIC_COLUMNS,
+    RANKINGS,
+    BacktestResultStore,
+)
+
+KEY_WIDTH = 12
+
+
+def _print_list(runs):
+    header = (
+        f"{'Run':<{KEY_WIDTH}} {'Strategy':<22} {'Symbol':<10} {'Return%':>9} "
+        f"{'MaxDD%':>8} {'Sharpe':>7} {'Trades':>7}  Parametros"
+    )
+    print(header)
+    print("-" * len(header))
+    for run in runs:
+        m = run.metrics
+        print(
+            f"{run.run_key[:KEY_WIDTH]:<{KEY_WIDTH}} {run.strategy:<22} {run.symbol:<10} "
+            f"{m['profit_percentage']:>9.2f} {m['max_drawdown_pct']:>8.2f} "
+            f"{m['sharpe_approx']:>7.2f} {m['trades']:>7}  {run.params}"
+        )
+
+
+def diff_runs(a, b) -> list[str]:
+    lines = [f"{'':<20} {a.run_key[:KEY_WIDTH]:>14} {b.run_key[:KEY_WIDTH]:>14} {'Delta':>12}"]
+    for label, left, right in (
+        ("strategy", a.strategy, b.strategy),
+        ("symbol", f"{a.symbol} {a.interval}", f"{b.symbol} {b.interval}"),
+        ("code_version", a.code_version, b.code_version),
+        ("data", a.data["digest"], b.data["digest"]),
+    ):
+        if left != right:
+            lines.append(f"{label:<20} {left:>14} {right:>14}")
+    for name in sorted(set(a.params) | set(b.params)):
+        left, right = a.params.get(name, "-"), b.params.get(name, "-")
+        if left != right:
+            lines.append(f"{name:<20} {str(left):>14} {str(right):>14}")
+    for name in METRIC_COLUMNS:
+        left, right = a.metrics[name], b.metrics[name]
+        lines.append(f"{name:<20} {left:>14.4f} {right:>14.4f} {right - left:>+12.4f}")
+
+    curve_a, curve_b = a.equity_curve, b.equity_curve
+    if len(curve_a) == len(curve_b) and len(curve_a):
+        gap = np.abs(curve_b.astype(np.float64) - curve_a)
+        lines.append(f"{'equity max gap':<20} {gap.max():>14.4f} (candle {int(gap.argmax())})")
+    else:
+        lines.append(f"{'equity length':<20} {len(curve_a):>14} {len(curve_b):>14}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", default=str(DEFAULT_RESULTS_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+    listing = commands.add_parser("list", help="melhores execucoes por metrica")
+    listing.add_argument("--by", choices=sorted(RANKINGS), default="profit")
+    listing.add_argument("--strategy")
+    listing.add_argument("--symbol")
+    listing.add_argument("--limit", type=int, default=20)
+    compare = commands.add_parser("diff", help="compara duas execucoes")
+    compare.add_argument("run_a")
+    compare.add_argument("run_b")
+    args = parser.parse_args()
+
+    store = BacktestResultStore(args.db)
+    if args.command == "list":
+        _print_list(
+            store.top(args.by, limit=args.limit, strategy=args.strategy, symbol=args.symbol)
+        )
+        return
+
+    try:
+        runs = [store.get(key) for key in (args.run_a, args.run_b)]
+    except ValueError as e:
+        raise SystemExit(str(e))
+    for key, run in zip((args.run_a, args.run_b), runs):
+        if run is None:
+            raise SystemExit(f"Execucao '{key}' nao encontrada em {args.db}")
+    print("\n".join(diff_runs(*runs)))
+
+
+if __name__ == "__main__":
+    main()
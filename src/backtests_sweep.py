@@ -0,0 +1,93 @@
+"""
+Grid search de parametros de uma estrategia, em paralelo entre processos.
+
+Uso:
+    PYTHONPATH=src python src/backtests_sweep.py config/sweep.example.yaml \
+        --out data/sweep_atr_trend.csv [--data candles.csv | --offline] [--workers 4]
+
+Rodar de novo com o mesmo ``--out`` continua de onde parou, desde que as
+entradas da rodada (gravadas em ``<out>.run.json``) sejam as mesmas.
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from backtest.sweep import SweepSpec, run_sweep
+from persistence.kline_archive import KlineArchive
+from services.candle_frame import CandleFrame
+
+
+def _load_candles(spec: SweepSpec, data_path: str | None, offline: bool) -> CandleFrame:
+    path = data_path or spec.data
+    if offline:
+        from config.settings import load_settings
+
+        symbol = spec.symbol
+        if symbol is None:
+            settings, _ = load_settings()
+            symbol = settings.assets[0].operation_code
+        interval = spec.candle_period or "4h"
+        return KlineArchive(symbol, interval).read()
+    if path:
+        frame = pd.read_csv(path)
+        if "open_time" in frame.columns and frame["open_time"].dtype == object:
+            frame["open_time"] = pd.to_datetime(frame["open_time"], utc=True)
+        return CandleFrame.from_frame(frame)
+
+    from config.settings import load_settings
+    from modules.BinanceTraderBot import BinanceTraderBot
+
+    settings, env = load_settings()
+    asset = settings.assets[0]
+    bot = BinanceTraderBot(
+        stock_code=asset.stock_code,
+        operation_code=asset.operation_code,
+        traded_quantity=0,
+        traded_percentage=100,
+        candle_period=spec.candle_period or settings.timing.candle_interval(),
+        api_key=env.api_key,
+        secret_key=env.secret_key,
+        testnet=settings.environment == "testnet",
+    )
+    bot.updateAllData()
+    return CandleFrame.from_frame(bot.stock_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("config", help="YAML com strategy e grid de parametros")
+    parser.add_argument("--out", required=True, help="CSV de resultados (retomado se existir)")
+    parser.add_argument("--data", help="CSV de candles; sem ele busca na Binance")
+    parser.add_argument("--offline", action="store_true", help="usar data/klines local")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    spec = SweepSpec.from_yaml(args.config)
+    candles = _load_candles(spec, args.data, args.offline)
+    total = len(spec.combinations())
+    finished = 0
+    started = time.monotonic()
+
+    def progress(params, result):
+        nonlocal finished
+        finished += 1
+        print(
+            f"[{finished}] {params} -> {result['profit_percentage']:.2f}% "
+            f"({result['trades']} trades, DD {result['max_drawdown_pct']:.2f}%)"
+        )
+
+    try:
+        ran = run_sweep(spec, candles, args.out, max_workers=args.workers, on_result=progress)
+    except ValueError as exc:
+        print(f"Nao foi possivel retomar: {exc}")
+        sys.exit(1)
+    print(
+        f"\n{ran} combinacoes executadas ({total - ran} ja estavam em {args.out}) "
+        f"em {time.monotonic() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Walk-forward: otimiza o grid na janela de treino, opera o melhor conjunto na
+janela seguinte (fora da amostra) e rola para frente.
+
+Uso:
+    PYTHONPATH=src python src/backtests_walk_forward.py config/sweep.example.yaml \
+        --train 1080 --test 180 [--objective sharpe|profit|calmar] [--offline] \
+        [--out data/walk_forward_equity.csv]
+
+Usa o mesmo YAML do ``backtests_sweep.py``.
+"""
+import argparse
+import csv
+from pathlib import Path
+
+from backtest.sweep import SweepSpec
+from backtest.walk_forward import OBJECTIVES, walk_forward
+from backtests_sweep import _load_candles
+
+
+def _print_windows(result):
+    header = f"{'#':>3} {'Teste':>13} {'Treino%':>9} {'OOS%':>9} {'OOS DD%':>9} {'Trades':>7}  Parametros"
+    print(header)
+    print("-" * len(header))
+    for window in result.windows:
+        print(
+            f"{window.index:>3} "
+            f"{window.test_start:>6}-{window.test_end:<6} "
+            f"{window.train['profit_percentage']:>9.2f} "
+            f"{window.test['profit_percentage']:>9.2f} "
+            f"{window.test['max_drawdown_pct']:>9.2f} "
+            f"{window.test['trades']:>7}  {window.params}"
+        )
+    print()
+    print(
+        f"OOS encadeado: {result.profit_percentage:.2f}% | "
+        f"Max DD {result.max_drawdown_pct:.2f}% | Sharpe {result.sharpe_approx:.2f}"
+    )
+    print(f"Parametros da ultima janela: {result.windows[-1].params}")
+
+
+def _export_equity(result, path):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["bar", "equity"])
+        writer.writerows(enumerate(result.equity_curve))
+    print(f"Curva de equity fora da amostra exportada para {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("config", help="YAML com strategy e grid de parametros")
+    parser.add_argument("--train", type=int, required=True, help="candles de treino")
+    parser.add_argument("--test", type=int, required=True, help="candles fora da amostra")
+    parser.add_argument("--step", type=int, default=None, help="padrao: --test")
+    parser.add_argument("--objective", choices=sorted(OBJECTIVES), default="sharpe")
+    parser.add_argument("--data", help="CSV de candles; sem ele busca na Binance")
+    parser.add_argument("--offline", action="store_true", help="usar data/klines local")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="data/walk_forward_equity.csv")
+    args = parser.parse_args()
+
+    spec = SweepSpec.from_yaml(args.config)
+    candles = _load_candles(spec, args.data, args.offline)
+    result = walk_forward(
+        spec,
+        candles,
+        train_size=args.train,
+        test_size=args.test,
+        step=args.step,
+        objective=args.objective,
+        max_workers=args.workers,
+    )
+    _print_windows(result)
+    _export_equity(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -69,6 +69,7 @@ class RiskConfig(BaseModel):
     max_trades_per_day: int = 50
     max_open_orders: int = 5
     max_grid_trades_per_day: int = 20
+    exit_watch_seconds: float = 0.0
 
 
 class TimingConfig(BaseModel):
@@ -89,6 +90,7 @@ class OperationConfig(BaseModel):
     cancel_orders_on_shutdown: bool = False
     circuit_breaker_errors: int = 5
     circuit_breaker_pause_seconds: int = 300
+    user_data_stream: bool = False
 
 
 class AlertsConfig(BaseModel):
@@ -137,9 +139,18 @@ class BreakoutConfig(BaseModel):
     reentry_adx_max: float = 22.0
 
 
+class MarketDataConfig(BaseModel):
+    source: Literal["rest", "websocket"] = "rest"
+    ws_url: str = ""
+    reconnect_delay_seconds: float = 5.0
+    stale_after_seconds: float = 0.0
+    streaming_indicators: bool = False
+
+
 class TradingSettings(BaseModel):
     environment: Literal["testnet", "mainnet"] = "testnet"
     thread_lock: bool = True
+    runtime: Literal["threaded", "asyncio"] = "threaded"
     strategy: StrategyConfig
     risk: RiskConfig
     timing: TimingConfig
@@ -149,6 +160,7 @@ class TradingSettings(BaseModel):
     regime: RegimeConfig = Field(default_factory=RegimeConfig)
     grid: GridConfig = Field(default_factory=GridConfig)
     breakout: BreakoutConfig = Field(default_factory=BreakoutConfig)
+    market_data: MarketDataConfig = Field(default_factory=MarketDataConfig)
 
     @model_validator(mode="after")
     def validate_assets(self):
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from modules.logging_setup import log_event
+
+_STOP_POLL_SECONDS = 0.5
+
+
+@dataclass
+class CycleReads:
+    """
+    REST responses fetched on the event loop for one cycle.
+
+    ``TradingEngine.update_all_data`` uses each field instead of the matching
+    blocking read; ``None`` means "read as usual" (stream-backed, or the
+    prefetch failed). ``klines`` and ``orders`` are ``(request, response)``.
+    """
+
+    account_data: Optional[dict] = None
+    open_orders: Optional[list] = None
+    klines: Optional[tuple[dict, list]] = None
+    orders: Optional[tuple[dict, list]] = None
+
+
+async def _with_request(request: dict, call) -> tuple[dict, list]:
+    return request, await call(**request)
+
+
+async def prefetch_reads(bot, client) -> CycleReads:
+    """Issue one cycle's reads for ``bot`` concurrently through the async ``client``."""
+    calls = {}
+    # While the user data stream is live, balances and orders come from it.
+    if bot._account_state() is None:
+        calls["account_data"] = client.get_account()
+        calls["open_orders"] = client.get_open_orders(symbol=bot.operation_code)
+        calls["orders"] = _with_request(bot.order_history.next_request(), client.get_all_orders)
+    if not getattr(bot.market_data, "is_live", False):
+        calls["klines"] = _with_request(bot.market_data.kline_request(), client.get_klines)
+
+    reads = CycleReads()
+    results = await asyncio.gather(*calls.values(), return_exceptions=True)
+    for field, result in zip(calls, results):
+        if isinstance(result, Exception):
+            log_event(
+                logging.WARNING,
+                f"Prefetch of {field} failed: {result}",
+                operation_code=bot.operation_code,
+                event="prefetch_error",
+            )
+            continue
+        setattr(reads, field, result)
+    return reads
+
+
+async def sleep_or_stop(stop_event: threading.Event, seconds: float) -> None:
+    """Sleep ``seconds`` without blocking the loop, waking early on shutdown."""
+    deadline = time.monotonic() + max(0.0, seconds)
+    while not stop_event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, _STOP_POLL_SECONDS))
+
+
+async def asset_loop(bot, run_cycle: Callable, client, stop_event: threading.Event, executor) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop_event.is_set():
+        try:
+            reads = await prefetch_reads(bot, client)
+        except Exception as exc:
+            log_event(
+                logging.WARNING,
+                f"Prefetch failed: {exc}",
+                operation_code=bot.operation_code,
+                event="prefetch_error",
+            )
+            reads = None
+        await loop.run_in_executor(executor, run_cycle, reads)
+        await sleep_or_stop(stop_event, bot.time_to_sleep)
+
+
+async def _run(assets: list, build_bot, cycle_runner, make_client, stop_event, max_workers) -> None:
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or max(1, len(assets)),
+        thread_name_prefix="asset-cycle",
+    )
+    client = make_client()
+    try:
+        built = await asyncio.gather(
+            *(loop.run_in_executor(executor, build_bot, asset) for asset in assets),
+            return_exceptions=True,
+        )
+        bots = []
+        for asset, bot in zip(assets, built):
+            if isinstance(bot, Exception):
+                log_event(
+                    logging.ERROR,
+                    f"Bot startup failed: {bot}",
+                    operation_code=getattr(asset, "operationCode", ""),
+                    event="bot_startup_error",
+                )
+                continue
+            bots.append(bot)
+        await asyncio.gather(
+            *(
+                asset_loop(bot, cycle_runner(bot), client, stop_event, executor)
+                for bot in bots
+            )
+        )
+    finally:
+        await client.close_connection()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_assets(
+    assets: Iterable,
+    *,
+    build_bot: Callable,
+    cycle_runner: Callable,
+    make_client: Callable,
+    stop_event: threading.Event,
+    max_workers: int | None = None,
+) -> None:
+    """
+    Asyncio scheduler: one coroutine per asset on a single event loop.
+
+    Each cycle's reads (account, open orders, order history page, klines) are
+    issued through one async client, ``make_client()``, whose aiohttp session
+    is shared by every asset, so their I/O overlaps. The cycle itself, with
+    its order placement, then runs on a worker of one shared pool through
+    ``cycle_runner(bot)(reads)``; only quote-spending orders are serialized,
+    by the engine's shared order lock.
+    """
+    asyncio.run(
+        _run(list(assets), build_bot, cycle_runner, make_client, stop_event, max_workers)
+    )
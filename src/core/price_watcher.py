@@ -0,0 +1,72 @@
+import logging
+import threading
+from typing import Callable, Optional
+
+
+class PriceWatcher:
+    """
+    Feeds live prices to ``TradingEngine.check_exit_price`` between cycles.
+
+    With a streaming market data source it runs on every tick (``on_price`` is
+    registered as a listener); otherwise it polls ``price_source`` every
+    ``poll_seconds`` on a background thread.
+    """
+
+    def __init__(
+        self,
+        engine,
+        poll_seconds: float = 5.0,
+        price_source: Optional[Callable[[], float]] = None,
+    ):
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self.price_source = price_source
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def on_price(self, price: float) -> Optional[str]:
+        try:
+            return self.engine.check_exit_price(float(price))
+        except Exception as exc:
+            logging.error(
+                "Price watcher check failed for %s: %s",
+                self.engine.bot.operation_code,
+                exc,
+            )
+            return None
+
+    def attach(self, market_data) -> "PriceWatcher":
+        """Tick-driven mode: subscribe to a source exposing ``add_listener``."""
+        market_data.add_listener(self.on_price)
+        return self
+
+    def start(self) -> "PriceWatcher":
+        if self.price_source is None:
+            raise ValueError("price_source is required for polling mode")
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"price-watcher-{self.engine.bot.operation_code}",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                price = self.price_source()
+            except Exception as exc:
+                logging.warning(
+                    "Price watcher poll failed for %s: %s",
+                    self.engine.bot.operation_code,
+                    exc,
+                )
+                continue
+            self.on_price(price)
@@ -1,5 +1,7 @@
 import logging
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 from binance.exceptions import BinanceAPIException
@@ -9,6 +11,7 @@ from modules.alerts import send_alert
 from modules.logging_setup import log_event
 from persistence.state_store import BotState
 from strategies.decision import StrategyDecision
+from indicators.context import IndicatorContext
 from services.asset_variation import (
     compute_candle_variation,
     format_held_position_label,
@@ -36,6 +39,9 @@ class TradingEngine:
         breakout_detector=None,
         breakout_price: float = 0.0,
         sleep=None,
+        indicator_stream=None,
+        order_lock=None,
+        clock=None,
     ):
         self.bot = bot
         self.market_data = market_data
@@ -47,8 +53,17 @@ class TradingEngine:
         self.grid_manager = grid_manager
         self.breakout_detector = breakout_detector
         self.breakout_price = breakout_price
+        self.indicator_stream = indicator_stream
+        self._data_version = 0
+        self._indicator_context: IndicatorContext | None = None
         self._sleep = time.sleep if sleep is None else sleep
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
         self._last_strategy_decision: StrategyDecision | None = None
+        self._cycle_lock = threading.RLock()
+        # Responses the asyncio runtime fetched for this cycle (see core.async_runtime).
+        self._reads = None
+        # Shared across assets spending the same quote balance; None = not shared.
+        self.order_lock = order_lock
         self.state = BotState(operation_code=bot.operation_code)
         if getattr(bot, "engine", None) is None:
             bot.engine = self
@@ -67,13 +82,35 @@ class TradingEngine:
         self.state_store.save_state(self.state)
 
     def update_all_data(self, verbose=False):
+        reads, self._reads = self._reads, None
+        # Orders placed or cancelled since the last update would otherwise stay
+        # hidden behind the history's max_age; the buy and sell lookups below
+        # still share one request.
+        order_history = getattr(self.bot, "order_history", None)
+        if order_history is not None:
+            if reads is not None and reads.orders is not None:
+                order_history.merge_prefetched(*reads.orders)
+            else:
+                order_history.invalidate()
         try:
-            self.bot.account_data = self.bot.getUpdatedAccountData()
+            if reads is not None and reads.account_data is not None:
+                self.bot.account_data = reads.account_data
+            else:
+                self.bot.account_data = self.bot.getUpdatedAccountData()
             self.risk_manager.record_api_success()
             self.bot.last_stock_account_balance = self.bot.getLastStockAccountBalance()
             self.bot.actual_trade_position = self.bot.getActualTradePosition()
-            self.bot.stock_data = self.market_data.fetch_klines()
-            self.bot.open_orders = self.bot.getOpenOrders()
+            if reads is not None and reads.klines is not None:
+                self.bot.stock_data = self.market_data.apply_klines(*reads.klines).to_frame()
+            else:
+                self.bot.stock_data = self.market_data.fetch_klines()
+            self._data_version += 1
+            if self.indicator_stream is not None:
+                self.indicator_stream.sync(self.bot.stock_data)
+            if reads is not None and reads.open_orders is not None:
+                self.bot.open_orders = reads.open_orders
+            else:
+                self.bot.open_orders = self.bot.getOpenOrders()
             self.bot.last_buy_price = self.bot.getLastBuyPrice(verbose)
             self.bot.last_sell_price = self.bot.getLastSellPrice(verbose)
             if not self.bot.actual_trade_position:
@@ -83,6 +120,21 @@ class TradingEngine:
             logging.error("Data update failed for %s: %s", self.bot.operation_code, e)
             raise
 
+    @property
+    def indicators(self):
+        """Indicators for the current kline window, computed at most once per cycle."""
+        if self.indicator_stream is not None:
+            return self.indicator_stream
+        context = self._indicator_context
+        if (
+            context is None
+            or context.version != self._data_version
+            or context.source is not self.bot.stock_data
+        ):
+            context = IndicatorContext(self.bot.stock_data, version=self._data_version)
+            self._indicator_context = context
+        return context
+
     def _quote_balance(self) -> float:
         return self.market_data.get_account_balance(
             self.bot.quote_asset, self.bot.account_data
@@ -91,14 +143,20 @@ class TradingEngine:
     def _check_regime(self):
         if not self.regime_detector or not self.regime_detector.enabled:
             return None
-        return self.regime_detector.evaluate(self.bot.stock_data)
+        return self.regime_detector.evaluate(
+            self.bot.stock_data, indicators=self.indicators
+        )
 
     def _check_breakout(self):
         if not self.breakout_detector or not self.breakout_detector.enabled:
             return None
         if self.breakout_price <= 0:
             return None
-        return self.breakout_detector.evaluate(self.bot.stock_data, self.breakout_price)
+        return self.breakout_detector.evaluate(
+            self.bot.stock_data,
+            self.breakout_price,
+            indicators=self.indicators,
+        )
 
     def _can_run_grid(self, regime) -> bool:
         return can_run_grid(
@@ -146,6 +204,7 @@ class TradingEngine:
             return get_atr_trend_snapshot(
                 self.bot.stock_data,
                 **(self.bot.main_strategy_args or {}),
+                indicators=self.indicators,
             )
         return None
 
@@ -307,18 +366,19 @@ class TradingEngine:
         self.state.active_mode = "grid"
         self.state.grid_support = regime.support or 0.0
         self.state.grid_resistance = regime.resistance or 0.0
-        result = self.grid_manager.sync_grid(
-            bot=self.bot,
-            order_executor=self.order_executor,
-            risk_manager=self.risk_manager,
-            regime=regime,
-            operation_code=self.bot.operation_code,
-            quote_balance=self._quote_balance(),
-            base_balance=self.bot.last_stock_account_balance,
-            open_orders=self.bot.open_orders,
-            min_notional=self.bot.min_notional,
-            step_size=self.bot.step_size,
-        )
+        with self._quote_spend():
+            result = self.grid_manager.sync_grid(
+                bot=self.bot,
+                order_executor=self.order_executor,
+                risk_manager=self.risk_manager,
+                regime=regime,
+                operation_code=self.bot.operation_code,
+                quote_balance=self._quote_balance(),
+                base_balance=self.bot.last_stock_account_balance,
+                open_orders=self.bot.open_orders,
+                min_notional=self.bot.min_notional,
+                step_size=self.bot.step_size,
+            )
         print(
             f"\nGrid ativo: S={regime.support:.2f} R={regime.resistance:.2f} "
             f"({regime.channel_width_pct:.2f}%) — ordens colocadas: {result.get('placed', 0)}"
@@ -346,7 +406,7 @@ class TradingEngine:
                 "order_id": order.get("orderId"),
                 "source": "live",
                 "filled": True,
-                "occurred_at": datetime.now(timezone.utc).isoformat(),
+                "occurred_at": self._clock().isoformat(),
             }
         )
         if inserted:
@@ -375,11 +435,12 @@ class TradingEngine:
             level = logging.INFO
         log_event(level, message, **payload)
 
-    def _handle_stop_loss(self) -> bool:
+    def _handle_stop_loss(self, price: float | None = None) -> bool:
         if not self.risk_manager.check_stop_loss(
             self.bot.stock_data,
             self.bot.last_buy_price,
             self.bot.actual_trade_position,
+            price=price,
         ):
             return False
 
@@ -398,7 +459,9 @@ class TradingEngine:
             self._log_order_blocked("SELL", str(e))
             return False
         if OrderExecutor.is_filled(order):
-            self.state_store.log_order(self.bot.operation_code, order)
+            self.state_store.log_order(
+                self.bot.operation_code, order, created_at=self._clock().isoformat()
+            )
             self._record_closed_trade("stop_loss", order)
             self.bot.actual_trade_position = False
             self.bot.take_profit_index = 0
@@ -406,19 +469,22 @@ class TradingEngine:
             return True
         return False
 
-    def _handle_take_profit(self) -> bool:
+    def _handle_take_profit(self, price: float | None = None) -> bool:
         result = self.risk_manager.check_take_profit(
             self.bot.stock_data,
             self.bot.last_buy_price,
             self.bot.actual_trade_position,
             self.bot.take_profit_index,
             self.bot.last_stock_account_balance,
+            price=price,
         )
         if not result:
             return False
 
         quantity, tp_pct, new_index = result
-        close_price = float(self.bot.stock_data["close_price"].iloc[-1])
+        close_price = (
+            float(self.bot.stock_data["close_price"].iloc[-1]) if price is None else price
+        )
         quantity = MarketDataService.size_quantity_for_filters(
             quantity=quantity,
             price=close_price,
@@ -440,7 +506,9 @@ class TradingEngine:
             return False
         if OrderExecutor.is_filled(order):
             self.bot.take_profit_index = new_index
-            self.state_store.log_order(self.bot.operation_code, order)
+            self.state_store.log_order(
+                self.bot.operation_code, order, created_at=self._clock().isoformat()
+            )
             self._record_closed_trade("take_profit", order, extra={"tp_pct": tp_pct})
             if quantity >= self.bot.last_stock_account_balance * 0.99:
                 self.bot.actual_trade_position = False
@@ -482,14 +550,28 @@ class TradingEngine:
             return False
         return True
 
+    @contextmanager
+    def _quote_spend(self):
+        """Serialize quote-spending orders with other assets, on a fresh balance."""
+        if self.order_lock is None:
+            yield
+            return
+        with self.order_lock:
+            self.bot.account_data = self.bot.getUpdatedAccountData()
+            yield
+
     def _place_buy(self, price=0):
+        with self._quote_spend():
+            return self._place_buy_locked(price)
+
+    def _place_buy_locked(self, price=0):
         quantity = self._resolve_quantity("BUY")
         close_price = float(self.bot.stock_data["close_price"].iloc[-1])
         if not self._validate_before_order("BUY", quantity, close_price * 0.998):
             return False
         try:
             order = self.order_executor.buy_limited(
-                self.bot.stock_data, quantity, price
+                self.bot.stock_data, quantity, price, indicators=self.indicators
             )
         except BinanceAPIException as e:
             self.risk_manager.record_api_error()
@@ -497,7 +579,9 @@ class TradingEngine:
             return False
         if OrderExecutor.is_filled(order):
             self.bot.actual_trade_position = True
-            if self.state_store.log_order(self.bot.operation_code, order):
+            if self.state_store.log_order(
+                self.bot.operation_code, order, created_at=self._clock().isoformat()
+            ):
                 self.risk_manager.record_trade_pnl(0)
         elif OrderExecutor.is_order_active(order):
             self.bot.actual_trade_position = True
@@ -523,6 +607,7 @@ class TradingEngine:
                 self.bot.acceptable_loss_percentage / 100,
                 self.bot.getMinimumPriceToSell,
                 price,
+                indicators=self.indicators,
             )
         except BinanceAPIException as e:
             self.risk_manager.record_api_error()
@@ -531,14 +616,61 @@ class TradingEngine:
         if OrderExecutor.is_filled(order):
             self.bot.actual_trade_position = False
             self.bot.take_profit_index = 0
-            self.state_store.log_order(self.bot.operation_code, order)
+            self.state_store.log_order(
+                self.bot.operation_code, order, created_at=self._clock().isoformat()
+            )
             self._record_closed_trade("sell", order)
         elif OrderExecutor.is_order_active(order):
             pass
         self._save_state()
         return order
 
-    def execute(self):
+    def check_exit_price(self, price: float) -> str | None:
+        """
+        Run the stop-loss/take-profit exits against a live trade price between
+        cycles. Skipped while a cycle is running (it checks exits itself).
+        """
+        if price <= 0 or not self.bot.actual_trade_position:
+            return None
+        data = self.bot.stock_data
+        if data is None or len(data) < 2 or self.risk_manager.is_circuit_open():
+            return None
+        if not self._cycle_lock.acquire(blocking=False):
+            return None
+        try:
+            if self._handle_stop_loss(price):
+                action = "stop_loss"
+                self.bot.time_to_sleep = self.bot.time_to_trade
+            elif self._handle_take_profit(price):
+                action = "take_profit"
+                self.bot.time_to_sleep = self.bot.delay_after_order
+            else:
+                return None
+            log_event(
+                logging.WARNING if action == "stop_loss" else logging.INFO,
+                "Exit triggered by price watcher",
+                event="price_watch_exit",
+                operation_code=self.bot.operation_code,
+                action=action,
+                price=price,
+            )
+            # sellMarketOrder and the next take-profit tier size from these, so
+            # re-read them now rather than at the next cycle.
+            self.update_all_data()
+            return action
+        finally:
+            self._cycle_lock.release()
+
+    def execute(self, reads=None):
+        # State saves during the cycle are coalesced and written once when it ends, even on errors.
+        with self._cycle_lock, self.state_store.batch():
+            self._reads = reads
+            try:
+                self._execute_cycle()
+            finally:
+                self._reads = None
+
+    def _execute_cycle(self):
         if self.risk_manager.is_circuit_open():
             logging.warning("Circuit breaker open, skipping cycle for %s", self.bot.operation_code)
             self.bot.time_to_sleep = self.bot.time_to_trade
@@ -665,6 +797,7 @@ class TradingEngine:
             main_strategy_args=self.bot.main_strategy_args,
             fallback_strategy=self.bot.fallback_strategy,
             fallback_strategy_args=self.bot.fallback_strategy_args,
+            indicators=self.indicators,
         )
         self._last_strategy_decision = decision
         self.bot.last_trade_decision = decision.side
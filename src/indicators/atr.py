@@ -1,6 +1,13 @@
+import math
+
 import pandas as pd
 import numpy as np
 
+try:
+    from numba import njit as _njit
+except ImportError:  # numba is optional; the pure-Python kernels are the fallback
+    _njit = None
+
 
 def _resolve_ohlc(data: pd.DataFrame):
     if "high_price" in data.columns:
@@ -25,56 +32,137 @@ def atr(data: pd.DataFrame, window=14):
     return true_range.rolling(window=window).mean()
 
 
-def compute_trailing_stop(close: pd.Series, atr_values: pd.Series, multiplier: float) -> pd.Series:
-    """Calcula trailing stop estilo UT Bot a partir de close e ATR."""
-    trailing_stop = pd.Series(np.nan, index=close.index)
-
-    for i in range(1, len(close)):
-        prev_stop = trailing_stop.iloc[i - 1]
-        if pd.isna(prev_stop):
-            prev_stop = close.iloc[i - 1]
+def _trailing_stop_kernel(close, atr_values, multiplier):
+    n = len(close)
+    trailing_stop = np.full(n, np.nan)
+    for i in range(1, n):
+        prev_stop = trailing_stop[i - 1]
+        if np.isnan(prev_stop):
+            prev_stop = close[i - 1]
 
-        curr_close = close.iloc[i]
-        prev_close = close.iloc[i - 1]
-        curr_atr = atr_values.iloc[i]
+        curr_close = close[i]
+        prev_close = close[i - 1]
+        curr_atr = atr_values[i]
 
-        if pd.isna(curr_atr):
-            trailing_stop.iloc[i] = prev_stop
+        if np.isnan(curr_atr):
+            trailing_stop[i] = prev_stop
             continue
 
         if curr_close > prev_stop and prev_close > prev_stop:
-            trailing_stop.iloc[i] = max(prev_stop, curr_close - multiplier * curr_atr)
+            candidate = curr_close - multiplier * curr_atr
+            trailing_stop[i] = candidate if candidate > prev_stop else prev_stop
         elif curr_close < prev_stop and prev_close < prev_stop:
-            trailing_stop.iloc[i] = min(prev_stop, curr_close + multiplier * curr_atr)
+            candidate = curr_close + multiplier * curr_atr
+            trailing_stop[i] = candidate if candidate < prev_stop else prev_stop
         elif curr_close > prev_stop:
-            trailing_stop.iloc[i] = curr_close - multiplier * curr_atr
+            trailing_stop[i] = curr_close - multiplier * curr_atr
         else:
-            trailing_stop.iloc[i] = curr_close + multiplier * curr_atr
-
+            trailing_stop[i] = curr_close + multiplier * curr_atr
     return trailing_stop
 
 
-def compute_ut_position(close: pd.Series, trailing_stop: pd.Series) -> np.ndarray:
-    """
-    Retorna array de posição: 1=long, -1=short, 0=neutro (sem sinal ainda).
-    """
-    pos = np.zeros(len(close))
-
-    for i in range(1, len(close)):
-        if pd.isna(trailing_stop.iloc[i - 1]) or pd.isna(trailing_stop.iloc[i]):
+def _ut_position_kernel(close, trailing_stop):
+    n = len(close)
+    pos = np.zeros(n)
+    for i in range(1, n):
+        prev_stop = trailing_stop[i - 1]
+        curr_stop = trailing_stop[i]
+        if np.isnan(prev_stop) or np.isnan(curr_stop):
             pos[i] = pos[i - 1]
             continue
 
-        prev_close = close.iloc[i - 1]
-        curr_close = close.iloc[i]
-        prev_stop = trailing_stop.iloc[i - 1]
-        curr_stop = trailing_stop.iloc[i]
-
+        prev_close = close[i - 1]
+        curr_close = close[i]
         if prev_close < prev_stop and curr_close > curr_stop:
             pos[i] = 1
         elif prev_close > prev_stop and curr_close < curr_stop:
             pos[i] = -1
         else:
             pos[i] = pos[i - 1]
-
     return pos
+
+
+def _trailing_stop_python(close, atr_values, multiplier):
+    # Same recurrence as the kernel, on plain floats: element access on lists is
+    # much cheaper than on ndarrays when numba is not available.
+    closes = close.tolist()
+    atrs = atr_values.tolist()
+    n = len(closes)
+    stops = [math.nan] * n
+    for i in range(1, n):
+        prev_stop = stops[i - 1]
+        if prev_stop != prev_stop:
+            prev_stop = closes[i - 1]
+
+        curr_close = closes[i]
+        prev_close = closes[i - 1]
+        curr_atr = atrs[i]
+
+        if curr_atr != curr_atr:
+            stops[i] = prev_stop
+            continue
+
+        if curr_close > prev_stop and prev_close > prev_stop:
+            candidate = curr_close - multiplier * curr_atr
+            stops[i] = candidate if candidate > prev_stop else prev_stop
+        elif curr_close < prev_stop and prev_close < prev_stop:
+            candidate = curr_close + multiplier * curr_atr
+            stops[i] = candidate if candidate < prev_stop else prev_stop
+        elif curr_close > prev_stop:
+            stops[i] = curr_close - multiplier * curr_atr
+        else:
+            stops[i] = curr_close + multiplier * curr_atr
+    return np.array(stops, dtype=np.float64)
+
+
+def _ut_position_python(close, trailing_stop):
+    closes = close.tolist()
+    stops = trailing_stop.tolist()
+    n = len(closes)
+    pos = [0.0] * n
+    for i in range(1, n):
+        prev_stop = stops[i - 1]
+        curr_stop = stops[i]
+        if prev_stop != prev_stop or curr_stop != curr_stop:
+            pos[i] = pos[i - 1]
+            continue
+
+        prev_close = closes[i - 1]
+        curr_close = closes[i]
+        if prev_close < prev_stop and curr_close > curr_stop:
+            pos[i] = 1.0
+        elif prev_close > prev_stop and curr_close < curr_stop:
+            pos[i] = -1.0
+        else:
+            pos[i] = pos[i - 1]
+    return np.array(pos, dtype=np.float64)
+
+
+if _njit is not None:
+    _trailing_stop_impl = _njit(cache=True)(_trailing_stop_kernel)
+    _ut_position_impl = _njit(cache=True)(_ut_position_kernel)
+else:
+    _trailing_stop_impl = _trailing_stop_python
+    _ut_position_impl = _ut_position_python
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+
+
+def compute_trailing_stop(close: pd.Series, atr_values: pd.Series, multiplier: float) -> pd.Series:
+    """Calcula trailing stop estilo UT Bot a partir de close e ATR.
+
+    Roda sobre arrays float64 (compilado com numba quando instalado).
+    """
+    stops = _trailing_stop_impl(
+        _as_float_array(close), _as_float_array(atr_values), float(multiplier)
+    )
+    return pd.Series(stops, index=close.index)
+
+
+def compute_ut_position(close: pd.Series, trailing_stop: pd.Series) -> np.ndarray:
+    """
+    Retorna array de posição: 1=long, -1=short, 0=neutro (sem sinal ainda).
+    """
+    return _ut_position_impl(_as_float_array(close), _as_float_array(trailing_stop))
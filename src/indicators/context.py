@@ -0,0 +1,125 @@
+import pandas as pd
+
+from indicators.adx import adx
+from indicators.atr import atr, compute_trailing_stop, compute_ut_position
+from indicators.ema import ema
+from indicators.rsi import rsi
+from indicators.streaming import CANDLE_COLUMNS
+
+
+class SeriesValue:
+    """Read side shared with ``StreamingIndicator``: ``value`` and ``tail(n)``."""
+
+    __slots__ = ("series",)
+
+    def __init__(self, series: pd.Series):
+        self.series = series
+
+    @property
+    def value(self) -> float:
+        if len(self.series) == 0:
+            return float("nan")
+        return float(self.series.iloc[-1])
+
+    def tail(self, n: int) -> list:
+        if n <= 0:
+            return []
+        return self.series.iloc[-n:].tolist()
+
+
+class TrailingStopValue(SeriesValue):
+    __slots__ = ("atr", "positions")
+
+    def __init__(self, stop: pd.Series, positions, atr_value: SeriesValue):
+        super().__init__(stop)
+        self.positions = positions
+        self.atr = atr_value
+
+    @property
+    def position(self) -> float:
+        return float(self.positions[-1]) if len(self.positions) else 0.0
+
+
+class IndicatorContext:
+    """
+    Cache de indicadores de uma janela de candles (um ciclo do engine).
+
+    Cada série é calculada uma única vez por ``(indicador, parâmetros)``; um
+    contexto vale para uma única versão dos dados (o engine cria outro a cada
+    atualização). Detectores, estratégia, resumo do ciclo e ordens limitadas
+    compartilham o mesmo contexto e a mesma conversão numérica da janela.
+    """
+
+    def __init__(self, stock_data: pd.DataFrame, version: int = 0):
+        self.version = version
+        self.source = stock_data
+        self._frame: pd.DataFrame | None = None
+        self._cache: dict[tuple, object] = {}
+
+    def __len__(self) -> int:
+        return 0 if self.source is None else len(self.source)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            self._frame = self._numeric_frame(self.source)
+        return self._frame
+
+    @staticmethod
+    def _numeric_frame(stock_data: pd.DataFrame | None) -> pd.DataFrame:
+        if stock_data is None:
+            return pd.DataFrame(columns=list(CANDLE_COLUMNS))
+        columns = [col for col in CANDLE_COLUMNS if col in stock_data.columns]
+        if all(stock_data[col].dtype == "float64" for col in columns) and not (
+            stock_data[columns].isna().to_numpy().any()
+        ):
+            # Candle windows from CandleFrame are already float64: use them as-is.
+            return stock_data
+        frame = stock_data.copy()
+        for col in columns:
+            frame[col] = pd.to_numeric(frame[col], errors="coerce")
+        return frame.dropna(subset=columns)
+
+    def _memo(self, name: str, params: tuple, compute):
+        key = (name, params)
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def ema(self, span: int, column: str = "close_price") -> SeriesValue:
+        return self._memo(
+            "ema", (span, column), lambda: SeriesValue(ema(self.frame[column], span))
+        )
+
+    def sma(self, window: int, column: str = "close_price") -> SeriesValue:
+        return self._memo(
+            "sma",
+            (window, column),
+            lambda: SeriesValue(self.frame[column].rolling(window=window).mean()),
+        )
+
+    def rsi(self, period: int = 14) -> SeriesValue:
+        return self._memo(
+            "rsi",
+            (period,),
+            lambda: SeriesValue(rsi(self.frame["close_price"], period, last_only=False)),
+        )
+
+    def atr(self, window: int = 14) -> SeriesValue:
+        return self._memo(
+            "atr", (window,), lambda: SeriesValue(atr(self.frame, window=window))
+        )
+
+    def adx(self, period: int = 14) -> SeriesValue:
+        return self._memo(
+            "adx", (period,), lambda: SeriesValue(adx(self.frame, period=period))
+        )
+
+    def trailing_stop(self, atr_period: int = 14, multiplier: float = 2.5) -> TrailingStopValue:
+        def compute():
+            close = self.frame["close_price"]
+            atr_value = self.atr(atr_period)
+            stop = compute_trailing_stop(close, atr_value.series, multiplier)
+            return TrailingStopValue(stop, compute_ut_position(close, stop), atr_value)
+
+        return self._memo("trailing_stop", (atr_period, float(multiplier)), compute)
@@ -0,0 +1,503 @@
+"""
+Indicadores incrementais: semeados uma vez a partir do histórico e depois
+atualizados candle a candle em O(1).
+
+Cada indicador reproduz a fórmula vetorizada equivalente em ``indicators/``
+(mesmas médias de Wilder/EMA do pandas com ``adjust=False``). ``revise``
+substitui o último candle (ainda em formação) sem avançar o estado.
+"""
+
+import math
+from collections import deque
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+NAN = math.nan
+CANDLE_COLUMNS = ("open_price", "high_price", "low_price", "close_price", "volume")
+
+
+def _isnan(value: float) -> bool:
+    return value != value
+
+
+def _div(num: float, den: float) -> float:
+    """Float division with NumPy semantics (x/0 -> ±inf, 0/0 -> nan)."""
+    if den == 0:
+        if num == 0 or _isnan(num):
+            return NAN
+        return math.inf if num > 0 else -math.inf
+    return num / den
+
+
+def _nanmax(*values: float) -> float:
+    present = [value for value in values if not _isnan(value)]
+    return max(present) if present else NAN
+
+
+class _Ewm:
+    """``Series.ewm(alpha=..., adjust=False).mean()`` fed one value at a time."""
+
+    __slots__ = ("_factor", "_alpha", "_state", "_saved")
+
+    def __init__(self, alpha: float):
+        self._alpha = alpha
+        self._factor = 1 - alpha
+        self._state = (NAN, 1.0)
+        self._saved = self._state
+
+    def _step(self, state: tuple, value: float) -> tuple:
+        weighted, old_wt = state
+        observed = not _isnan(value)
+        if not _isnan(weighted):
+            old_wt *= self._factor
+            if observed:
+                if weighted != value:
+                    weighted = old_wt * weighted + self._alpha * value
+                    weighted /= old_wt + self._alpha
+                old_wt = 1.0
+        elif observed:
+            weighted = value
+        return weighted, old_wt
+
+    def push(self, value: float) -> float:
+        self._saved = self._state
+        self._state = self._step(self._state, value)
+        return self._state[0]
+
+    def revise(self, value: float) -> float:
+        self._state = self._step(self._saved, value)
+        return self._state[0]
+
+
+class _RollingSum:
+    """Fixed-window sum that is NaN until the window is full and NaN-free."""
+
+    __slots__ = ("window", "_values", "_sum", "_nans", "_since_resum")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: deque = deque()
+        self._sum = 0.0
+        self._nans = 0
+        self._since_resum = 0
+
+    def _add(self, value: float):
+        if _isnan(value):
+            self._nans += 1
+        else:
+            self._sum += value
+
+    def _remove(self, value: float):
+        if _isnan(value):
+            self._nans -= 1
+        else:
+            self._sum -= value
+
+    def _result(self) -> float:
+        if len(self._values) < self.window or self._nans:
+            return NAN
+        return self._sum
+
+    def push(self, value: float) -> float:
+        self._values.append(value)
+        self._add(value)
+        if len(self._values) > self.window:
+            self._remove(self._values.popleft())
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            # Re-add the window now and then so float drift cannot accumulate.
+            self._sum = math.fsum(v for v in self._values if not _isnan(v))
+            self._since_resum = 0
+        return self._result()
+
+    def revise(self, value: float) -> float:
+        if not self._values:
+            return self.push(value)
+        self._remove(self._values[-1])
+        self._values[-1] = value
+        self._add(value)
+        return self._result()
+
+
+def _true_range(candle: dict, prev: dict | None, skip_nan: bool = True) -> float:
+    high = candle["high_price"]
+    low = candle["low_price"]
+    prev_close = NAN if prev is None else prev["close_price"]
+    ranges = (high - low, abs(high - prev_close), abs(low - prev_close))
+    if skip_nan:
+        return _nanmax(*ranges)
+    if any(_isnan(value) for value in ranges):
+        return NAN
+    return max(ranges)
+
+
+class StreamingIndicator:
+    """Base: keeps the last ``history`` outputs and the previous candle."""
+
+    def __init__(self, history: int = 64):
+        self._values: deque = deque(maxlen=max(1, history))
+        self._prev: dict | None = None
+        self._last: dict | None = None
+        self.count = 0
+
+    @property
+    def value(self) -> float:
+        return self._values[-1] if self._values else NAN
+
+    def tail(self, n: int) -> list:
+        if n <= 0:
+            return []
+        return list(self._values)[-n:]
+
+    def update(self, candle: dict) -> float:
+        """Append a new candle."""
+        self._prev, self._last = self._last, candle
+        self.count += 1
+        self._values.append(self._compute(candle, self._prev, revise=False))
+        return self._values[-1]
+
+    def revise(self, candle: dict) -> float:
+        """Replace the last (still forming) candle."""
+        if not self._values:
+            return self.update(candle)
+        self._last = candle
+        self._values[-1] = self._compute(candle, self._prev, revise=True)
+        return self._values[-1]
+
+    def seed(self, frame: pd.DataFrame) -> "StreamingIndicator":
+        for candle in iter_candles(frame):
+            self.update(candle)
+        return self
+
+    def _compute(self, candle: dict, prev: dict | None, revise: bool) -> float:
+        raise NotImplementedError
+
+    @staticmethod
+    def _feed(primitive, value: float, revise: bool) -> float:
+        return primitive.revise(value) if revise else primitive.push(value)
+
+
+class StreamingEMA(StreamingIndicator):
+    def __init__(self, span: int, column: str = "close_price", history: int = 64):
+        super().__init__(history)
+        self.column = column
+        self._ewm = _Ewm(2 / (span + 1))
+
+    def _compute(self, candle, prev, revise):
+        return self._feed(self._ewm, candle[self.column], revise)
+
+
+class StreamingSMA(StreamingIndicator):
+    def __init__(self, window: int, column: str = "close_price", history: int = 64):
+        super().__init__(history)
+        self.column = column
+        self.window = window
+        self._sum = _RollingSum(window)
+
+    def _compute(self, candle, prev, revise):
+        total = self._feed(self._sum, candle[self.column], revise)
+        return total / self.window
+
+
+class StreamingRSI(StreamingIndicator):
+    def __init__(self, period: int = 14, history: int = 64):
+        super().__init__(history)
+        self._gain = _Ewm(1 / period)
+        self._loss = _Ewm(1 / period)
+
+    def _compute(self, candle, prev, revise):
+        delta = NAN if prev is None else candle["close_price"] - prev["close_price"]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else -0.0
+        avg_gain = self._feed(self._gain, gain, revise)
+        avg_loss = self._feed(self._loss, loss, revise)
+        rs = _div(avg_gain, avg_loss)
+        return 100 - _div(100, 1 + rs)
+
+
+class StreamingATR(StreamingIndicator):
+    """Simple moving average of the true range, as ``indicators.atr.atr``."""
+
+    def __init__(self, window: int = 14, history: int = 64):
+        super().__init__(history)
+        self.window = window
+        self._sum = _RollingSum(window)
+
+    def _compute(self, candle, prev, revise):
+        total = self._feed(self._sum, _true_range(candle, prev), revise)
+        return total / self.window
+
+
+class StreamingADX(StreamingIndicator):
+    def __init__(self, period: int = 14, history: int = 64):
+        super().__init__(history)
+        alpha = 1 / period
+        self._atr = _Ewm(alpha)
+        self._plus = _Ewm(alpha)
+        self._minus = _Ewm(alpha)
+        self._adx = _Ewm(alpha)
+
+    def _compute(self, candle, prev, revise):
+        if prev is None:
+            up_move = down_move = NAN
+        else:
+            up_move = candle["high_price"] - prev["high_price"]
+            down_move = prev["low_price"] - candle["low_price"]
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+
+        atr = self._feed(self._atr, _true_range(candle, prev), revise)
+        plus_di = _div(100 * self._feed(self._plus, plus_dm, revise), atr)
+        minus_di = _div(100 * self._feed(self._minus, minus_dm, revise), atr)
+        di_sum = plus_di + minus_di
+        dx = NAN if di_sum == 0 else _div(abs(plus_di - minus_di), di_sum) * 100
+        return self._feed(self._adx, dx, revise)
+
+
+class StreamingMACD(StreamingIndicator):
+    """``value`` is the MACD line; ``signal`` and ``histogram`` follow it."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, history: int = 64):
+        super().__init__(history)
+        self._fast = _Ewm(2 / (fast + 1))
+        self._slow = _Ewm(2 / (slow + 1))
+        self._signal = _Ewm(2 / (signal + 1))
+        self.signal = NAN
+        self.histogram = NAN
+
+    def _compute(self, candle, prev, revise):
+        close = candle["close_price"]
+        line = self._feed(self._fast, close, revise) - self._feed(self._slow, close, revise)
+        self.signal = self._feed(self._signal, line, revise)
+        self.histogram = line - self.signal
+        return line
+
+
+class StreamingVortex(StreamingIndicator):
+    """``value`` is VI+ (or VI- with ``positive=False``); both are exposed."""
+
+    def __init__(self, window: int = 14, positive: bool = True, history: int = 64):
+        super().__init__(history)
+        self.positive = positive
+        self._tr = _RollingSum(window)
+        self._vm_plus = _RollingSum(window)
+        self._vm_minus = _RollingSum(window)
+        self.plus = NAN
+        self.minus = NAN
+
+    def _compute(self, candle, prev, revise):
+        if prev is None:
+            vm_plus = vm_minus = NAN
+        else:
+            vm_plus = abs(candle["high_price"] - prev["low_price"])
+            vm_minus = abs(candle["low_price"] - prev["high_price"])
+        sum_tr = self._feed(self._tr, _true_range(candle, prev, skip_nan=False), revise)
+        self.plus = _div(self._feed(self._vm_plus, vm_plus, revise), sum_tr)
+        self.minus = _div(self._feed(self._vm_minus, vm_minus, revise), sum_tr)
+        return self.plus if self.positive else self.minus
+
+
+class StreamingTrailingStop(StreamingIndicator):
+    """ATR trailing stop and UT position (``compute_trailing_stop``/``compute_ut_position``)."""
+
+    def __init__(self, atr_period: int = 14, multiplier: float = 2.5, history: int = 64):
+        super().__init__(history)
+        self.multiplier = multiplier
+        self.atr = StreamingATR(atr_period, history=2)
+        self._before = (NAN, 0.0)  # (stop, position) of the previous candle
+        self._current = (NAN, 0.0)
+
+    @property
+    def position(self) -> float:
+        return self._current[1]
+
+    def _compute(self, candle, prev, revise):
+        curr_atr = self.atr.revise(candle) if revise else self.atr.update(candle)
+        if not revise:
+            self._before = self._current
+        if prev is None:
+            self._current = (NAN, 0.0)
+            return NAN
+
+        prev_stop_raw, prev_pos = self._before
+        prev_stop = prev["close_price"] if _isnan(prev_stop_raw) else prev_stop_raw
+        curr_close = candle["close_price"]
+        prev_close = prev["close_price"]
+
+        if _isnan(curr_atr):
+            stop = prev_stop
+        elif curr_close > prev_stop and prev_close > prev_stop:
+            candidate = curr_close - self.multiplier * curr_atr
+            stop = candidate if candidate > prev_stop else prev_stop
+        elif curr_close < prev_stop and prev_close < prev_stop:
+            candidate = curr_close + self.multiplier * curr_atr
+            stop = candidate if candidate < prev_stop else prev_stop
+        elif curr_close > prev_stop:
+            stop = curr_close - self.multiplier * curr_atr
+        else:
+            stop = curr_close + self.multiplier * curr_atr
+
+        if _isnan(prev_stop_raw) or _isnan(stop):
+            position = prev_pos
+        elif prev_close < prev_stop_raw and curr_close > stop:
+            position = 1.0
+        elif prev_close > prev_stop_raw and curr_close < stop:
+            position = -1.0
+        else:
+            position = prev_pos
+        self._current = (stop, position)
+        return stop
+
+
+def _candle_arrays(frame: pd.DataFrame) -> tuple[list[str], list[np.ndarray]]:
+    columns = [col for col in CANDLE_COLUMNS if col in frame.columns]
+    arrays = []
+    for col in columns:
+        series = frame[col]
+        if series.dtype.kind != "f":
+            series = pd.to_numeric(series, errors="coerce")
+        arrays.append(series.to_numpy())
+    return columns, arrays
+
+
+def _iter_rows(columns: list[str], arrays: list[np.ndarray], start: int = 0):
+    for values in zip(*(array[start:].tolist() for array in arrays)):
+        yield dict(zip(columns, values))
+
+
+def iter_candles(frame: pd.DataFrame, start: int = 0):
+    return _iter_rows(*_candle_arrays(frame), start)
+
+
+class IndicatorStream:
+    """
+    Estado incremental dos indicadores de um ativo.
+
+    ``sync`` recebe a janela de candles de cada ciclo; candles novos são
+    aplicados com ``update`` e o candle em formação com ``revise``. Os
+    indicadores são criados sob demanda e semeados com a janela atual.
+    """
+
+    def __init__(self, history: int = 64):
+        self.history = history
+        self._indicators: dict[tuple, StreamingIndicator] = {}
+        self._factories: dict[tuple, Callable[[], StreamingIndicator]] = {}
+        self._frame: pd.DataFrame | None = None
+        self._last_open_time = None
+        self._closed_anchor: tuple | None = None
+
+    def __len__(self) -> int:
+        return 0 if self._frame is None else len(self._frame)
+
+    def sync(self, frame: pd.DataFrame) -> "IndicatorStream":
+        if frame is None or len(frame) == 0:
+            self._reset(None)
+            return self
+        if self._frame is None:
+            self._reset(frame)
+            return self
+
+        columns, arrays = _candle_arrays(frame)
+        start = self._resume_position(frame, arrays)
+        if start is None:
+            self._reset(frame)
+            return self
+
+        candles = list(_iter_rows(columns, arrays, start))
+        for indicator in self._indicators.values():
+            indicator.revise(candles[0])
+            for candle in candles[1:]:
+                indicator.update(candle)
+        self._remember(frame, arrays)
+        return self
+
+    def _resume_position(self, frame: pd.DataFrame, arrays: list) -> int | None:
+        """Position of the previously-last candle inside ``frame`` (None = unrelated)."""
+        if "open_time" in frame.columns and self._last_open_time is not None:
+            times = frame["open_time"].values
+            position = int(times.searchsorted(self._last_open_time))
+            if position >= len(frame) or times[position] != self._last_open_time:
+                return None
+            return position
+
+        previous = len(self._frame)
+        if len(frame) < previous:
+            return None
+        if previous >= 2 and self._closed_anchor != self._row_values(arrays, previous - 2):
+            return None
+        return previous - 1
+
+    @staticmethod
+    def _row_values(arrays: list, position: int) -> tuple:
+        return tuple(array[position] for array in arrays)
+
+    def _remember(self, frame: pd.DataFrame, arrays: list | None = None):
+        if arrays is None:
+            arrays = _candle_arrays(frame)[1]
+        self._frame = frame
+        self._last_open_time = (
+            frame["open_time"].values[-1] if "open_time" in frame.columns else None
+        )
+        self._closed_anchor = (
+            self._row_values(arrays, len(frame) - 2) if len(frame) >= 2 else None
+        )
+
+    def _reset(self, frame: pd.DataFrame | None):
+        self._indicators = {}
+        if frame is None:
+            self._frame = None
+            self._last_open_time = None
+            self._closed_anchor = None
+            return
+        self._remember(frame)
+        for key, factory in self._factories.items():
+            self._indicators[key] = factory().seed(frame)
+
+    def _get(self, key: tuple, factory) -> StreamingIndicator:
+        indicator = self._indicators.get(key)
+        if indicator is None:
+            self._factories[key] = factory
+            indicator = factory()
+            if self._frame is not None:
+                indicator.seed(self._frame)
+            self._indicators[key] = indicator
+        return indicator
+
+    def ema(self, span: int, column: str = "close_price") -> StreamingEMA:
+        return self._get(
+            ("ema", span, column), lambda: StreamingEMA(span, column, self.history)
+        )
+
+    def sma(self, window: int, column: str = "close_price") -> StreamingSMA:
+        return self._get(
+            ("sma", window, column), lambda: StreamingSMA(window, column, self.history)
+        )
+
+    def rsi(self, period: int = 14) -> StreamingRSI:
+        return self._get(("rsi", period), lambda: StreamingRSI(period, self.history))
+
+    def atr(self, window: int = 14) -> StreamingATR:
+        return self._get(("atr", window), lambda: StreamingATR(window, self.history))
+
+    def adx(self, period: int = 14) -> StreamingADX:
+        return self._get(("adx", period), lambda: StreamingADX(period, self.history))
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> StreamingMACD:
+        return self._get(
+            ("macd", fast, slow, signal),
+            lambda: StreamingMACD(fast, slow, signal, self.history),
+        )
+
+    def vortex(self, window: int = 14, positive: bool = True) -> StreamingVortex:
+        return self._get(
+            ("vortex", window, positive),
+            lambda: StreamingVortex(window, positive, self.history),
+        )
+
+    def trailing_stop(self, atr_period: int = 14, multiplier: float = 2.5) -> StreamingTrailingStop:
+        return self._get(
+            ("trailing_stop", atr_period, float(multiplier)),
+            lambda: StreamingTrailingStop(atr_period, multiplier, self.history),
+        )
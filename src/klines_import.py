@@ -0,0 +1,57 @@
+"""
+Importa candles historicos para o arquivo local (data/klines/<SYMBOL>/<intervalo>/).
+
+Uso:
+    PYTHONPATH=src python src/klines_import.py BTCUSDT 4h dumps/BTCUSDT-4h-*.zip
+    PYTHONPATH=src python src/klines_import.py BTCUSDT 4h --download 2021-01 2024-12
+
+Os arquivos sao os dumps mensais de https://data.binance.vision (zip ou CSV).
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+from persistence.kline_archive import DEFAULT_ARCHIVE_ROOT, KlineArchive, import_binance_dumps
+
+PUBLIC_DATA_URL = "https://data.binance.vision/data/spot/monthly/klines"
+
+
+def download_monthly(symbol: str, interval: str, first: str, last: str, dest: Path) -> list[Path]:
+    paths = []
+    for month in pd.period_range(first, last, freq="M"):
+        name = f"{symbol}-{interval}-{month.strftime('%Y-%m')}.zip"
+        response = requests.get(f"{PUBLIC_DATA_URL}/{symbol}/{interval}/{name}", timeout=60)
+        if response.status_code == 404:
+            print(f"{name}: nao publicado, pulando")
+            continue
+        response.raise_for_status()
+        path = dest / name
+        path.write_bytes(response.content)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("symbol")
+    parser.add_argument("interval")
+    parser.add_argument("files", nargs="*", help="dumps zip/CSV da Binance")
+    parser.add_argument("--download", nargs=2, metavar=("FIRST", "LAST"), help="meses YYYY-MM")
+    parser.add_argument("--root", default=str(DEFAULT_ARCHIVE_ROOT))
+    args = parser.parse_args()
+
+    archive = KlineArchive(args.symbol, args.interval, root=args.root)
+    files = [Path(path) for path in args.files]
+    with tempfile.TemporaryDirectory(prefix="klines-") as tmp:
+        if args.download:
+            files += download_monthly(archive.symbol, args.interval, *args.download, Path(tmp))
+        added = import_binance_dumps(archive, files)
+
+    print(f"{added} candles adicionados; {len(archive)} no total em {archive.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,30 @@ import time
 
 from config.reload import SettingsWatch
 from config.settings import load_settings
+from core.async_runtime import run_assets
 from modules.logging_setup import setup_logging, log_event
+from modules.BinanceClient import AsyncBinanceClient, BinanceClient
 from modules.BinanceTraderBot import BinanceTraderBot
 from Models.StockStartModel import StockStartModel
 from persistence.process_lock import ProcessLock, ProcessLockHeld, lock_path_for
 from persistence.state_store import DEFAULT_DB_PATH
+from services.market_stream import MAINNET_WS_URL, TESTNET_WS_URL
+from services.user_stream import UserDataStream
 
 shutdown_event = threading.Event()
 thread_lock = threading.Lock()
+# Serializes order placement across assets that share the quote balance.
+order_lock = threading.Lock()
 active_bots: list[BinanceTraderBot] = []
 _settings_watch: SettingsWatch | None = None
 
 
-def trader_loop(stock_start: StockStartModel, watch: SettingsWatch, env):
-    settings = watch.settings
+def build_bot(
+    stock_start: StockStartModel,
+    settings,
+    env,
+    account_stream: UserDataStream | None = None,
+) -> BinanceTraderBot:
     asset_cfg = next(
         asset for asset in settings.assets if asset.operation_code == stock_start.operationCode
     )
@@ -48,30 +58,39 @@ def trader_loop(stock_start: StockStartModel, watch: SettingsWatch, env):
         regime_config=settings.regime.model_dump(),
         grid_config=settings.grid.model_dump(),
         breakout_config=settings.breakout.model_dump(),
+        market_data_config=settings.market_data.model_dump(),
+        account_stream=account_stream,
+        order_lock=order_lock,
         breakout_price=asset_cfg.breakout_price,
     )
     active_bots.append(bot)
-    bot._settings_generation = 0
+    return bot
+
+
+def cycle_runner(bot: BinanceTraderBot, watch: SettingsWatch, use_thread_lock: bool = True):
+    """Per-bot cycle callable with settings hot-reload; errors are logged, not raised."""
+    settings_generation = 0
     total_executed = 1
 
-    while not shutdown_event.is_set():
+    def run_cycle(reads=None):
+        nonlocal settings_generation, total_executed
         try:
             watch.poll()
             generation, settings = watch.snapshot()
-            if bot._settings_generation < generation:
+            if settings_generation < generation:
                 bot.apply_soft_settings(settings)
-                bot._settings_generation = generation
-            if settings.thread_lock:
+                settings_generation = generation
+            if use_thread_lock and settings.thread_lock:
                 with thread_lock:
                     print(f"[{bot.operation_code}][{total_executed}] cycle start")
-                    bot.execute()
+                    bot.execute(reads)
                     print(
                         f"^ [{bot.operation_code}][{total_executed}] "
                         f"time_to_sleep = '{bot.time_to_sleep/60:.2f} min'"
                     )
             else:
                 print(f"[{bot.operation_code}][{total_executed}] cycle start")
-                bot.execute()
+                bot.execute(reads)
                 print(
                     f"^ [{bot.operation_code}][{total_executed}] "
                     f"time_to_sleep = '{bot.time_to_sleep/60:.2f} min'"
@@ -86,6 +105,19 @@ def trader_loop(stock_start: StockStartModel, watch: SettingsWatch, env):
             )
             bot.time_to_sleep = bot.time_to_trade
 
+    return run_cycle
+
+
+def trader_loop(
+    stock_start: StockStartModel,
+    watch: SettingsWatch,
+    env,
+    account_stream: UserDataStream | None = None,
+):
+    bot = build_bot(stock_start, watch.settings, env, account_stream)
+    run_cycle = cycle_runner(bot, watch)
+    while not shutdown_event.is_set():
+        run_cycle()
         shutdown_event.wait(bot.time_to_sleep)
 
 
@@ -106,6 +138,32 @@ def _handle_shutdown(signum, frame):
                 print(f"Failed to cancel orders for {bot.operation_code}: {e}")
 
 
+def _start_account_stream(settings, env) -> UserDataStream | None:
+    """One user data stream for the account, shared by every asset thread."""
+    if not settings.operation.user_data_stream:
+        return None
+    testnet = settings.environment == "testnet"
+    client = BinanceClient(env.api_key, env.secret_key, testnet=testnet)
+    return UserDataStream(
+        client,
+        [asset.operation_code for asset in settings.assets],
+        ws_url=TESTNET_WS_URL if testnet else MAINNET_WS_URL,
+    ).start()
+
+
+def _run_asyncio(stocks, watch: SettingsWatch, env, account_stream):
+    testnet = watch.settings.environment == "testnet"
+    clock = BinanceClient(env.api_key, env.secret_key, testnet=testnet)
+    print("Asyncio runtime started for all assets.")
+    run_assets(
+        stocks,
+        build_bot=lambda asset: build_bot(asset, watch.settings, env, account_stream),
+        cycle_runner=lambda bot: cycle_runner(bot, watch, use_thread_lock=False),
+        make_client=lambda: AsyncBinanceClient(clock),
+        stop_event=shutdown_event,
+    )
+
+
 def main():
     setup_logging()
     settings, env = load_settings()
@@ -135,23 +193,34 @@ def main():
     if hasattr(signal, "SIGHUP"):
         signal.signal(signal.SIGHUP, _handle_sighup)
 
+    account_stream = _start_account_stream(settings, env)
+
     threads = []
     try:
-        for asset in stocks:
-            thread = threading.Thread(
-                target=trader_loop, args=(asset, _settings_watch, env), daemon=True
-            )
-            thread.start()
-            threads.append(thread)
+        if settings.runtime == "asyncio":
+            _run_asyncio(stocks, _settings_watch, env, account_stream)
+        else:
+            for asset in stocks:
+                thread = threading.Thread(
+                    target=trader_loop,
+                    args=(asset, _settings_watch, env, account_stream),
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
 
-        print("Threads started for all assets.")
-        while not shutdown_event.is_set():
-            time.sleep(1)
+            print("Threads started for all assets.")
+            while not shutdown_event.is_set():
+                time.sleep(1)
 
-        for thread in threads:
-            thread.join(timeout=5)
+            for thread in threads:
+                thread.join(timeout=5)
         print("TraderBot stopped.")
     finally:
+        for bot in active_bots:
+            bot.stop()
+        if account_stream is not None:
+            account_stream.stop()
         instance_lock.release()
 
 
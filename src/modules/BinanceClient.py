@@ -1,8 +1,11 @@
+import asyncio
 import logging
 import threading
 import time
 
+import aiohttp
 import requests
+from binance.async_client import AsyncClient
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from requests.adapters import HTTPAdapter
@@ -173,3 +176,68 @@ class BinanceClient(Client):
                     time.sleep(self.retry_backoff * attempt)
                     continue
                 raise
+
+
+class AsyncBinanceClient(AsyncClient):
+    """
+    AsyncClient whose signed requests use a ``BinanceClient``'s time offset.
+
+    One instance (one aiohttp session) serves every asset. The clock client
+    owns the offset and its periodic resync, so sync and async requests sign
+    with the same timestamp; -1021 forces a resync before the retry, and the
+    same codes as ``BinanceClient`` (plus 429/5xx and connection errors) are
+    retried with a linear backoff.
+    """
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, clock: BinanceClient, *, max_retries=None, retry_backoff=None, **kwargs):
+        super().__init__(clock.API_KEY, clock.API_SECRET, testnet=clock.testnet, **kwargs)
+        self.clock = clock
+        self.max_retries = clock.max_retries if max_retries is None else max_retries
+        self.retry_backoff = clock.retry_backoff if retry_backoff is None else retry_backoff
+        self.timestamp_offset = clock.timestamp_offset
+
+    async def _sync_clock(self, force: bool) -> None:
+        clock = self.clock
+        if clock.sync:
+            current_time = int(time.time() * 1000)
+            if force or clock.timestamp_offset is None or abs(clock.timestamp_offset) > 1000:
+                await asyncio.to_thread(clock.sync_time_offset, True)
+            elif current_time - clock.last_sync_time >= clock.sync_interval:
+                await asyncio.to_thread(clock.sync_time_offset)
+        self.timestamp_offset = clock.timestamp_offset or 0
+
+    async def _request(self, method, uri: str, signed: bool, force_params: bool = False, **kwargs):
+        data = kwargs.pop("data", None)
+        if signed:
+            data = dict(data or {})
+            data.setdefault("recvWindow", BinanceClient.DEFAULT_RECV_WINDOW)
+        force_sync = False
+        attempt = 0
+        while True:
+            if signed:
+                await self._sync_clock(force_sync)
+            if data is not None:
+                # The base class writes timestamp and signature into ``data``.
+                kwargs["data"] = {
+                    key: value
+                    for key, value in data.items()
+                    if key not in ("timestamp", "signature")
+                }
+            try:
+                return await super()._request(method, uri, signed, force_params, **kwargs)
+            except BinanceAPIException as e:
+                force_sync = e.code == -1021
+                retryable = (
+                    force_sync
+                    or e.code in BinanceClient.RETRYABLE_CODES
+                    or e.status_code in self.RETRYABLE_STATUS
+                )
+                if not retryable or attempt >= self.max_retries:
+                    raise
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.max_retries:
+                    raise
+            attempt += 1
+            await asyncio.sleep(self.retry_backoff * attempt)
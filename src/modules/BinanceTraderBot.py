@@ -4,13 +4,17 @@ from datetime import datetime
 
 from binance.exceptions import BinanceAPIException
 
+from core.price_watcher import PriceWatcher
 from core.trading_engine import TradingEngine
 from core.state_fields import PersistedTradeFields
+from indicators.streaming import IndicatorStream
 from modules.BinanceClient import BinanceClient
 from modules.alerts import send_alert
 from persistence.state_store import StateStore
 from services.market_data import MarketDataService
+from services.market_stream import MAINNET_WS_URL, TESTNET_WS_URL, StreamingMarketData
 from services.order_executor import OrderExecutor
+from services.order_history import OrderHistory
 from services.risk_manager import RiskManager
 from services.regime_detector import RegimeDetector
 from services.grid_spot import GridSpotManager
@@ -55,6 +59,20 @@ def _validate_trading_permissions(client, testnet: bool):
         logging.warning("API key has IP restriction enabled.")
 
 
+def _build_market_data(client, operation_code, candle_period, config: dict, testnet: bool):
+    if config.get("source", "rest") != "websocket":
+        return MarketDataService(client, operation_code, candle_period)
+    default_url = TESTNET_WS_URL if testnet else MAINNET_WS_URL
+    return StreamingMarketData(
+        client,
+        operation_code,
+        candle_period,
+        ws_url=config.get("ws_url") or default_url,
+        reconnect_delay=config.get("reconnect_delay_seconds", 5.0),
+        stale_after=config.get("stale_after_seconds", 0.0),
+    ).start()
+
+
 class BinanceTraderBot(PersistedTradeFields):
     """Facade delegating to TradingEngine for backward compatibility."""
 
@@ -89,6 +107,9 @@ class BinanceTraderBot(PersistedTradeFields):
         breakout_config=None,
         breakout_price: float = 0.0,
         state_store=None,
+        market_data_config=None,
+        account_stream=None,
+        order_lock=None,
     ):
         print("------------------------------------------------")
         print("Robo Trader iniciando...")
@@ -119,6 +140,7 @@ class BinanceTraderBot(PersistedTradeFields):
         self.delay_after_order = delay_after_order
         self.time_to_sleep = time_to_trade
         self.testnet = testnet
+        self.account_stream = account_stream
 
         from dotenv import load_dotenv
         import os
@@ -138,8 +160,12 @@ class BinanceTraderBot(PersistedTradeFields):
         )
         _validate_trading_permissions(self.client_binance, testnet)
 
-        self.market_data = MarketDataService(
-            self.client_binance, operation_code, candle_period
+        self.market_data = _build_market_data(
+            self.client_binance,
+            operation_code,
+            candle_period,
+            market_data_config or {},
+            testnet,
         )
         filters = self.market_data.get_symbol_filters()
         self.tick_size = filters["tick_size"]
@@ -147,6 +173,7 @@ class BinanceTraderBot(PersistedTradeFields):
         self.min_notional = filters["min_notional"]
         self.quote_asset = filters["quote_asset"]
 
+        self.order_history = OrderHistory(self.client_binance, operation_code)
         self.order_executor = OrderExecutor(
             self.client_binance,
             operation_code,
@@ -192,8 +219,41 @@ class BinanceTraderBot(PersistedTradeFields):
             grid_manager=self.grid_manager,
             breakout_detector=self.breakout_detector,
             breakout_price=breakout_price,
+            indicator_stream=(
+                IndicatorStream()
+                if (market_data_config or {}).get("streaming_indicators")
+                else None
+            ),
+            order_lock=order_lock,
         )
         self.engine.bootstrap()
+        self.price_watcher = self._build_price_watcher(
+            float(risk_config.get("exit_watch_seconds", 0.0) or 0.0)
+        )
+
+    def _build_price_watcher(self, poll_seconds: float):
+        """Stop-loss/take-profit checks between cycles (0 disables)."""
+        if poll_seconds <= 0:
+            return None
+        watcher = PriceWatcher(
+            self.engine,
+            poll_seconds=poll_seconds,
+            price_source=self.getLastTradePrice,
+        )
+        if isinstance(self.market_data, StreamingMarketData):
+            return watcher.attach(self.market_data)
+        return watcher.start()
+
+    def stop(self):
+        """Stop the price watcher and the market data stream, if any."""
+        if self.price_watcher is not None:
+            self.price_watcher.stop()
+        if isinstance(self.market_data, StreamingMarketData):
+            self.market_data.stop()
+
+    def getLastTradePrice(self) -> float:
+        ticker = self.client_binance.get_symbol_ticker(symbol=self.operation_code)
+        return float(ticker["price"])
 
     def setStepSizeAndTickSize(self):
         filters = self.market_data.get_symbol_filters()
@@ -209,7 +269,17 @@ class BinanceTraderBot(PersistedTradeFields):
     def updateAllData(self, verbose=False):
         self.engine.update_all_data(verbose=verbose)
 
+    def _account_state(self):
+        """In-memory account state while the user data stream is live, else None (use REST)."""
+        stream = self.account_stream
+        if stream is not None and stream.is_live:
+            return stream.state
+        return None
+
     def getUpdatedAccountData(self):
+        state = self._account_state()
+        if state is not None:
+            return state.account_data()
         return self.client_binance.get_account()
 
     def getLastStockAccountBalance(self):
@@ -226,14 +296,21 @@ class BinanceTraderBot(PersistedTradeFields):
         return self.market_data.fetch_klines()
 
     def getLastBuyPrice(self, verbose=False):
-        orders = self.client_binance.get_all_orders(symbol=self.operation_code, limit=100)
-        return self.market_data.get_last_fill_price(orders, "BUY")
+        state = self._account_state()
+        if state is not None:
+            return state.last_fill_price(self.operation_code, "BUY")
+        return self.order_history.last_fill_price("BUY")
 
     def getLastSellPrice(self, verbose=False):
-        orders = self.client_binance.get_all_orders(symbol=self.operation_code, limit=100)
-        return self.market_data.get_last_fill_price(orders, "SELL")
+        state = self._account_state()
+        if state is not None:
+            return state.last_fill_price(self.operation_code, "SELL")
+        return self.order_history.last_fill_price("SELL")
 
     def getOpenOrders(self):
+        state = self._account_state()
+        if state is not None:
+            return state.open_orders(self.operation_code)
         return self.client_binance.get_open_orders(symbol=self.operation_code)
 
     def cancelAllOrders(self):
@@ -274,15 +351,21 @@ class BinanceTraderBot(PersistedTradeFields):
     def sellLimitedOrder(self, price=0):
         return self.engine._place_sell(price)
 
+    def _stream_open_orders(self):
+        state = self._account_state()
+        return None if state is None else state.open_orders(self.operation_code)
+
     def hasOpenBuyOrder(self):
-        has, partial, last_price = self.order_executor.has_open_buy_order()
+        has, partial, last_price = self.order_executor.has_open_buy_order(
+            self._stream_open_orders()
+        )
         self.partial_quantity_discount = partial
         if last_price > 0:
             self.last_buy_price = last_price
         return has
 
     def hasOpenSellOrder(self):
-        has, partial = self.order_executor.has_open_sell_order()
+        has, partial = self.order_executor.has_open_sell_order(self._stream_open_orders())
         self.partial_quantity_discount = partial
         return has
 
@@ -344,8 +427,8 @@ class BinanceTraderBot(PersistedTradeFields):
         self.engine.grid_manager = self.grid_manager
         self.engine.breakout_detector = self.breakout_detector
 
-    def execute(self):
-        self.engine.execute()
+    def execute(self, reads=None):
+        self.engine.execute(reads)
 
     def printStock(self):
         for stock in self.account_data["balances"]:
@@ -1,6 +1,17 @@
+import inspect
+from functools import lru_cache
+
 from strategies.decision import StrategyDecision
 
 
+@lru_cache(maxsize=None)
+def _accepts_indicators(strategy) -> bool:
+    try:
+        return "indicators" in inspect.signature(strategy).parameters
+    except (TypeError, ValueError):
+        return False
+
+
 class StrategyRunner:
 
     @staticmethod
@@ -12,10 +23,13 @@ class StrategyRunner:
         main_strategy_args=None,
         fallback_strategy_args=None,
         verbose=True,
+        indicators=None,
     ) -> StrategyDecision:
         main_args = {**(main_strategy_args or {})}
         main_args["stock_data"] = stock_data
         main_args["verbose"] = verbose
+        if indicators is not None and _accepts_indicators(main_strategy):
+            main_args["indicators"] = indicators
 
         decision = StrategyDecision.from_raw(
             main_strategy(**main_args),
@@ -30,6 +44,8 @@ class StrategyRunner:
             fallback_args = {**(fallback_strategy_args or {})}
             fallback_args["stock_data"] = stock_data
             fallback_args["verbose"] = verbose
+            if indicators is not None and _accepts_indicators(fallback_strategy):
+                fallback_args["indicators"] = indicators
             decision = StrategyDecision.from_raw(
                 fallback_strategy(**fallback_args),
                 source="fallback",
@@ -0,0 +1,323 @@
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from services.candle_frame import PRICE_COLUMNS, CandleFrame
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_RESULTS_PATH = PROJECT_ROOT / "data" / "backtests.db"
+# Sources whose edits change backtest results.
+CODE_VERSION_GLOBS = ("src/strategies/*.py", "src/indicators/*.py", "src/tests/backtestRunner.py")
+
+METRIC_COLUMNS = (
+    "profit_percentage",
+    "trades",
+    "max_drawdown_pct",
+    "total_fees",
+    "sharpe_approx",
+    "final_balance",
+)
+SUMMARY_COLUMNS = (
+    "run_key",
+    "strategy",
+    "params_json",
+    "symbol",
+    "interval",
+    "data_start",
+    "data_end",
+    "candles",
+    "data_digest",
+    "code_version",
+    "settings_json",
+    *METRIC_COLUMNS,
+    "created_at",
+)
+RANKINGS = {
+    "profit": "profit_percentage DESC",
+    "drawdown": "max_drawdown_pct ASC",
+    "sharpe": "sharpe_approx DESC",
+}
+
+
+def code_version(root: Path = PROJECT_ROOT) -> str:
+    """Digest of the strategy/indicator/runner sources, uncommitted edits included."""
+    digest = hashlib.sha256()
+    for pattern in CODE_VERSION_GLOBS:
+        for path in sorted(root.glob(pattern)):
+            digest.update(str(path.relative_to(root)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def data_range(candles: CandleFrame) -> dict:
+    """First/last open_time, size and a digest of the prices, so edited history misses the cache."""
+    digest = hashlib.sha256()
+    for name in PRICE_COLUMNS:
+        digest.update(np.ascontiguousarray(candles.column(name), dtype="<f8").tobytes())
+    if candles.open_time is not None:
+        digest.update(np.ascontiguousarray(candles.open_time, dtype="<i8").tobytes())
+    has_time = candles.open_time is not None and len(candles)
+    return {
+        "start": int(candles.open_time[0]) if has_time else None,
+        "end": int(candles.open_time[-1]) if has_time else None,
+        "candles": len(candles),
+        "digest": digest.hexdigest()[:16],
+    }
+
+
+def run_key(strategy: str, params: dict, data: dict, version: str, settings: Optional[dict] = None) -> str:
+    payload = {
+        "strategy": strategy,
+        "params": params,
+        "data": data,
+        "code_version": version,
+        "settings": settings or {},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def pack_equity(equity_curve) -> bytes:
+    return np.asarray(equity_curve, dtype="<f4").tobytes()
+
+
+def unpack_equity(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<f4")
+
+
+@dataclass
+class StoredRun:
+    run_key: str
+    strategy: str
+    params: dict
+    symbol: str
+    interval: str
+    data: dict
+    code_version: str
+    settings: dict
+    metrics: dict
+    created_at: str
+    equity_blob: Optional[bytes] = None
+
+    @property
+    def equity_curve(self) -> np.ndarray:
+        return unpack_equity(self.equity_blob or b"")
+
+    def as_result(self) -> dict:
+        """The stored run in ``backtestRunner``'s result shape."""
+        return {**self.metrics, "equity_curve": self.equity_curve.tolist()}
+
+
+class BacktestResultStore:
+    def __init__(self, db_path: Path = DEFAULT_RESULTS_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS backtest_runs (
+                    run_key TEXT PRIMARY KEY,
+                    strategy TEXT NOT NULL,
+                    params_json TEXT NOT NULL,
+                    symbol TEXT NOT NULL DEFAULT '',
+                    interval TEXT NOT NULL DEFAULT '',
+                    data_start INTEGER,
+                    data_end INTEGER,
+                    candles INTEGER NOT NULL,
+                    data_digest TEXT NOT NULL,
+                    code_version TEXT NOT NULL,
+                    settings_json TEXT NOT NULL DEFAULT '{}',
+                    profit_percentage REAL NOT NULL,
+                    trades INTEGER NOT NULL,
+                    max_drawdown_pct REAL NOT NULL,
+                    total_fees REAL NOT NULL,
+                    sharpe_approx REAL NOT NULL,
+                    final_balance REAL NOT NULL,
+                    equity BLOB NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_backtest_runs_profit
+                    ON backtest_runs (profit_percentage DESC);
+                CREATE INDEX IF NOT EXISTS idx_backtest_runs_drawdown
+                    ON backtest_runs (max_drawdown_pct);
+                CREATE INDEX IF NOT EXISTS idx_backtest_runs_sharpe
+                    ON backtest_runs (sharpe_approx DESC);
+                CREATE INDEX IF NOT EXISTS idx_backtest_runs_strategy
+                    ON backtest_runs (strategy, symbol, interval);
+                """
+            )
+
+    def save(
+        self,
+        key: str,
+        *,
+        strategy: str,
+        params: dict,
+        data: dict,
+        version: str,
+        result: dict,
+        symbol: str = "",
+        interval: str = "",
+        settings: Optional[dict] = None,
+    ) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO backtest_runs (
+                    run_key, strategy, params_json, symbol, interval,
+                    data_start, data_end, candles, data_digest, code_version, settings_json,
+                    profit_percentage, trades, max_drawdown_pct, total_fees,
+                    sharpe_approx, final_balance, equity, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    strategy,
+                    json.dumps(params, sort_keys=True, default=str),
+                    symbol,
+                    interval,
+                    data["start"],
+                    data["end"],
+                    data["candles"],
+                    data["digest"],
+                    version,
+                    json.dumps(settings or {}, sort_keys=True, default=str),
+                    *(float(result[name]) for name in METRIC_COLUMNS),
+                    pack_equity(result.get("equity_curve", [])),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+
+    @staticmethod
+    def _from_row(row, with_equity: bool) -> StoredRun:
+        metrics = {name: row[name] for name in METRIC_COLUMNS}
+        metrics["trades"] = int(metrics["trades"])
+        return StoredRun(
+            run_key=row["run_key"],
+            strategy=row["strategy"],
+            params=json.loads(row["params_json"]),
+            symbol=row["symbol"],
+            interval=row["interval"],
+            data={
+                "start": row["data_start"],
+                "end": row["data_end"],
+                "candles": row["candles"],
+                "digest": row["data_digest"],
+            },
+            code_version=row["code_version"],
+            settings=json.loads(row["settings_json"]),
+            metrics=metrics,
+            created_at=row["created_at"],
+            equity_blob=row["equity"] if with_equity else None,
+        )
+
+    def get(self, key: str) -> Optional[StoredRun]:
+        """Run by full key or unique key prefix."""
+        if not key or any(c not in "0123456789abcdef" for c in key):
+            return None
+        with self._connect() as conn:
+            # GLOB on a hex prefix is served by the primary-key index.
+            rows = conn.execute(
+                "SELECT * FROM backtest_runs WHERE run_key GLOB ? LIMIT 2", (key + "*",)
+            ).fetchall()
+        if len(rows) != 1:
+            if len(rows) > 1:
+                raise ValueError(f"run key prefix '{key}' is ambiguous")
+            return None
+        return self._from_row(rows[0], with_equity=True)
+
+    def top(
+        self,
+        by: str = "profit",
+        *,
+        limit: int = 20,
+        strategy: Optional[str] = None,
+        symbol: Optional[str] = None,
+    ) -> list[StoredRun]:
+        """Best runs by an indexed metric; equity blobs are not loaded."""
+        if by not in RANKINGS:
+            raise ValueError(f"Unknown ranking '{by}'. Available: {', '.join(RANKINGS)}")
+        clauses, args = [], []
+        if strategy:
+            clauses.append("strategy = ?")
+            args.append(strategy)
+        if symbol:
+            clauses.append("symbol = ?")
+            args.append(symbol)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM backtest_runs {where} ORDER BY {RANKINGS[by]} LIMIT ?",
+                (*args, limit),
+            ).fetchall()
+        return [self._from_row(row, with_equity=False) for row in rows]
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM backtest_runs").fetchone()[0]
+
+
+def cached_backtest(
+    store: Optional[BacktestResultStore],
+    *,
+    strategy_name: str,
+    strategy_function,
+    candles: CandleFrame,
+    params: Optional[dict] = None,
+    symbol: str = "",
+    interval: str = "",
+    version: Optional[str] = None,
+    refresh: bool = False,
+    **settings,
+) -> tuple[dict, bool]:
+    """
+    ``backtestRunner`` result for these inputs, from ``store`` when an
+    identical run (same strategy, params, candles, runner settings and code
+    version) was saved before; ``refresh`` recomputes and overwrites it.
+    Returns ``(result, cache_hit)``.
+    """
+    from tests.backtestRunner import backtestRunner
+
+    params = dict(params or {})
+    settings.setdefault("verbose", False)
+    data = data_range(candles)
+    version = version or code_version()
+    key_settings = {k: v for k, v in settings.items() if k != "verbose"}
+    key = run_key(strategy_name, params, data, version, key_settings)
+    if store is not None and not refresh:
+        stored = store.get(key)
+        if stored is not None:
+            return stored.as_result(), True
+
+    result = backtestRunner(
+        stock_data=candles.to_frame(),
+        strategy_function=strategy_function,
+        **settings,
+        **params,
+    )
+    if store is not None:
+        store.save(
+            key,
+            strategy=strategy_name,
+            params=params,
+            data=data,
+            version=version,
+            result=result,
+            symbol=symbol,
+            interval=interval,
+            settings=key_settings,
+        )
+    return result, False
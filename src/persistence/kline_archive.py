@@ -0,0 +1,142 @@
+import csv
+import io
+import os
+import zipfile
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from services.candle_frame import PRICE_COLUMNS, CandleFrame
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_ARCHIVE_ROOT = PROJECT_ROOT / "data" / "klines"
+
+# Binance public-data kline CSV: open_time, open, high, low, close, volume, close_time, ...
+_DUMP_FIELDS = {"open_price": 1, "high_price": 2, "low_price": 3, "close_price": 4, "volume": 5}
+# Spot dumps switched open_time to microseconds in 2025; anything this large is not ms.
+_MICROSECONDS_THRESHOLD = 10**14
+
+
+class KlineArchive:
+    """
+    Candles of one (symbol, interval), append-only on disk:
+
+    - ``prices.f64``: float64 rows in ``PRICE_COLUMNS`` order
+    - ``open_time.i64``: int64 open_time in ms
+
+    ``read`` memory-maps both files, so opening years of candles costs only
+    the page faults of the rows actually touched.
+    """
+
+    def __init__(self, symbol: str, interval: str, root=DEFAULT_ARCHIVE_ROOT):
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.path = Path(root) / self.symbol / interval
+        self._prices_path = self.path / "prices.f64"
+        self._open_time_path = self.path / "open_time.i64"
+
+    def __len__(self) -> int:
+        if not self._open_time_path.exists() or not self._prices_path.exists():
+            return 0
+        rows_by_time = self._open_time_path.stat().st_size // 8
+        rows_by_price = self._prices_path.stat().st_size // (8 * len(PRICE_COLUMNS))
+        # A write interrupted between the two files leaves one of them longer.
+        return min(rows_by_time, rows_by_price)
+
+    def last_open_time(self) -> Optional[int]:
+        rows = len(self)
+        if rows == 0:
+            return None
+        with open(self._open_time_path, "rb") as f:
+            f.seek((rows - 1) * 8)
+            return int(np.frombuffer(f.read(8), dtype=np.int64)[0])
+
+    def append(self, candles: CandleFrame) -> int:
+        """Append candles newer than the last stored one; returns rows written."""
+        if len(candles) == 0:
+            return 0
+        if candles.open_time is None:
+            raise ValueError("archived candles need open_time")
+        open_time = np.asarray(candles.open_time, dtype=np.int64)
+        if np.any(np.diff(open_time) <= 0):
+            raise ValueError("candles must be sorted by open_time without duplicates")
+
+        last = self.last_open_time()
+        start = 0 if last is None else int(np.searchsorted(open_time, last, side="right"))
+        if start >= len(open_time):
+            return 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        rows = len(self)
+        self._truncate(rows)
+        prices = np.stack([candles.column(col)[start:] for col in PRICE_COLUMNS], axis=1)
+        with open(self._prices_path, "ab") as f:
+            f.write(np.ascontiguousarray(prices, dtype="<f8").tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        # open_time last: it is what readers use to find the end of the data.
+        with open(self._open_time_path, "ab") as f:
+            f.write(np.ascontiguousarray(open_time[start:], dtype="<i8").tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        return len(open_time) - start
+
+    def _truncate(self, rows: int) -> None:
+        for path, row_size in (
+            (self._prices_path, 8 * len(PRICE_COLUMNS)),
+            (self._open_time_path, 8),
+        ):
+            if path.exists() and path.stat().st_size != rows * row_size:
+                os.truncate(path, rows * row_size)
+
+    def read(self, start: Optional[int] = None, end: Optional[int] = None) -> CandleFrame:
+        """Candles with ``start <= open_time < end`` (ms), as read-only memory maps."""
+        rows = len(self)
+        if rows == 0:
+            return CandleFrame.empty()
+        open_time = np.memmap(self._open_time_path, dtype="<i8", mode="r", shape=(rows,))
+        prices = np.memmap(
+            self._prices_path, dtype="<f8", mode="r", shape=(rows, len(PRICE_COLUMNS))
+        )
+        lo = 0 if start is None else int(np.searchsorted(open_time, start, side="left"))
+        hi = rows if end is None else int(np.searchsorted(open_time, end, side="left"))
+        return CandleFrame(prices[lo:hi].T, open_time[lo:hi])
+
+
+def read_binance_dump(path) -> CandleFrame:
+    """
+    Parse one Binance public-data kline file (``.zip`` or ``.csv``), with or
+    without the header row; microsecond open_times are converted to ms.
+    """
+    path = Path(path)
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            members = [name for name in archive.namelist() if name.endswith(".csv")]
+            if not members:
+                raise ValueError(f"{path} has no CSV member")
+            text = archive.read(members[0]).decode("utf-8")
+    else:
+        text = path.read_text(encoding="utf-8")
+
+    rows = [row for row in csv.reader(io.StringIO(text)) if row]
+    if rows and not rows[0][0].strip().isdigit():
+        rows = rows[1:]
+    if not rows:
+        return CandleFrame.empty()
+
+    values = np.array(
+        [[row[_DUMP_FIELDS[col]] for col in PRICE_COLUMNS] for row in rows], dtype=np.float64
+    ).T.copy()
+    open_time = np.fromiter((int(row[0]) for row in rows), dtype=np.int64, count=len(rows))
+    open_time = np.where(open_time >= _MICROSECONDS_THRESHOLD, open_time // 1000, open_time)
+    order = np.argsort(open_time, kind="stable")
+    return CandleFrame(values[:, order], open_time[order])
+
+
+def import_binance_dumps(archive: KlineArchive, paths: Iterable) -> int:
+    """Append dump files in chronological order; already archived rows are skipped."""
+    frames = [read_binance_dump(path) for path in paths]
+    frames = [frame for frame in frames if len(frame)]
+    frames.sort(key=lambda frame: int(frame.open_time[0]))
+    return sum(archive.append(frame) for frame in frames)
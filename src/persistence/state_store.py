@@ -1,13 +1,23 @@
 import json
+import logging
+import os
 import sqlite3
-from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
+import threading
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, replace
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 
+logger = logging.getLogger(__name__)
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "traderbot.db"
+MEMORY_DB = ":memory:"
+BUSY_TIMEOUT_MS = 5000
+CACHED_STATEMENTS = 256
 
 
 @dataclass
@@ -28,17 +38,234 @@ class BotState:
         self.updated_at = datetime.now(timezone.utc).isoformat()
 
 
+# Databases created before versioning report user_version 0 and replay every
+# step, so each one must be idempotent.
+def _add_bot_state_columns(conn):
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(bot_state)").fetchall()}
+    added = {
+        "active_mode": "TEXT NOT NULL DEFAULT 'trend'",
+        "grid_support": "REAL NOT NULL DEFAULT 0",
+        "grid_resistance": "REAL NOT NULL DEFAULT 0",
+        "breakout_cooldown_candles": "INTEGER NOT NULL DEFAULT 0",
+    }
+    for name, ddl in added.items():
+        if name not in columns:
+            conn.execute(f"ALTER TABLE bot_state ADD COLUMN {name} {ddl}")
+
+
+def _unique_order_ids(conn):
+    for table in ("orders_log", "trade_outcomes"):
+        conn.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE id NOT IN (
+                SELECT MIN(id) FROM {table}
+                WHERE order_id IS NOT NULL
+                GROUP BY order_id
+            )
+            AND order_id IS NOT NULL
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_order_id
+            ON {table}(order_id)
+            WHERE order_id IS NOT NULL
+            """
+        )
+
+
+def _query_indexes(conn):
+    # list_orders(status, since) and list_orders(status=None, since).
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orders_log_status_created "
+        "ON orders_log (status, created_at, id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orders_log_created ON orders_log (created_at, id)"
+    )
+    # derived_daily_risk: covering for the per-day trade count and loss sum.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orders_log_operation_status_created "
+        "ON orders_log (operation_code, status, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_trade_outcomes_operation_day "
+        "ON trade_outcomes (operation_code, filled, occurred_at, pnl_usd)"
+    )
+    # list_outcomes: newest first.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_trade_outcomes_occurred "
+        "ON trade_outcomes (occurred_at, id)"
+    )
+
+
+def _incremental_outcomes(conn):
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(trade_outcomes)").fetchall()}
+    if "partial_sell" not in columns:
+        conn.execute("ALTER TABLE trade_outcomes ADD COLUMN partial_sell INTEGER NOT NULL DEFAULT 0")
+    # FIFO queue of unmatched BUY lots per operation_code, in match order.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS open_lots (
+            operation_code TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            quantity REAL NOT NULL,
+            price REAL NOT NULL,
+            order_id INTEGER,
+            created_at TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (operation_code, position)
+        )
+        """
+    )
+
+
+# Position N holds the step that brings a database to user_version N + 1.
+MIGRATIONS = (_add_bot_state_columns, _unique_order_ids, _query_indexes, _incremental_outcomes)
+OUTCOME_COLUMNS = (
+    "kind, operation_code, stock_code, quantity, buy_price, sell_price, pnl_usd, pnl_pct, "
+    "quote_qty, order_id, source, filled, partial_sell, occurred_at, created_at"
+)
+META_OUTCOMES_HIGH_WATER = "outcomes_high_water"
+
+
+def _order_row(operation_code: str, order: dict, created_at: str | None) -> tuple:
+    fills = order.get("fills") or [{}]
+    quantity = float(order.get("executedQty", 0) or 0)
+    quote = float(order.get("cummulativeQuoteQty", 0) or 0)
+    price = float(fills[0].get("price", order.get("price", 0) or 0))
+    if quantity > 0 and quote > 0:
+        price = quote / quantity
+    return (
+        operation_code,
+        order.get("orderId"),
+        order.get("side"),
+        order.get("type"),
+        order.get("status"),
+        quantity,
+        price,
+        quote,
+        json.dumps(order),
+        created_at or datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def _outcome_row(outcome: dict, default_source: str = "live") -> tuple:
+    now = datetime.now(timezone.utc).isoformat()
+    return (
+        outcome.get("kind"),
+        outcome.get("operation_code"),
+        outcome.get("stock_code") or "",
+        outcome.get("quantity"),
+        outcome.get("buy_price"),
+        outcome.get("sell_price"),
+        outcome.get("pnl_usd"),
+        outcome.get("pnl_pct"),
+        outcome.get("quote_qty"),
+        outcome.get("order_id"),
+        outcome.get("source") or default_source,
+        1 if outcome.get("filled", True) else 0,
+        1 if outcome.get("partial_sell") else 0,
+        outcome.get("occurred_at") or now,
+        now,
+    )
+
+
+class _ThreadConnection:
+    """One thread's pooled connection; closed once the thread's locals are dropped."""
+
+    __slots__ = ("conn", "pid", "generation", "close", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection, generation: int):
+        self.conn = conn
+        self.pid = os.getpid()
+        self.generation = generation
+        self.close = weakref.finalize(self, conn.close)
+
+
 class StateStore:
-    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+    """
+    SQLite-backed bot state. Each thread reuses one pooled connection in WAL
+    mode, so dashboard readers never block the bot's writes; writers that
+    collide wait up to ``BUSY_TIMEOUT_MS`` instead of failing. A thread's
+    connection is closed when the thread exits.
+
+    ``save_state`` is write-behind inside ``batch()`` (and always, when
+    ``flush_interval`` is set): dirty states are coalesced per
+    ``operation_code`` and written together in one transaction when the
+    outermost batch exits or the flush timer fires. Order and outcome
+    records are never deferred: each is committed with ``synchronous=FULL``
+    together with any pending states.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, flush_interval: Optional[float] = None):
         self.db_path = db_path
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._shared_conn = None
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pool: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+        self._generation = 0
+        # Held while pending states are written, so readers never see them vanish mid-flush.
+        self._pending_lock = threading.RLock()
+        self._pending: dict[str, BotState] = {}
+        self._dirty = threading.Event()
+        self._closing = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if str(db_path) == MEMORY_DB:
+            # Each connect(":memory:") opens a new, empty database: keep a single one.
+            self._shared_conn = sqlite3.connect(MEMORY_DB, check_same_thread=False)
+            self._shared_conn.row_factory = sqlite3.Row
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
 
     def _connect(self):
-        conn = sqlite3.connect(self.db_path)
+        if self._shared_conn is not None:
+            return self._shared_conn
+        pooled = getattr(self._local, "pooled", None)
+        if pooled is not None and pooled.pid != os.getpid():
+            # A forked child must not close the parent's connection.
+            pooled.close.detach()
+            pooled = None
+        # A close() since the last call needs a fresh connection.
+        if pooled is None or pooled.generation != self._generation:
+            pooled = _ThreadConnection(self._open_connection(), self._generation)
+            with self._pool_lock:
+                self._pool.add(pooled)
+            self._local.pooled = pooled
+        return pooled.conn
+
+    def _open_connection(self) -> sqlite3.Connection:
+        # check_same_thread=False only so close() and the thread-exit finaliser can
+        # run from any thread; each connection is still used by the thread that opened it.
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            cached_statements=CACHED_STATEMENTS,
+            check_same_thread=False,
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
         return conn
 
+    def close(self) -> None:
+        """Flush pending states and close every pooled connection; the next call on any thread reconnects."""
+        if self._flusher is not None:
+            self._closing.set()
+            self._dirty.set()
+            self._flusher.join()
+            self._flusher = None
+            self._closing.clear()
+        self.flush()
+        with self._pool_lock:
+            pool, self._pool = list(self._pool), weakref.WeakSet()
+            self._generation += 1
+        for pooled in pool:
+            pooled.close()
+
     def _init_db(self):
         with self._connect() as conn:
             conn.executescript(
@@ -101,56 +328,17 @@ class StateStore:
             self._migrate(conn)
 
     def _migrate(self, conn):
-        columns = {
-            row["name"] for row in conn.execute("PRAGMA table_info(bot_state)").fetchall()
-        }
-        migrations = {
-            "active_mode": "TEXT NOT NULL DEFAULT 'trend'",
-            "grid_support": "REAL NOT NULL DEFAULT 0",
-            "grid_resistance": "REAL NOT NULL DEFAULT 0",
-            "breakout_cooldown_candles": "INTEGER NOT NULL DEFAULT 0",
-        }
-        for name, ddl in migrations.items():
-            if name not in columns:
-                conn.execute(f"ALTER TABLE bot_state ADD COLUMN {name} {ddl}")
-        conn.execute(
-            """
-            DELETE FROM orders_log
-            WHERE id NOT IN (
-                SELECT MIN(id) FROM orders_log
-                WHERE order_id IS NOT NULL
-                GROUP BY order_id
-            )
-            AND order_id IS NOT NULL
-            """
-        )
-        conn.execute(
-            """
-            CREATE UNIQUE INDEX IF NOT EXISTS idx_orders_log_order_id
-            ON orders_log(order_id)
-            WHERE order_id IS NOT NULL
-            """
-        )
-        conn.execute(
-            """
-            DELETE FROM trade_outcomes
-            WHERE id NOT IN (
-                SELECT MIN(id) FROM trade_outcomes
-                WHERE order_id IS NOT NULL
-                GROUP BY order_id
-            )
-            AND order_id IS NOT NULL
-            """
-        )
-        conn.execute(
-            """
-            CREATE UNIQUE INDEX IF NOT EXISTS idx_trade_outcomes_order_id
-            ON trade_outcomes(order_id)
-            WHERE order_id IS NOT NULL
-            """
-        )
+        """Apply the ``MIGRATIONS`` newer than the database's ``PRAGMA user_version``."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
 
     def load_state(self, operation_code: str) -> BotState:
+        with self._pending_lock:
+            pending = self._pending.get(operation_code)
+            if pending is not None:
+                return replace(pending)
         with self._connect() as conn:
             row = conn.execute(
                 "SELECT * FROM bot_state WHERE operation_code = ?",
@@ -182,27 +370,111 @@ class StateStore:
 
     def save_state(self, state: BotState):
         state.touch()
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO bot_state (
-                    operation_code, take_profit_index, last_trade_decision,
-                    last_buy_price, last_sell_price, actual_trade_position,
-                    active_mode, grid_support, grid_resistance,
-                    breakout_cooldown_candles, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(operation_code) DO UPDATE SET
-                    take_profit_index = excluded.take_profit_index,
-                    last_trade_decision = excluded.last_trade_decision,
-                    last_buy_price = excluded.last_buy_price,
-                    last_sell_price = excluded.last_sell_price,
-                    actual_trade_position = excluded.actual_trade_position,
-                    active_mode = excluded.active_mode,
-                    grid_support = excluded.grid_support,
-                    grid_resistance = excluded.grid_resistance,
-                    breakout_cooldown_candles = excluded.breakout_cooldown_candles,
-                    updated_at = excluded.updated_at
-                """,
+        with self._pending_lock:
+            self._pending[state.operation_code] = replace(state)
+        if getattr(self._local, "batch_depth", 0):
+            return
+        if self.flush_interval:
+            self._schedule_flush()
+            return
+        self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Coalesce this thread's ``save_state`` calls until the outermost batch exits."""
+        depth = getattr(self._local, "batch_depth", 0)
+        self._local.batch_depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._local.batch_depth = depth
+            if depth == 0:
+                self.flush()
+
+    def flush(self) -> int:
+        """Write every pending state in one transaction; returns how many were written."""
+        with self._pending_lock:
+            if not self._pending:
+                return 0
+            with self._connect() as conn:
+                written = self._write_pending(conn)
+            self._pending = {}
+            return written
+
+    def _schedule_flush(self):
+        with self._pending_lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="state-store-flush", daemon=True
+                )
+                self._flusher.start()
+        self._dirty.set()
+
+    def _flush_loop(self):
+        while True:
+            self._dirty.wait()
+            # Let further saves within the interval coalesce into this write.
+            if self._closing.wait(self.flush_interval):
+                return
+            self._dirty.clear()
+            try:
+                self.flush()
+            except Exception:
+                # The states stay pending; try again after the next interval.
+                logger.exception("Background state flush failed")
+                self._dirty.set()
+
+    @contextmanager
+    def _durable(self):
+        """Transaction committed with ``synchronous=FULL``: it survives a power loss, not just a crash."""
+        conn = self._connect()
+        if conn is self._shared_conn:
+            with conn:
+                yield conn
+            return
+        conn.execute("PRAGMA synchronous=FULL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+    @contextmanager
+    def _durable_with_pending(self):
+        """``_durable`` transaction that also writes the pending states, dropping them once it commits."""
+        with self._pending_lock:
+            with self._durable() as conn:
+                self._write_pending(conn)
+                yield conn
+            self._pending = {}
+
+    def _write_pending(self, conn) -> int:
+        # Callers hold _pending_lock and clear _pending only after the commit, so
+        # a rolled-back transaction leaves every state queued for the next flush.
+        states = list(self._pending.values())
+        if not states:
+            return 0
+        conn.executemany(
+            """
+            INSERT INTO bot_state (
+                operation_code, take_profit_index, last_trade_decision,
+                last_buy_price, last_sell_price, actual_trade_position,
+                active_mode, grid_support, grid_resistance,
+                breakout_cooldown_candles, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(operation_code) DO UPDATE SET
+                take_profit_index = excluded.take_profit_index,
+                last_trade_decision = excluded.last_trade_decision,
+                last_buy_price = excluded.last_buy_price,
+                last_sell_price = excluded.last_sell_price,
+                actual_trade_position = excluded.actual_trade_position,
+                active_mode = excluded.active_mode,
+                grid_support = excluded.grid_support,
+                grid_resistance = excluded.grid_resistance,
+                breakout_cooldown_candles = excluded.breakout_cooldown_candles,
+                updated_at = excluded.updated_at
+            """,
+            [
                 (
                     state.operation_code,
                     state.take_profit_index,
@@ -215,56 +487,58 @@ class StateStore:
                     state.grid_resistance,
                     state.breakout_cooldown_candles,
                     state.updated_at,
-                ),
-            )
+                )
+                for state in states
+            ],
+        )
+        return len(states)
 
     def log_order(self, operation_code: str, order: dict, created_at: str | None = None):
-        fills = order.get("fills") or [{}]
-        quantity = float(order.get("executedQty", 0) or 0)
-        quote = float(order.get("cummulativeQuoteQty", 0) or 0)
-        price = float(fills[0].get("price", order.get("price", 0) or 0))
-        if quantity > 0 and quote > 0:
-            price = quote / quantity
-        occurred = created_at or datetime.now(timezone.utc).isoformat()
-        with self._connect() as conn:
-            cursor = conn.execute(
+        return self.log_orders(operation_code, [(order, created_at)]) > 0
+
+    def log_orders(self, operation_code: str, orders: Iterable[tuple[dict, str | None]]) -> int:
+        """Insert ``(order, created_at)`` pairs in one durable transaction; returns how many were new."""
+        rows = [_order_row(operation_code, order, created_at) for order, created_at in orders]
+        if not rows:
+            return 0
+        with self._durable_with_pending() as conn:
+            cursor = conn.executemany(
                 """
                 INSERT OR IGNORE INTO orders_log (
                     operation_code, order_id, side, order_type, status,
                     quantity, price, total_quote, raw_json, created_at
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    operation_code,
-                    order.get("orderId"),
-                    order.get("side"),
-                    order.get("type"),
-                    order.get("status"),
-                    quantity,
-                    price,
-                    quote,
-                    json.dumps(order),
-                    occurred,
-                ),
+                rows,
             )
-            return cursor.rowcount > 0
+            return cursor.rowcount
 
     def list_orders(
         self,
         status: str = "FILLED",
         since: str | None = None,
+        after_id: int | None = None,
     ) -> list[dict]:
-        query = """
+        """Orders oldest first; ``after_id`` keeps only rows logged after that ``orders_log.id``."""
+        # Only the filters in use, so the planner can pick the matching index.
+        clauses, params = [], []
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(int(after_id))
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"""
             SELECT id, operation_code, order_id, side, order_type, status,
                    quantity, price, total_quote, created_at
             FROM orders_log
-            WHERE (? IS NULL OR status = ?)
+            {where}
+            ORDER BY created_at ASC, id ASC
         """
-        params: list = [status, status]
-        if since:
-            query += " AND created_at >= ?"
-            params.append(since)
-        query += " ORDER BY created_at ASC, id ASC"
         with self._connect() as conn:
             rows = conn.execute(query, params).fetchall()
         return [dict(row) for row in rows]
@@ -333,15 +607,17 @@ class StateStore:
 
     def derived_daily_risk(self, day_key: str, operation_code: str) -> dict:
         """Counts from orders_log / trade_outcomes for the UTC day (YYYY-MM-DD)."""
+        # A range on the ISO timestamps instead of substr() keeps the indexes usable.
+        next_day = (date.fromisoformat(day_key) + timedelta(days=1)).isoformat()
         with self._connect() as conn:
             trades_row = conn.execute(
                 """
                 SELECT COUNT(*) AS n FROM orders_log
                 WHERE operation_code = ?
                   AND status = 'FILLED'
-                  AND substr(created_at, 1, 10) = ?
+                  AND created_at >= ? AND created_at < ?
                 """,
-                (operation_code, day_key),
+                (operation_code, day_key, next_day),
             ).fetchone()
             loss_row = conn.execute(
                 """
@@ -352,9 +628,9 @@ class StateStore:
                 FROM trade_outcomes
                 WHERE operation_code = ?
                   AND filled = 1
-                  AND substr(occurred_at, 1, 10) = ?
+                  AND occurred_at >= ? AND occurred_at < ?
                 """,
-                (operation_code, day_key),
+                (operation_code, day_key, next_day),
             ).fetchone()
         return {
             "trades": int(trades_row["n"] or 0),
@@ -362,32 +638,11 @@ class StateStore:
         }
 
     def record_outcome(self, outcome: dict) -> bool:
-        occurred_at = outcome.get("occurred_at") or datetime.now(timezone.utc).isoformat()
-        with self._connect() as conn:
+        with self._durable_with_pending() as conn:
             cursor = conn.execute(
-                """
-                INSERT OR IGNORE INTO trade_outcomes (
-                    kind, operation_code, stock_code, quantity, buy_price,
-                    sell_price, pnl_usd, pnl_pct, quote_qty, order_id,
-                    source, filled, occurred_at, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    outcome.get("kind"),
-                    outcome.get("operation_code"),
-                    outcome.get("stock_code") or "",
-                    outcome.get("quantity"),
-                    outcome.get("buy_price"),
-                    outcome.get("sell_price"),
-                    outcome.get("pnl_usd"),
-                    outcome.get("pnl_pct"),
-                    outcome.get("quote_qty"),
-                    outcome.get("order_id"),
-                    outcome.get("source") or "live",
-                    1 if outcome.get("filled", True) else 0,
-                    occurred_at,
-                    datetime.now(timezone.utc).isoformat(),
-                ),
+                f"INSERT OR IGNORE INTO trade_outcomes ({OUTCOME_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                _outcome_row(outcome),
             )
             return cursor.rowcount > 0
 
@@ -398,7 +653,7 @@ class StateStore:
                 """
                 SELECT kind, operation_code, stock_code, quantity, buy_price,
                        sell_price, pnl_usd, pnl_pct, quote_qty, order_id,
-                       source, filled, occurred_at
+                       source, filled, partial_sell, occurred_at
                 FROM trade_outcomes
                 ORDER BY occurred_at DESC, id DESC
                 LIMIT ?
@@ -407,6 +662,104 @@ class StateStore:
             ).fetchall()
         return [dict(row) for row in rows]
 
+    def outcomes_since(self, since: str) -> list[dict]:
+        """Every outcome at or after ``since``, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT kind, operation_code, stock_code, quantity, buy_price,
+                       sell_price, pnl_usd, pnl_pct, quote_qty, order_id,
+                       source, filled, partial_sell, occurred_at
+                FROM trade_outcomes
+                WHERE occurred_at >= ?
+                ORDER BY occurred_at ASC, id ASC
+                """,
+                (since,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def load_open_lots(self) -> dict[str, list[dict]]:
+        """Persisted FIFO lots per operation_code (``qty``/``price``/``order_id``/``created_at``)."""
+        lots: dict[str, list[dict]] = {}
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT operation_code, quantity, price, order_id, created_at
+                FROM open_lots
+                ORDER BY operation_code, position
+                """
+            ).fetchall()
+        for row in rows:
+            lots.setdefault(row["operation_code"], []).append(
+                {
+                    "qty": row["quantity"],
+                    "price": row["price"],
+                    "order_id": row["order_id"],
+                    "created_at": row["created_at"],
+                }
+            )
+        return lots
+
+    def save_outcome_progress(
+        self,
+        outcomes: list[dict],
+        lots: dict[str, Iterable[dict]],
+        high_water: dict,
+        replace_all: bool = False,
+    ) -> int:
+        """
+        Commit one matching step atomically: upsert ``outcomes`` by order_id,
+        replace the open lots of every operation_code in ``lots`` and move the
+        ``orders_log`` high-water mark. ``replace_all`` drops every stored
+        outcome and lot first (full rebuild).
+        """
+        with self._durable_with_pending() as conn:
+            if replace_all:
+                conn.execute("DELETE FROM trade_outcomes")
+                conn.execute("DELETE FROM open_lots")
+            else:
+                conn.executemany(
+                    "DELETE FROM open_lots WHERE operation_code = ?",
+                    [(operation_code,) for operation_code in lots],
+                )
+            conn.executemany(
+                """
+                INSERT INTO open_lots (operation_code, position, quantity, price, order_id, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        operation_code,
+                        position,
+                        float(lot["qty"]),
+                        float(lot["price"] or 0),
+                        lot.get("order_id"),
+                        lot.get("created_at") or "",
+                    )
+                    for operation_code, queue in lots.items()
+                    for position, lot in enumerate(queue)
+                ],
+            )
+            # REPLACE also supersedes a live row the engine recorded for the same sell.
+            conn.executemany(
+                f"INSERT OR REPLACE INTO trade_outcomes ({OUTCOME_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_outcome_row(outcome, default_source="orders") for outcome in outcomes],
+            )
+            conn.execute(
+                """
+                INSERT INTO app_meta (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                """,
+                (META_OUTCOMES_HIGH_WATER, json.dumps(high_water)),
+            )
+        return len(outcomes)
+
+    def outcomes_high_water(self) -> Optional[dict]:
+        """``{"id", "created_at"}`` of the last ``orders_log`` row matched into outcomes."""
+        value = self.get_meta(META_OUTCOMES_HIGH_WATER)
+        return None if value is None else json.loads(value)
+
     def reconcile(
         self,
         local: BotState,
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from persistence.kline_archive import KlineArchive
+from services.candle_frame import CandleFrame
+from services.market_data import MarketDataService
+
+
+class ArchiveMarketData(MarketDataService):
+    """
+    MarketDataService served from a local ``KlineArchive`` instead of REST.
+
+    ``fetch_candles(limit)`` returns the last ``limit`` candles before
+    ``end_time`` (ms; None means the end of the archive). Symbol filters come
+    from ``filters`` since there is no exchange to ask.
+    """
+
+    def __init__(
+        self,
+        archive: KlineArchive,
+        *,
+        end_time: Optional[int] = None,
+        filters: Optional[dict] = None,
+    ):
+        super().__init__(None, archive.symbol, archive.interval)
+        self.archive = archive
+        self.end_time = end_time
+        self.filters = filters
+
+    def fetch_candles(self, limit: int = 1000) -> CandleFrame:
+        return self.archive.read(end=self.end_time).tail(limit)
+
+    def invalidate_klines(self) -> None:
+        pass
+
+    def get_symbol_filters(self) -> dict:
+        if self.filters is None:
+            raise ValueError(
+                f"No symbol filters configured for archived {self.operation_code}"
+            )
+        return dict(self.filters)
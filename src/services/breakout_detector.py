@@ -42,7 +42,9 @@ class BreakoutDetector:
         self,
         stock_data: pd.DataFrame,
         breakout_price: float,
+        indicators=None,
     ) -> BreakoutResult:
+        """``indicators`` is an optional ``IndicatorStream``/``IndicatorContext`` for ``stock_data``."""
         if not self.enabled or breakout_price <= 0:
             return BreakoutResult(confirmed=False)
 
@@ -50,7 +52,8 @@ class BreakoutDetector:
         if stock_data is None or len(stock_data) < min_points:
             return BreakoutResult(confirmed=False, signals={"insufficient_data": True})
 
-        df = stock_data.copy()
+        df = stock_data.tail(1) if indicators is not None else stock_data
+        df = df.copy()
         for col in ("close_price", "open_price", "high_price", "low_price", "volume"):
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors="coerce")
@@ -58,17 +61,24 @@ class BreakoutDetector:
             subset=["close_price", "open_price", "high_price", "low_price", "volume"],
             inplace=True,
         )
-        if len(df) < min_points:
+        if len(df) < (min_points if indicators is None else 1):
             return BreakoutResult(confirmed=False, signals={"insufficient_data": True})
 
-        adx_series = adx(df, period=self.adx_period)
-        adx_value = float(adx_series.iloc[-1]) if not pd.isna(adx_series.iloc[-1]) else 0.0
-        adx_rising = self._adx_rising(adx_series)
+        recent_count = self.adx_rising_bars + 1
+        if indicators is not None:
+            adx_recent = indicators.adx(self.adx_period).tail(recent_count)
+            avg_volume = indicators.sma(self.volume_sma_period, column="volume").value
+        else:
+            adx_recent = adx(df, period=self.adx_period).iloc[-recent_count:].tolist()
+            avg_volume = df["volume"].rolling(self.volume_sma_period).mean().iloc[-1]
+        adx_last = adx_recent[-1] if adx_recent else float("nan")
+        adx_value = float(adx_last) if not pd.isna(adx_last) else 0.0
+        adx_rising = self._adx_rising(adx_recent)
 
         close = float(df["close_price"].iloc[-1])
         open_price = float(df["open_price"].iloc[-1])
         volume = float(df["volume"].iloc[-1])
-        avg_volume = float(df["volume"].rolling(self.volume_sma_period).mean().iloc[-1])
+        avg_volume = float(avg_volume)
         volume_ratio = (volume / avg_volume) if avg_volume > 0 else 0.0
 
         price_break = close > breakout_price
@@ -98,14 +108,14 @@ class BreakoutDetector:
             return False
         return adx_value < self.reentry_adx_max
 
-    def _adx_rising(self, adx_series: pd.Series) -> bool:
-        if len(adx_series) < self.adx_rising_bars + 1:
+    def _adx_rising(self, adx_recent: list) -> bool:
+        if len(adx_recent) < self.adx_rising_bars + 1:
             return False
-        recent = adx_series.iloc[-(self.adx_rising_bars + 1) :]
-        if recent.isna().any():
+        recent = adx_recent[-(self.adx_rising_bars + 1) :]
+        if any(pd.isna(value) for value in recent):
             return False
-        start = float(recent.iloc[0])
-        end = float(recent.iloc[-1])
+        start = float(recent[0])
+        end = float(recent[-1])
         if end < self.adx_min:
             return False
         if end > start:
@@ -0,0 +1,151 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Same column order normalize_klines has always produced (open_time is second).
+PRICE_COLUMNS = ("close_price", "open_price", "high_price", "low_price", "volume")
+FRAME_COLUMNS = ("close_price", "open_time", "open_price", "high_price", "low_price", "volume")
+_KLINE_FIELDS = {"open_price": 1, "high_price": 2, "low_price": 3, "close_price": 4, "volume": 5}
+TIMEZONE = "America/Sao_Paulo"
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class CandleFrame:
+    """
+    Janela de candles em colunas: OHLCV em um bloco float64 contíguo e
+    ``open_time`` em int64 (ms). Os acessores devolvem views somente leitura;
+    fatiar não copia. ``to_frame`` adapta para as estratégias em DataFrame.
+    """
+
+    __slots__ = ("_values", "_open_time", "_frame")
+
+    def __init__(self, values: np.ndarray, open_time: Optional[np.ndarray] = None):
+        if values.ndim != 2 or values.shape[0] != len(PRICE_COLUMNS):
+            raise ValueError("values must have shape (5, n) in PRICE_COLUMNS order")
+        if open_time is not None and len(open_time) != values.shape[1]:
+            raise ValueError("open_time length does not match values")
+        self._values = _readonly(values)
+        self._open_time = None if open_time is None else _readonly(open_time)
+        self._frame: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def empty(cls) -> "CandleFrame":
+        return cls(np.empty((len(PRICE_COLUMNS), 0)), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_klines(cls, candles) -> "CandleFrame":
+        """Parse Binance kline rows (12-element lists of strings) in one pass."""
+        if not candles:
+            return cls.empty()
+        rows = [
+            [row[_KLINE_FIELDS[col]] for col in PRICE_COLUMNS] for row in candles
+        ]
+        values = np.array(rows, dtype=np.float64).T.copy()
+        open_time = np.fromiter(
+            (row[0] for row in candles), dtype=np.int64, count=len(candles)
+        )
+        return cls(values, open_time)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "CandleFrame":
+        values = np.empty((len(PRICE_COLUMNS), len(frame)), dtype=np.float64)
+        for row, col in enumerate(PRICE_COLUMNS):
+            values[row] = pd.to_numeric(frame[col], errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+        open_time = None
+        if "open_time" in frame.columns:
+            open_time = _to_epoch_ms(frame["open_time"])
+        return cls(values, open_time)
+
+    def __len__(self) -> int:
+        return self._values.shape[1]
+
+    def __getitem__(self, index) -> "CandleFrame":
+        if not isinstance(index, slice):
+            raise TypeError("CandleFrame only supports slicing")
+        open_time = None if self._open_time is None else self._open_time[index]
+        return CandleFrame(self._values[:, index], open_time)
+
+    def tail(self, n: int) -> "CandleFrame":
+        return self[max(len(self) - n, 0) :]
+
+    def column(self, name: str) -> np.ndarray:
+        if name == "open_time":
+            return self.open_time
+        return self._values[PRICE_COLUMNS.index(name)]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._values[0]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._values[1]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._values[2]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._values[3]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._values[4]
+
+    @property
+    def open_time(self) -> Optional[np.ndarray]:
+        return self._open_time
+
+    def append(self, fresh: "CandleFrame", limit: int | None = None) -> "CandleFrame":
+        """
+        Merge newer candles: rows of ``self`` at or after ``fresh``'s first
+        open_time are replaced (the forming candle), then trim to ``limit``.
+        """
+        if len(fresh) == 0:
+            return self
+        keep = len(self)
+        if self._open_time is not None and fresh.open_time is not None:
+            keep = int(np.searchsorted(self._open_time, fresh.open_time[0], side="left"))
+        total = keep + len(fresh)
+        start = 0 if limit is None else max(total - limit, 0)
+        kept = self[min(start, keep) : keep]
+        skip = max(start - keep, 0)
+        values = np.concatenate([kept._values, fresh._values[:, skip:]], axis=1)
+        open_time = None
+        if kept.open_time is not None and fresh.open_time is not None:
+            open_time = np.concatenate([kept.open_time, fresh.open_time[skip:]])
+        return CandleFrame(values, open_time)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Legacy DataFrame sharing this frame's (read-only) buffers; built once."""
+        if self._frame is None:
+            frame = pd.DataFrame(self._values.T, columns=list(PRICE_COLUMNS), copy=False)
+            if self._open_time is not None:
+                frame.insert(1, "open_time", _epoch_ms_to_datetime(self._open_time))
+            self._frame = frame
+        return self._frame
+
+
+def _epoch_ms_to_datetime(open_time: np.ndarray) -> pd.Series:
+    return (
+        pd.Series(pd.to_datetime(open_time, unit="ms"))
+        .dt.tz_localize("UTC")
+        .dt.tz_convert(TIMEZONE)
+    )
+
+
+def _to_epoch_ms(open_time: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(open_time):
+        if getattr(open_time.dt, "tz", None) is not None:
+            open_time = open_time.dt.tz_convert("UTC").dt.tz_localize(None)
+        return open_time.to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    return pd.to_numeric(open_time).to_numpy(dtype=np.int64)
@@ -57,6 +57,11 @@ class GridSpotManager:
                 sell_levels.append(GridLevel(price=sell_price, side="SELL"))
         return buy_levels, sell_levels
 
+    @staticmethod
+    def _tick_price(price: float, order_executor) -> float:
+        # Open orders report the tick-rounded price the executor placed.
+        return MarketDataService.adjust_to_step(price, order_executor.tick_size)
+
     def sync_grid(
         self,
         *,
@@ -85,7 +90,7 @@ class GridSpotManager:
         if buy_levels:
             quote_per_level = (quote_balance * (self.capital_pct / 100)) / len(buy_levels)
             for level in buy_levels:
-                key = ("BUY", level.price)
+                key = ("BUY", self._tick_price(level.price, order_executor))
                 if key in open_by_side_price:
                     continue
                 quantity = quote_per_level / level.price if level.price > 0 else 0.0
@@ -118,7 +123,7 @@ class GridSpotManager:
         if sell_levels and base_balance > step_size:
             qty_per_level = base_balance / len(sell_levels)
             for level in sell_levels:
-                key = ("SELL", level.price)
+                key = ("SELL", self._tick_price(level.price, order_executor))
                 if key in open_by_side_price:
                     continue
                 quantity = MarketDataService.size_quantity_for_filters(
@@ -4,56 +4,65 @@ from typing import Optional
 
 import pandas as pd
 
+from services.candle_frame import CandleFrame
+
 
 class MarketDataService:
     def __init__(self, client, operation_code: str, candle_period: str):
         self.client = client
         self.operation_code = operation_code
         self.candle_period = candle_period
+        self._candles: Optional[CandleFrame] = None
+        self._candles_limit = 0
 
     def fetch_klines(self, limit: int = 1000) -> pd.DataFrame:
-        candles = self.client.get_klines(
-            symbol=self.operation_code,
-            interval=self.candle_period,
-            limit=limit,
-        )
-        return self.normalize_klines(candles)
+        """Rolling candle window as a DataFrame backed by the cached ``CandleFrame``."""
+        return self.fetch_candles(limit).to_frame()
+
+    def fetch_candles(self, limit: int = 1000) -> CandleFrame:
+        """Rolling candle window: one warm-up fetch, then only candles since the last open_time."""
+        request = self.kline_request(limit)
+        return self.apply_klines(request, self.client.get_klines(**request))
+
+    def kline_request(self, limit: int = 1000) -> dict:
+        """``get_klines`` parameters of the next fetch, so an async client can issue it."""
+        request = {"symbol": self.operation_code, "interval": self.candle_period, "limit": limit}
+        if self._candles is not None and limit == self._candles_limit:
+            request["startTime"] = int(self._candles.open_time[-1])
+        return request
+
+    def apply_klines(self, request: dict, candles: list) -> CandleFrame:
+        """Fold the response to ``kline_request(...)`` into the cached window."""
+        limit = request["limit"]
+        if "startTime" not in request:
+            prices = CandleFrame.from_klines(candles)
+            if candles:
+                self._candles = prices
+                self._candles_limit = limit
+            return prices
+        if self._candles is None or limit != self._candles_limit:
+            return self._warm_up_klines(limit)
+        if not candles:
+            return self._candles
+        if len(candles) >= limit:
+            # The gap is at least a whole window (long pause); a fresh window is cheaper.
+            return self._warm_up_klines(limit)
+
+        self._candles = self._candles.append(CandleFrame.from_klines(candles), limit)
+        return self._candles
+
+    def _warm_up_klines(self, limit: int) -> CandleFrame:
+        request = {"symbol": self.operation_code, "interval": self.candle_period, "limit": limit}
+        return self.apply_klines(request, self.client.get_klines(**request))
+
+    def invalidate_klines(self) -> None:
+        """Drop the cached window so the next fetch starts with a full warm-up."""
+        self._candles = None
+        self._candles_limit = 0
 
     @staticmethod
     def normalize_klines(candles) -> pd.DataFrame:
-        prices = pd.DataFrame(candles)
-        prices.columns = [
-            "open_time",
-            "open_price",
-            "high_price",
-            "low_price",
-            "close_price",
-            "volume",
-            "close_time",
-            "quote_asset_volume",
-            "number_of_trades",
-            "taker_buy_base_asset_volume",
-            "taker_buy_quote_asset_volume",
-            "-",
-        ]
-        prices = prices[
-            [
-                "close_price",
-                "open_time",
-                "open_price",
-                "high_price",
-                "low_price",
-                "volume",
-            ]
-        ]
-        for col in ("close_price", "open_price", "high_price", "low_price", "volume"):
-            prices[col] = pd.to_numeric(prices[col], errors="coerce")
-        prices["open_time"] = (
-            pd.to_datetime(prices["open_time"], unit="ms")
-            .dt.tz_localize("UTC")
-            .dt.tz_convert("America/Sao_Paulo")
-        )
-        return prices
+        return CandleFrame.from_klines(candles).to_frame()
 
     def get_symbol_filters(self) -> dict:
         symbol_info = self.client.get_symbol_info(self.operation_code)
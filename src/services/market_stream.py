@@ -0,0 +1,206 @@
+import json
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from websockets.sync.client import connect as ws_connect
+
+from modules.logging_setup import log_event
+from services.candle_frame import CandleFrame
+from services.market_data import MarketDataService
+
+MAINNET_WS_URL = "wss://stream.binance.com:9443"
+TESTNET_WS_URL = "wss://stream.testnet.binance.vision"
+
+
+class StreamingMarketData(MarketDataService):
+    """
+    MarketDataService fed by the kline and bookTicker websocket streams.
+
+    While the socket is up, ``fetch_klines`` serves the window the stream keeps
+    current and makes no REST call. Before the first connection and after any
+    disconnect it falls back to the REST fetch, whose incremental ``startTime``
+    request backfills the candles missed during the gap. Price listeners run
+    on their own thread, which only ever delivers the latest price, so a slow
+    listener (one placing an order) never holds up the socket reader.
+    """
+
+    def __init__(
+        self,
+        client,
+        operation_code: str,
+        candle_period: str,
+        *,
+        ws_url: str = MAINNET_WS_URL,
+        reconnect_delay: float = 5.0,
+        stale_after: float = 0.0,
+        connect=None,
+    ):
+        super().__init__(client, operation_code, candle_period)
+        self.ws_url = ws_url.rstrip("/")
+        self.reconnect_delay = reconnect_delay
+        self.stale_after = stale_after
+        self.best_bid = 0.0
+        self.best_ask = 0.0
+        self._connect = connect or ws_connect
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+        self._connected = False
+        self._synced = False
+        self._last_message = 0.0
+        self._listeners: list[Callable[[float], None]] = []
+        self._latest_price: Optional[float] = None
+        self._price_ready = threading.Event()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    @property
+    def stream_url(self) -> str:
+        symbol = self.operation_code.lower()
+        streams = f"{symbol}@kline_{self.candle_period}/{symbol}@bookTicker"
+        return f"{self.ws_url}/stream?streams={streams}"
+
+    @property
+    def is_live(self) -> bool:
+        if not self._connected:
+            return False
+        if self.stale_after > 0:
+            return time.monotonic() - self._last_message < self.stale_after
+        return True
+
+    def add_listener(self, callback: Callable[[float], None]) -> None:
+        """
+        Call ``callback(price)`` with the latest kline close or best bid.
+
+        Prices that arrive while the listeners are still busy collapse into
+        the newest one.
+        """
+        self._listeners.append(callback)
+
+    def start(self) -> "StreamingMarketData":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"market-stream-{self.operation_code}",
+                daemon=True,
+            )
+            self._thread.start()
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_prices,
+                name=f"market-prices-{self.operation_code}",
+                daemon=True,
+            )
+            self._dispatcher.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._price_ready.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout)
+
+    def fetch_candles(self, limit: int = 1000) -> CandleFrame:
+        with self._lock:
+            if (
+                self._synced
+                and self.is_live
+                and self._candles is not None
+                and limit == self._candles_limit
+            ):
+                return self._candles
+            candles = super().fetch_candles(limit)
+            self._synced = self.is_live
+            return candles
+
+    def apply_klines(self, request: dict, candles: list) -> CandleFrame:
+        with self._lock:
+            window = super().apply_klines(request, candles)
+            self._synced = self.is_live
+            return window
+
+    def invalidate_klines(self) -> None:
+        with self._lock:
+            super().invalidate_klines()
+            self._synced = False
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with self._connect(self.stream_url) as ws:
+                    self._ws = ws
+                    self._connected = True
+                    self._last_message = time.monotonic()
+                    log_event(
+                        logging.INFO,
+                        "Market stream connected",
+                        event="market_stream_connected",
+                        operation_code=self.operation_code,
+                    )
+                    for raw in ws:
+                        self._handle_message(raw)
+            except Exception as exc:
+                if not self._stop.is_set():
+                    log_event(
+                        logging.WARNING,
+                        f"Market stream error: {exc}",
+                        event="market_stream_error",
+                        operation_code=self.operation_code,
+                    )
+            finally:
+                self._ws = None
+                with self._lock:
+                    self._connected = False
+                    self._synced = False
+            self._stop.wait(self.reconnect_delay)
+
+    def _handle_message(self, raw) -> None:
+        message = json.loads(raw)
+        data = message.get("data", message)
+        self._last_message = time.monotonic()
+        if data.get("e") == "kline":
+            price = self._apply_kline(data["k"])
+        elif "b" in data and "a" in data:
+            self.best_bid = float(data["b"])
+            self.best_ask = float(data["a"])
+            price = self.best_bid
+        else:
+            return
+        self._latest_price = price
+        self._price_ready.set()
+
+    def _dispatch_prices(self) -> None:
+        while True:
+            self._price_ready.wait()
+            if self._stop.is_set():
+                return
+            self._price_ready.clear()
+            price = self._latest_price
+            if price is None:
+                continue
+            for callback in list(self._listeners):
+                try:
+                    callback(price)
+                except Exception as exc:
+                    logging.error("Market stream listener failed: %s", exc)
+
+    def _apply_kline(self, kline: dict) -> float:
+        row = CandleFrame.from_klines(
+            [[kline["t"], kline["o"], kline["h"], kline["l"], kline["c"], kline["v"]]]
+        )
+        with self._lock:
+            # Until the REST backfill has run, the window may have a gap; skip.
+            if self._synced and self._candles is not None:
+                self._candles = self._candles.append(row, self._candles_limit)
+        return float(kline["c"])
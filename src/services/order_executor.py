@@ -63,11 +63,23 @@ class OrderExecutor:
         createLogOrder(order)
         return order
 
-    def buy_limited(self, stock_data, traded_quantity: float, price: float = 0) -> Optional[dict]:
+    @staticmethod
+    def _volume_and_rsi(stock_data, indicators=None) -> tuple[float, float]:
+        if indicators is not None:
+            return indicators.sma(20, column="volume").value, indicators.rsi(14).value
+        avg_volume = stock_data["volume"].rolling(window=20).mean().iloc[-1]
+        return avg_volume, Indicators.getRSI(series=stock_data["close_price"])
+
+    def buy_limited(
+        self,
+        stock_data,
+        traded_quantity: float,
+        price: float = 0,
+        indicators=None,
+    ) -> Optional[dict]:
         close_price = stock_data["close_price"].iloc[-1]
         volume = stock_data["volume"].iloc[-1]
-        avg_volume = stock_data["volume"].rolling(window=20).mean().iloc[-1]
-        rsi = Indicators.getRSI(series=stock_data["close_price"])
+        avg_volume, rsi = self._volume_and_rsi(stock_data, indicators)
 
         if price == 0:
             if rsi < 30:
@@ -104,11 +116,11 @@ class OrderExecutor:
         acceptable_loss_pct: float,
         min_sell_price_fn,
         price: float = 0,
+        indicators=None,
     ) -> Optional[dict]:
         close_price = stock_data["close_price"].iloc[-1]
         volume = stock_data["volume"].iloc[-1]
-        avg_volume = stock_data["volume"].rolling(window=20).mean().iloc[-1]
-        rsi = Indicators.getRSI(series=stock_data["close_price"])
+        avg_volume, rsi = self._volume_and_rsi(stock_data, indicators)
 
         if price == 0:
             if rsi > 70:
@@ -152,10 +164,11 @@ class OrderExecutor:
             createLogOrder(order)
         return order
 
-    def has_open_buy_order(self) -> tuple[bool, float, float]:
+    def has_open_buy_order(self, open_orders=None) -> tuple[bool, float, float]:
         self.partial_quantity_discount = 0.0
         last_buy_price = 0.0
-        open_orders = self.client.get_open_orders(symbol=self.operation_code)
+        if open_orders is None:
+            open_orders = self.client.get_open_orders(symbol=self.operation_code)
         buy_orders = [o for o in open_orders if o["side"] == "BUY"]
         if not buy_orders:
             return False, 0.0, 0.0
@@ -167,9 +180,10 @@ class OrderExecutor:
                 last_buy_price = price
         return True, self.partial_quantity_discount, last_buy_price
 
-    def has_open_sell_order(self) -> tuple[bool, float]:
+    def has_open_sell_order(self, open_orders=None) -> tuple[bool, float]:
         self.partial_quantity_discount = 0.0
-        open_orders = self.client.get_open_orders(symbol=self.operation_code)
+        if open_orders is None:
+            open_orders = self.client.get_open_orders(symbol=self.operation_code)
         sell_orders = [o for o in open_orders if o["side"] == "SELL"]
         if not sell_orders:
             return False, 0.0
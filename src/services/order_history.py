@@ -0,0 +1,111 @@
+import time
+from typing import Optional
+
+OPEN_STATUSES = ("NEW", "PARTIALLY_FILLED")
+
+
+class OrderHistory:
+    """
+    Incremental ``get_all_orders`` snapshot for one symbol, keyed by orderId.
+
+    The first refresh loads the last ``limit`` orders; later refreshes ask only
+    for orders from the oldest still-open id (whose status may have changed),
+    or after the newest id seen. Refreshes within ``max_age`` seconds reuse the
+    snapshot, so the buy and sell lookups of one cycle share a single request;
+    ``TradingEngine.update_all_data`` invalidates it first (or merges a page
+    the asyncio runtime prefetched), so orders placed since the previous
+    update are always seen.
+    """
+
+    def __init__(self, client, symbol: str, limit: int = 100, max_age: float = 5.0, clock=None):
+        self.client = client
+        self.symbol = symbol
+        self.limit = limit
+        self.max_age = max_age
+        self._clock = clock or time.monotonic
+        self._orders: dict[int, dict] = {}
+        self._refreshed_at: Optional[float] = None
+        self._last_fills: Optional[dict[str, float]] = None
+
+    def invalidate(self) -> None:
+        """Force the next lookup to hit the exchange (e.g. after placing or cancelling an order)."""
+        self._refreshed_at = None
+
+    def refresh(self) -> None:
+        now = self._clock()
+        if self._refreshed_at is not None and now - self._refreshed_at < self.max_age:
+            return
+        request = self.next_request()
+        while request is not None:
+            request = self.apply_page(request, self.client.get_all_orders(**request))
+        self._refreshed_at = now
+
+    def next_request(self) -> dict:
+        """``get_all_orders`` parameters of the next refresh, so an async client can issue it."""
+        if not self._orders:
+            return {"symbol": self.symbol, "limit": self.limit}
+        return {"symbol": self.symbol, "orderId": self._next_order_id(), "limit": self.limit}
+
+    def apply_page(self, request: dict, page: list[dict]) -> Optional[dict]:
+        """Merge one page; returns the request for the following page, if any."""
+        self._merge(page)
+        if "orderId" not in request or len(page) < self.limit:
+            return None
+        return {**request, "orderId": int(page[-1]["orderId"]) + 1}
+
+    def merge_prefetched(self, request: dict, page: list[dict]) -> None:
+        """
+        Take a page fetched elsewhere for ``next_request()`` as this cycle's refresh.
+
+        A full page leaves the snapshot stale, so the next lookup fetches the
+        rest synchronously.
+        """
+        if self.apply_page(request, page) is None:
+            self._refreshed_at = self._clock()
+        else:
+            self._refreshed_at = None
+
+    def _next_order_id(self) -> int:
+        open_ids = [
+            order_id
+            for order_id, order in self._orders.items()
+            if order.get("status") in OPEN_STATUSES
+        ]
+        if open_ids:
+            return min(open_ids)
+        return max(self._orders) + 1
+
+    def _merge(self, orders: list[dict]) -> None:
+        for order in orders:
+            self._orders[int(order["orderId"])] = order
+        if len(self._orders) > self.limit:
+            for order_id in sorted(self._orders)[: len(self._orders) - self.limit]:
+                del self._orders[order_id]
+        self._last_fills = None
+
+    def orders(self) -> list[dict]:
+        self.refresh()
+        return [self._orders[order_id] for order_id in sorted(self._orders)]
+
+    def last_fill_prices(self) -> dict[str, float]:
+        """Average price of the latest FILLED BUY and SELL, computed in one pass."""
+        self.refresh()
+        if self._last_fills is None:
+            latest: dict[str, dict] = {}
+            for order in self._orders.values():
+                side = order.get("side")
+                if order.get("status") != "FILLED" or side not in ("BUY", "SELL"):
+                    continue
+                current = latest.get(side)
+                if current is None or order["time"] > current["time"]:
+                    latest[side] = order
+            fills = {"BUY": 0.0, "SELL": 0.0}
+            for side, order in latest.items():
+                executed_qty = float(order["executedQty"])
+                if executed_qty:
+                    fills[side] = float(order["cummulativeQuoteQty"]) / executed_qty
+            self._last_fills = fills
+        return self._last_fills
+
+    def last_fill_price(self, side: str) -> float:
+        return self.last_fill_prices().get(side, 0.0)
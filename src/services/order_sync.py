@@ -1,9 +1,18 @@
+import json
+import threading
+import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Iterable, Optional
 
 
 DEFAULT_PROFIT_CUTOFF = "2026-08-01T00:00:00+00:00"
 _SYNC_PAGE_SIZE = 1000
+META_SYNC_CURSOR_PREFIX = "order_sync_cursor:"
+# GET /api/v3/allOrders costs 20 weight; the sync keeps to a slice of the 6000/min account limit.
+ALL_ORDERS_WEIGHT = 20
+SYNC_WEIGHT_BUDGET = 600
+FINAL_STATUSES = {"FILLED", "CANCELED", "REJECTED", "EXPIRED", "EXPIRED_IN_MATCH"}
 
 
 def exchange_order_timestamp(order: dict) -> str:
@@ -20,54 +29,128 @@ def cutoff_to_ms(cutoff_iso: str) -> int:
     return int(value.timestamp() * 1000)
 
 
+class RequestBudget:
+    """Shared request-weight allowance per rolling window (Binance counts weight per minute)."""
+
+    def __init__(self, weight: int = SYNC_WEIGHT_BUDGET, window_seconds: float = 60.0, clock=None, sleep=None):
+        self.weight = weight
+        self.window_seconds = window_seconds
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+        self._lock = threading.Lock()
+        self._spent: deque = deque()
+
+    def acquire(self, weight: int) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                while self._spent and now - self._spent[0][0] >= self.window_seconds:
+                    self._spent.popleft()
+                used = sum(cost for _, cost in self._spent)
+                if not self._spent or used + weight <= self.weight:
+                    self._spent.append((now, weight))
+                    return
+                wait = self.window_seconds - (now - self._spent[0][0])
+            self._sleep(wait)
+
+
+def _cursor_key(symbol: str) -> str:
+    return f"{META_SYNC_CURSOR_PREFIX}{symbol}"
+
+
+def load_sync_cursor(store, symbol: str, cutoff_iso: str) -> Optional[dict]:
+    """``{"order_id", "update_time", "cutoff"}`` of the last sync, unless it was for another cutoff."""
+    value = store.get_meta(_cursor_key(symbol))
+    cursor = json.loads(value) if value else None
+    if cursor is None or cursor.get("cutoff") != cutoff_iso:
+        return None
+    return cursor
+
+
+def _fetch_symbol(client, symbol: str, start_ms: int, cursor: Optional[dict], budget: RequestBudget):
+    """
+    All orders of ``symbol`` from the cursor on, and the next cursor. The
+    cursor never passes an order that may still fill, so a resting order is
+    fetched again until it reaches a final status.
+    """
+    fetched = []
+    from_order_id = cursor["order_id"] if cursor else None
+    while True:
+        kwargs = {
+            "symbol": symbol,
+            "limit": _SYNC_PAGE_SIZE,
+            "startTime": start_ms,
+        }
+        if from_order_id is not None:
+            kwargs["orderId"] = from_order_id
+        budget.acquire(ALL_ORDERS_WEIGHT)
+        orders = client.get_all_orders(**kwargs)
+        if not orders:
+            break
+        fetched.extend(orders)
+        if len(orders) < _SYNC_PAGE_SIZE:
+            break
+        last_id = int(orders[-1].get("orderId") or 0)
+        if last_id <= 0:
+            break
+        next_id = last_id + 1
+        if from_order_id is not None and next_id <= from_order_id:
+            break
+        from_order_id = next_id
+
+    next_cursor = dict(cursor) if cursor else None
+    ids = [int(order.get("orderId") or 0) for order in fetched]
+    if any(ids):
+        pending = [
+            order_id
+            for order_id, order in zip(ids, fetched)
+            if order_id and order.get("status") not in FINAL_STATUSES
+        ]
+        next_id = min(pending) if pending else max(ids) + 1
+        update_times = [int(order.get("updateTime") or order.get("time") or 0) for order in fetched]
+        next_cursor = {
+            "order_id": next_id,
+            "update_time": max(update_times + [int((cursor or {}).get("update_time") or 0)]),
+        }
+    return fetched, next_cursor
+
+
 def sync_filled_orders_from_binance(
     client,
     store,
     symbols: Iterable[str],
     cutoff_iso: str = DEFAULT_PROFIT_CUTOFF,
+    budget: Optional[RequestBudget] = None,
 ) -> dict:
-    """Upsert FILLED BUY/SELL orders from Binance into orders_log since cutoff."""
+    """
+    Upsert FILLED BUY/SELL orders from Binance into orders_log since cutoff.
+    Each symbol resumes from its cursor in ``app_meta``; requests are paced
+    by a request-weight ``budget`` and each symbol's orders are inserted in
+    one transaction.
+    """
     start_ms = cutoff_to_ms(cutoff_iso)
+    budget = budget or RequestBudget()
     inserted = 0
     seen = 0
-    for symbol in symbols:
-        from_order_id = None
-        while True:
-            kwargs = {
-                "symbol": symbol,
-                "limit": _SYNC_PAGE_SIZE,
-                "startTime": start_ms,
-            }
-            if from_order_id is not None:
-                kwargs["orderId"] = from_order_id
-            orders = client.get_all_orders(**kwargs)
-            if not orders:
-                break
-            for order in orders:
-                seen += 1
-                update_ms = int(order.get("updateTime") or order.get("time") or 0)
-                if update_ms and update_ms < start_ms:
-                    continue
-                if order.get("status") != "FILLED":
-                    continue
-                side = (order.get("side") or "").upper()
-                if side not in {"BUY", "SELL"}:
-                    continue
-                if store.log_order(
-                    symbol,
-                    order,
-                    created_at=exchange_order_timestamp(order),
-                ):
-                    inserted += 1
-            if len(orders) < _SYNC_PAGE_SIZE:
-                break
-            last_id = int(orders[-1].get("orderId") or 0)
-            if last_id <= 0:
-                break
-            next_id = last_id + 1
-            if from_order_id is not None and next_id <= from_order_id:
-                break
-            from_order_id = next_id
+    for symbol in dict.fromkeys(symbols):
+        cursor = load_sync_cursor(store, symbol, cutoff_iso)
+        orders, next_cursor = _fetch_symbol(client, symbol, start_ms, cursor, budget)
+        seen += len(orders)
+        rows = []
+        for order in orders:
+            update_ms = int(order.get("updateTime") or order.get("time") or 0)
+            if update_ms and update_ms < start_ms:
+                continue
+            if order.get("status") != "FILLED":
+                continue
+            side = (order.get("side") or "").upper()
+            if side not in {"BUY", "SELL"}:
+                continue
+            rows.append((order, exchange_order_timestamp(order)))
+        inserted += store.log_orders(symbol, rows)
+        # Saved after the insert: a crash in between only re-fetches this page.
+        if next_cursor is not None and next_cursor != cursor:
+            store.set_meta(_cursor_key(symbol), json.dumps({**next_cursor, "cutoff": cutoff_iso}))
     return {
         "inserted": inserted,
         "scanned": seen,
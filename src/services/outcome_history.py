@@ -148,16 +148,14 @@ def match_closed_trades(
     return closed
 
 
-def match_trades_and_open_lots(
+def _match_into(
     orders: Iterable[dict],
-    take_profit_at: Iterable[float] | None = None,
-    stop_loss_pct: float = 0.0,
-    kind_hints: Optional[dict[int, str]] = None,
-) -> tuple[list[dict], list[dict]]:
-    """FIFO match SELL→BUY and return (closed trades, remaining open lots)."""
-    take_profit_pct = first_take_profit_pct(take_profit_at)
-    kind_hints = kind_hints or {}
-    lots: dict[str, deque] = defaultdict(deque)
+    lots: dict[str, deque],
+    take_profit_pct: float,
+    stop_loss_pct: float,
+    kind_hints: dict[int, str],
+) -> list[dict]:
+    """FIFO match ``orders`` SELL→BUY against ``lots`` (updated in place); returns the closed trades."""
     closed: list[dict] = []
 
     for order in orders:
@@ -232,6 +230,10 @@ def match_trades_and_open_lots(
             }
         )
 
+    return closed
+
+
+def _open_lot_rows(lots: dict[str, Iterable[dict]]) -> list[dict]:
     open_lots: list[dict] = []
     for operation_code, queue in lots.items():
         for lot in queue:
@@ -253,7 +255,21 @@ def match_trades_and_open_lots(
                 }
             )
     open_lots.sort(key=lambda row: (row["stock_code"], row["occurred_at"] or ""))
-    return closed, open_lots
+    return open_lots
+
+
+def match_trades_and_open_lots(
+    orders: Iterable[dict],
+    take_profit_at: Iterable[float] | None = None,
+    stop_loss_pct: float = 0.0,
+    kind_hints: Optional[dict[int, str]] = None,
+) -> tuple[list[dict], list[dict]]:
+    """FIFO match SELL→BUY and return (closed trades, remaining open lots)."""
+    lots: dict[str, deque] = defaultdict(deque)
+    closed = _match_into(
+        orders, lots, first_take_profit_pct(take_profit_at), stop_loss_pct, kind_hints or {}
+    )
+    return closed, _open_lot_rows(lots)
 
 
 def open_lots_from_orders(orders: Iterable[dict]) -> list[dict]:
@@ -325,6 +341,15 @@ def kind_hints_from_log(
     return hints
 
 
+def _high_water(orders: list[dict], previous: Optional[dict] = None) -> dict:
+    if not orders:
+        return previous or {"id": 0, "created_at": ""}
+    return {
+        "id": max(int(order["id"]) for order in orders),
+        "created_at": max(order.get("created_at") or "" for order in orders),
+    }
+
+
 def rebuild_outcomes_from_orders(
     store: StateStore,
     take_profit_at: Iterable[float] | None = None,
@@ -333,27 +358,78 @@ def rebuild_outcomes_from_orders(
     cutoff_iso: str = DEFAULT_PROFIT_CUTOFF,
     force: bool = False,
 ) -> int:
+    """Replace every stored outcome and open lot by matching all orders since ``cutoff_iso``."""
     if not force and store.get_meta(META_REBUILT) == "1":
         return 0
     orders = store.list_orders(since=cutoff_iso)
     hints = kind_hints_from_log(log_path, orders=orders) if log_path else {}
-    closed = match_closed_trades(
-        orders,
-        take_profit_at=take_profit_at,
-        stop_loss_pct=stop_loss_pct,
-        kind_hints=hints,
+    lots: dict[str, deque] = defaultdict(deque)
+    closed = _match_into(
+        orders, lots, first_take_profit_pct(take_profit_at), stop_loss_pct, hints
+    )
+    inserted = store.save_outcome_progress(
+        closed, lots, _high_water(orders), replace_all=True
     )
-    store.clear_outcomes()
-    inserted = 0
-    for row in closed:
-        if store.record_outcome(row):
-            inserted += 1
     store.set_meta(META_REBUILT, "1")
     store.set_meta("outcomes_log_imported", "1")
     store.set_meta("profit_cutoff", cutoff_iso)
     return inserted
 
 
+def update_outcomes_from_orders(
+    store: StateStore,
+    take_profit_at: Iterable[float] | None = None,
+    stop_loss_pct: float = 0.0,
+    log_path: str | None = None,
+    cutoff_iso: str = DEFAULT_PROFIT_CUTOFF,
+    force: bool = False,
+) -> int:
+    """
+    Match only the orders logged since the last run against the stored open
+    lots and upsert their outcomes, so the cost follows new orders rather
+    than the whole history. Falls back to ``rebuild_outcomes_from_orders``
+    when forced, never rebuilt, the cutoff changed, or a new order is older
+    than the high-water mark (FIFO order would differ). Returns the number
+    of outcomes written.
+    """
+    high_water = store.outcomes_high_water()
+    if (
+        force
+        or high_water is None
+        or store.get_meta(META_REBUILT) != "1"
+        or store.get_meta("profit_cutoff") != cutoff_iso
+    ):
+        return rebuild_outcomes_from_orders(
+            store, take_profit_at, stop_loss_pct, log_path, cutoff_iso, force=True
+        )
+    orders = store.list_orders(since=cutoff_iso, after_id=high_water["id"])
+    if not orders:
+        return 0
+    if orders[0].get("created_at", "") < high_water["created_at"]:
+        return rebuild_outcomes_from_orders(
+            store, take_profit_at, stop_loss_pct, log_path, cutoff_iso, force=True
+        )
+
+    touched = {order.get("operation_code") or "" for order in orders}
+    lots: dict[str, deque] = defaultdict(deque)
+    for operation_code, queue in store.load_open_lots().items():
+        if operation_code in touched:
+            lots[operation_code] = deque(queue)
+    hints = kind_hints_from_log(log_path, orders=orders) if log_path else {}
+    closed = _match_into(
+        orders, lots, first_take_profit_pct(take_profit_at), stop_loss_pct, hints
+    )
+    return store.save_outcome_progress(closed, lots, _high_water(orders, high_water))
+
+
+def stored_outcome_board(store: StateStore, cutoff_iso: str = DEFAULT_PROFIT_CUTOFF) -> dict:
+    """``build_outcome_board`` over the stored outcomes and open lots (see ``update_outcomes_from_orders``)."""
+    return build_outcome_board(
+        store.outcomes_since(cutoff_iso),
+        open_lots=_open_lot_rows(store.load_open_lots()),
+    )
+
+
 def build_outcome_board(
     outcomes: Iterable[dict],
     open_lots: Iterable[dict] | None = None,
@@ -1,3 +1,4 @@
+import json
 from typing import Any, Iterable, Optional
 
 from services.asset_variation import unrealized_pnl_pct
@@ -126,13 +127,17 @@ def compute_portfolio(
 
 
 def fetch_prices(client, symbols: Iterable[str]) -> dict[str, float]:
-    prices: dict[str, float] = {}
-    for symbol in symbols:
-        if not symbol or symbol in prices:
-            continue
-        ticker = client.get_symbol_ticker(symbol=symbol)
-        prices[symbol] = float(ticker["price"])
-    return prices
+    """Last prices in a single ticker request, however many symbols there are."""
+    wanted = list(dict.fromkeys(symbol for symbol in symbols if symbol))
+    if not wanted:
+        return {}
+    if len(wanted) == 1:
+        ticker = client.get_symbol_ticker(symbol=wanted[0])
+        return {wanted[0]: float(ticker["price"])}
+    tickers = client.get_symbol_ticker(
+        symbols=json.dumps(wanted, separators=(",", ":"))
+    )
+    return {ticker["symbol"]: float(ticker["price"]) for ticker in tickers}
 
 
 def fetch_missing_entry_prices(
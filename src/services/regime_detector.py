@@ -57,7 +57,8 @@ class RegimeDetector:
         self.min_candles = min_candles
         self.action_in_lateral = action_in_lateral
 
-    def evaluate(self, stock_data: pd.DataFrame) -> RegimeResult:
+    def evaluate(self, stock_data: pd.DataFrame, indicators=None) -> RegimeResult:
+        """Classify the market; ``indicators`` is an optional ``IndicatorStream``/``IndicatorContext`` for ``stock_data``."""
         if not self.enabled:
             return RegimeResult(regime="TREND", score=0, signals={})
 
@@ -68,30 +69,32 @@ class RegimeDetector:
                 signals={"insufficient_data": True},
             )
 
-        df = stock_data.copy()
+        if indicators is not None:
+            df = stock_data.tail(self.range_lookback)
+        else:
+            df = stock_data
+        df = df.copy()
         for col in ("close_price", "high_price", "low_price"):
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors="coerce")
         df.dropna(subset=["close_price", "high_price", "low_price"], inplace=True)
 
-        if len(df) < self.min_candles:
+        if len(df) < (self.min_candles if indicators is None else 1):
             return RegimeResult(
                 regime="GRAY",
                 score=0,
                 signals={"insufficient_data": True},
             )
 
-        adx_series = adx(df, period=self.adx_period)
-        adx_value = float(adx_series.iloc[-1]) if not pd.isna(adx_series.iloc[-1]) else 0.0
-
-        rsi_series = rsi(df["close_price"], self.rsi_period, last_only=False)
-        rsi_value = float(rsi_series.iloc[-1]) if not pd.isna(rsi_series.iloc[-1]) else 50.0
+        adx_value, rsi_value, ema_fast, ema_slow = self._indicator_values(df, indicators)
 
         channel = self._compute_channel(df)
         signals = {
             "adx_low": self._check_adx_low(adx_value),
             "rsi_neutral": self._check_rsi_neutral(rsi_value),
-            "ema_compressed": self._check_ema_compressed(df),
+            "ema_compressed": self._check_ema_compressed(
+                float(df["close_price"].iloc[-1]), ema_fast, ema_slow
+            ),
             "range_bound": channel["range_bound"],
         }
         score = sum(1 for v in signals.values() if v)
@@ -114,22 +117,34 @@ class RegimeDetector:
             channel_width_pct=channel["channel_width_pct"],
         )
 
+    def _indicator_values(self, df: pd.DataFrame, indicators) -> tuple[float, float, float, float]:
+        if indicators is not None:
+            adx_last = indicators.adx(self.adx_period).value
+            rsi_last = indicators.rsi(self.rsi_period).value
+            ema_fast = indicators.ema(self.ema_fast).value
+            ema_slow = indicators.ema(self.ema_slow).value
+        else:
+            close = df["close_price"]
+            adx_last = adx(df, period=self.adx_period).iloc[-1]
+            rsi_last = rsi(close, self.rsi_period, last_only=False).iloc[-1]
+            ema_fast = ema(close, self.ema_fast).iloc[-1]
+            ema_slow = ema(close, self.ema_slow).iloc[-1]
+        adx_value = float(adx_last) if not pd.isna(adx_last) else 0.0
+        rsi_value = float(rsi_last) if not pd.isna(rsi_last) else 50.0
+        return adx_value, rsi_value, float(ema_fast), float(ema_slow)
+
     def _check_adx_low(self, adx_value: float) -> bool:
         return adx_value < self.adx_lateral_threshold
 
     def _check_rsi_neutral(self, rsi_value: float) -> bool:
         return self.rsi_low <= rsi_value <= self.rsi_high
 
-    def _check_ema_compressed(self, df: pd.DataFrame) -> bool:
-        close = df["close_price"]
-        ema_fast = ema(close, self.ema_fast)
-        ema_slow = ema(close, self.ema_slow)
-        if pd.isna(ema_fast.iloc[-1]) or pd.isna(ema_slow.iloc[-1]):
+    def _check_ema_compressed(self, last_close: float, ema_fast: float, ema_slow: float) -> bool:
+        if pd.isna(ema_fast) or pd.isna(ema_slow):
             return False
-        last_close = float(close.iloc[-1])
         if last_close == 0:
             return False
-        spread_pct = abs(float(ema_fast.iloc[-1]) - float(ema_slow.iloc[-1])) / last_close * 100
+        spread_pct = abs(ema_fast - ema_slow) / last_close * 100
         return spread_pct < self.ema_compression_pct
 
     def _compute_channel(self, df: pd.DataFrame) -> dict:
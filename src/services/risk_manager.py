@@ -22,6 +22,7 @@ class RiskManager:
         circuit_breaker_pause_seconds: int = 300,
         state_store=None,
         operation_code: str = "",
+        clock=None,
     ):
         self.acceptable_loss_pct = acceptable_loss_pct / 100
         self.stop_loss_pct = stop_loss_pct / 100
@@ -41,11 +42,13 @@ class RiskManager:
         self._daily_trades = 0
         self._daily_grid_trades = 0
         self._daily_loss_usdt = 0.0
+        # UTC datetime source; replays pass the candle time so daily limits roll over.
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
         self._day_key = self._today_key()
         self._hydrate_daily()
 
     def _today_key(self) -> str:
-        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        return self._clock().strftime("%Y-%m-%d")
 
     def _reset_daily_counters_if_needed(self):
         today = self._today_key()
@@ -255,8 +258,10 @@ class RiskManager:
         stock_data,
         last_buy_price: float,
         position_open: bool,
+        price: Optional[float] = None,
     ) -> bool:
-        close_price = stock_data["close_price"].iloc[-1]
+        """``price`` (latest trade) replaces the forming candle's close when given."""
+        close_price = stock_data["close_price"].iloc[-1] if price is None else price
         weighted_price = stock_data["close_price"].iloc[-2]
         stop_loss_price = last_buy_price * (1 - self.stop_loss_pct)
         return (
@@ -272,10 +277,11 @@ class RiskManager:
         position_open: bool,
         take_profit_index: int,
         balance: float,
+        price: Optional[float] = None,
     ) -> Optional[tuple[float, float, int]]:
         if not position_open or take_profit_index >= len(self.take_profit_at):
             return None
-        close_price = stock_data["close_price"].iloc[-1]
+        close_price = stock_data["close_price"].iloc[-1] if price is None else price
         variation = self.get_price_change_pct(last_buy_price, close_price)
         tp_pct = self.take_profit_at[take_profit_index]
         tp_amount = self.take_profit_amount[take_profit_index]
@@ -0,0 +1,235 @@
+import json
+import logging
+import threading
+import time
+from typing import Iterable, Optional
+
+from websockets.sync.client import connect as ws_connect
+
+from modules.logging_setup import log_event
+from services.market_data import MarketDataService
+from services.market_stream import MAINNET_WS_URL
+
+OPEN_STATUSES = ("NEW", "PARTIALLY_FILLED")
+
+
+class AccountState:
+    """
+    Balances, open orders and last fills kept in memory from the user data
+    stream, exposed in the same shapes the REST endpoints return.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._balances: dict[str, dict] = {}
+        self._balance_time: dict[str, int] = {}
+        self._open_orders: dict[str, dict[int, dict]] = {}
+        self._last_fills: dict[tuple[str, str], tuple[int, float]] = {}
+
+    def account_data(self) -> dict:
+        with self._lock:
+            return {"balances": [dict(row) for row in self._balances.values()]}
+
+    def open_orders(self, symbol: str) -> list[dict]:
+        with self._lock:
+            orders = self._open_orders.get(symbol, {})
+            return [dict(order) for order in orders.values()]
+
+    def last_fill_price(self, symbol: str, side: str) -> float:
+        with self._lock:
+            return self._last_fills.get((symbol, side), (0, 0.0))[1]
+
+    def load_snapshot(
+        self,
+        account: dict,
+        open_orders: dict[str, list[dict]],
+        all_orders: dict[str, list[dict]],
+    ) -> None:
+        """Replace the state with REST results (startup and after reconnects)."""
+        updated = int(account.get("updateTime") or 0)
+        with self._lock:
+            self._balances = {
+                row["asset"]: {
+                    "asset": row["asset"],
+                    "free": str(row["free"]),
+                    "locked": str(row["locked"]),
+                }
+                for row in account.get("balances", [])
+            }
+            self._balance_time = {asset: updated for asset in self._balances}
+            self._open_orders = {
+                symbol: {int(order["orderId"]): dict(order) for order in orders}
+                for symbol, orders in open_orders.items()
+            }
+            self._last_fills = {}
+            for symbol, orders in all_orders.items():
+                for side in ("BUY", "SELL"):
+                    price = MarketDataService.get_last_fill_price(orders, side)
+                    if price > 0:
+                        filled = [
+                            o for o in orders if o["side"] == side and o["status"] == "FILLED"
+                        ]
+                        last_time = max(int(o.get("time") or 0) for o in filled)
+                        self._last_fills[(symbol, side)] = (last_time, price)
+
+    def apply(self, event: dict) -> None:
+        kind = event.get("e")
+        if kind == "outboundAccountPosition":
+            self._apply_balances(event)
+        elif kind == "executionReport":
+            self._apply_execution(event)
+
+    def _apply_balances(self, event: dict) -> None:
+        event_time = int(event.get("u") or event.get("E") or 0)
+        with self._lock:
+            for row in event.get("B", []):
+                asset = row["a"]
+                if event_time < self._balance_time.get(asset, 0):
+                    continue
+                self._balances[asset] = {"asset": asset, "free": row["f"], "locked": row["l"]}
+                self._balance_time[asset] = event_time
+
+    def _apply_execution(self, event: dict) -> None:
+        symbol = event["s"]
+        order_id = int(event["i"])
+        status = event["X"]
+        order = {
+            "symbol": symbol,
+            "orderId": order_id,
+            "clientOrderId": event.get("c", ""),
+            "price": event.get("p", "0"),
+            "origQty": event.get("q", "0"),
+            "executedQty": event.get("z", "0"),
+            "cummulativeQuoteQty": event.get("Z", "0"),
+            "status": status,
+            "type": event.get("o", ""),
+            "side": event["S"],
+            "time": int(event.get("O") or event.get("T") or 0),
+            "updateTime": int(event.get("T") or event.get("E") or 0),
+        }
+        with self._lock:
+            orders = self._open_orders.setdefault(symbol, {})
+            if status in OPEN_STATUSES:
+                orders[order_id] = order
+            else:
+                orders.pop(order_id, None)
+            if status == "FILLED":
+                executed = float(order["executedQty"] or 0)
+                if executed > 0:
+                    fill_time = order["updateTime"]
+                    key = (symbol, order["side"])
+                    if fill_time >= self._last_fills.get(key, (0, 0.0))[0]:
+                        price = float(order["cummulativeQuoteQty"]) / executed
+                        self._last_fills[key] = (fill_time, price)
+
+
+class UserDataStream:
+    """
+    User data stream consumer (executionReport / outboundAccountPosition).
+
+    Keeps one ``AccountState`` for the account. On startup and after every
+    reconnect the state is reloaded from REST; while ``is_live`` the bots read
+    balances, open orders and last fills from it instead of polling.
+    """
+
+    def __init__(
+        self,
+        client,
+        symbols: Iterable[str],
+        *,
+        ws_url: str = MAINNET_WS_URL,
+        state: Optional[AccountState] = None,
+        reconnect_delay: float = 5.0,
+        keepalive_seconds: float = 30 * 60,
+        connect=None,
+    ):
+        self.client = client
+        self.symbols = list(dict.fromkeys(symbols))
+        self.ws_url = ws_url.rstrip("/")
+        self.state = state or AccountState()
+        self.reconnect_delay = reconnect_delay
+        self.keepalive_seconds = keepalive_seconds
+        self._connect = connect or ws_connect
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+        self._live = False
+
+    @property
+    def is_live(self) -> bool:
+        return self._live
+
+    def start(self) -> "UserDataStream":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="user-data-stream", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def reconcile(self) -> None:
+        account = self.client.get_account()
+        open_orders = {
+            symbol: self.client.get_open_orders(symbol=symbol) for symbol in self.symbols
+        }
+        all_orders = {
+            symbol: self.client.get_all_orders(symbol=symbol, limit=100)
+            for symbol in self.symbols
+        }
+        self.state.load_snapshot(account, open_orders, all_orders)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                listen_key = self.client.stream_get_listen_key()
+                with self._connect(f"{self.ws_url}/ws/{listen_key}") as ws:
+                    self._ws = ws
+                    # Subscribe first so events racing the snapshot are queued, not lost.
+                    self.reconcile()
+                    self._live = True
+                    log_event(
+                        logging.INFO,
+                        "User data stream connected",
+                        event="user_stream_connected",
+                    )
+                    self._consume(ws, listen_key)
+            except Exception as exc:
+                if not self._stop.is_set():
+                    log_event(
+                        logging.WARNING,
+                        f"User data stream error: {exc}",
+                        event="user_stream_error",
+                    )
+            finally:
+                self._live = False
+                self._ws = None
+            self._stop.wait(self.reconnect_delay)
+
+    def _consume(self, ws, listen_key: str) -> None:
+        next_keepalive = time.monotonic() + self.keepalive_seconds
+        while not self._stop.is_set():
+            try:
+                raw = ws.recv(timeout=1.0)
+            except TimeoutError:
+                raw = None
+            if raw is not None:
+                event = json.loads(raw)
+                event = event.get("data", event)
+                if event.get("e") == "listenKeyExpired":
+                    return
+                self.state.apply(event)
+            if time.monotonic() >= next_keepalive:
+                self.client.stream_keepalive(listen_key)
+                next_keepalive = time.monotonic() + self.keepalive_seconds
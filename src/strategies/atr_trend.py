@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from indicators.atr import atr, compute_trailing_stop, compute_ut_position
@@ -8,10 +9,15 @@ def _evaluate_atr_trend(
     atr_period: int,
     atr_multiplier: float,
     trend_sma_period: int,
+    indicators=None,
 ):
     min_points = max(atr_period, trend_sma_period) + 5
     if len(stock_data) < min_points:
         return None
+    if indicators is not None:
+        return _evaluate_streaming(
+            stock_data, indicators, atr_period, atr_multiplier, trend_sma_period
+        )
 
     df = stock_data.copy()
     for col in ("close_price", "high_price", "low_price"):
@@ -35,9 +41,45 @@ def _evaluate_atr_trend(
     if last_pos == 0:
         return None
 
-    last_close = float(close.iloc[-1])
-    last_sma = float(sma.iloc[-1])
-    last_stop = float(trailing_stop.iloc[-1])
+    return _decide(
+        float(close.iloc[-1]),
+        float(sma.iloc[-1]),
+        float(trailing_stop.iloc[-1]),
+        last_pos,
+        atr_period,
+        atr_multiplier,
+        trend_sma_period,
+    )
+
+
+def _evaluate_streaming(
+    stock_data, indicators, atr_period, atr_multiplier, trend_sma_period
+):
+    trailing = indicators.trailing_stop(atr_period, atr_multiplier)
+    sma = indicators.sma(trend_sma_period).value
+    if pd.isna(trailing.atr.value) or pd.isna(sma) or trailing.position == 0:
+        return None
+    last_close = float(pd.to_numeric(stock_data["close_price"].iloc[-1]))
+    return _decide(
+        last_close,
+        float(sma),
+        float(trailing.value),
+        trailing.position,
+        atr_period,
+        atr_multiplier,
+        trend_sma_period,
+    )
+
+
+def _decide(
+    last_close: float,
+    last_sma: float,
+    last_stop: float,
+    last_pos,
+    atr_period: int,
+    atr_multiplier: float,
+    trend_sma_period: int,
+):
     trailing_long = last_pos == 1
     decision = bool(trailing_long and last_close > last_sma)
 
@@ -60,9 +102,10 @@ def get_atr_trend_snapshot(
     atr_period: int = 14,
     atr_multiplier: float = 2.5,
     trend_sma_period: int = 200,
+    indicators=None,
 ) -> dict | None:
     result = _evaluate_atr_trend(
-        stock_data, atr_period, atr_multiplier, trend_sma_period
+        stock_data, atr_period, atr_multiplier, trend_sma_period, indicators
     )
     if result is None:
         return None
@@ -75,6 +118,7 @@ def getAtrTrendStrategy(
     atr_multiplier: float = 2.5,
     trend_sma_period: int = 200,
     verbose: bool = True,
+    indicators=None,
 ):
     """
     Trend following com trailing stop ATR e filtro SMA de tendência.
@@ -82,6 +126,9 @@ def getAtrTrendStrategy(
     - True: trailing stop indica long E close > SMA
     - False: trailing stop indica short OU close < SMA
     - None: dados insuficientes (ativa fallback)
+
+    ``indicators`` (``IndicatorStream``/``IndicatorContext``) evita recalcular
+    a janela inteira.
     """
     min_points = max(atr_period, trend_sma_period) + 5
     if len(stock_data) < min_points:
@@ -93,7 +140,7 @@ def getAtrTrendStrategy(
         return None
 
     result = _evaluate_atr_trend(
-        stock_data, atr_period, atr_multiplier, trend_sma_period
+        stock_data, atr_period, atr_multiplier, trend_sma_period, indicators
     )
     if result is None:
         if verbose:
@@ -117,3 +164,43 @@ def getAtrTrendStrategy(
         print("-------")
 
     return decision
+
+
+def atr_trend_signal_series(
+    stock_data: pd.DataFrame,
+    atr_period: int = 14,
+    atr_multiplier: float = 2.5,
+    trend_sma_period: int = 200,
+    **_ignored,
+):
+    """
+    Decisão de ``getAtrTrendStrategy`` para cada prefixo ``stock_data.iloc[:i+1]``,
+    calculada em uma única passada (1.0 compra, 0.0 venda, NaN sem sinal).
+
+    ATR, SMA e trailing stop são causais, então o valor no candle ``i`` da série
+    completa é o mesmo que a estratégia vê no prefixo. Retorna None se houver
+    linhas inválidas (a estratégia as descartaria e os índices não bateriam).
+    """
+    df = stock_data.copy()
+    for col in ("close_price", "high_price", "low_price"):
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    if df[["close_price", "high_price", "low_price"]].isna().any().any():
+        return None
+
+    close = df["close_price"]
+    atr_values = atr(df, window=atr_period)
+    sma = close.rolling(window=trend_sma_period).mean()
+    trailing_stop = compute_trailing_stop(close, atr_values, atr_multiplier)
+    position = compute_ut_position(close, trailing_stop)
+
+    close_arr = close.to_numpy(dtype=np.float64)
+    sma_arr = sma.to_numpy(dtype=np.float64)
+    signals = np.where((position == 1) & (close_arr > sma_arr), 1.0, 0.0)
+    undefined = np.isnan(atr_values.to_numpy(dtype=np.float64)) | np.isnan(sma_arr) | (position == 0)
+    min_points = max(atr_period, trend_sma_period) + 5
+    undefined[: min_points - 1] = True
+    signals[undefined] = np.nan
+    return signals
+
+
+getAtrTrendStrategy.signal_series = atr_trend_signal_series
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 MA_fast = 7
@@ -51,3 +52,25 @@ def getMovingAverageTradeStrategy(stock_data: pd.DataFrame, fast_window=MA_fast,
         print("-------")
 
     return trade_decision
+
+
+def moving_average_signal_series(stock_data: pd.DataFrame, fast_window=MA_fast, slow_window=MA_slow, **_ignored):
+    """
+    Decisão de ``getMovingAverageTradeStrategy`` para cada prefixo da série,
+    em uma única passada (1.0 compra, 0.0 venda, NaN sem sinal).
+    """
+    close = pd.to_numeric(stock_data["close_price"], errors="coerce")
+    if close.isna().any():
+        return None
+
+    ma_fast = close.rolling(window=fast_window).mean().to_numpy(dtype=np.float64)
+    ma_slow = close.rolling(window=slow_window).mean().to_numpy(dtype=np.float64)
+    signals = np.where(ma_fast > ma_slow, 1.0, 0.0)
+
+    # Linhas com as duas médias definidas até o candle i, como no dropna da estratégia
+    valid_rows = np.cumsum(~(np.isnan(ma_fast) | np.isnan(ma_slow)))
+    signals[valid_rows < slow_window] = np.nan
+    return signals
+
+
+getMovingAverageTradeStrategy.signal_series = moving_average_signal_series
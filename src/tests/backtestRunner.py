@@ -14,13 +14,22 @@ def backtestRunner(
     fee_rate=DEFAULT_FEE_RATE,
     slippage=DEFAULT_SLIPPAGE,
     verbose=True,
+    warmup=0,
     **strategy_kwargs,
 ):
     """
     Executa backtest e retorna metricas detalhadas.
 
     Retorna dict com: profit_percentage, trades, max_drawdown_pct, total_fees,
-    sharpe_approx, final_balance.
+    sharpe_approx, final_balance, equity_curve.
+
+    ``warmup`` candles iniciais servem só de histórico para os indicadores:
+    não operam nem entram na curva de equity.
+
+    Se ``strategy_function`` expõe ``signal_series(stock_data, **kwargs)``, o
+    backtest usa o array de decisões por candle (1.0 compra, 0.0 venda, NaN sem
+    sinal) em vez de reexecutar a estratégia em cada prefixo. Quando o atributo
+    não existe ou retorna None, cai no loop por prefixo.
     """
     result = _run_backtest(
         stock_data=stock_data,
@@ -30,6 +39,7 @@ def backtestRunner(
         initial_balance=initial_balance,
         fee_rate=fee_rate,
         slippage=slippage,
+        warmup=warmup,
         strategy_kwargs=strategy_kwargs,
     )
 
@@ -55,6 +65,7 @@ def _run_backtest(
     fee_rate,
     slippage,
     strategy_kwargs,
+    warmup=0,
 ):
     min_required_periods = strategy_kwargs.get("slow_window", 40) + 20
     min_required_periods = max(
@@ -72,20 +83,25 @@ def _run_backtest(
     total_fees = 0.0
     equity_curve = [initial_balance]
 
-    for i in range(1, len(stock_data)):
-        current_data = stock_data.iloc[: i + 1]
+    closes = stock_data["close_price"].tolist()
+    signals = _signal_series(stock_data, strategy_function, strategy_instance, strategy_kwargs)
 
-        if strategy_instance:
+    for i in range(max(1, warmup), len(stock_data)):
+        if signals is not None:
+            raw = signals[i]
+            signal = None if raw != raw else bool(raw)
+        elif strategy_instance:
             signal = strategy_function(strategy_instance)
         else:
+            current_data = stock_data.iloc[: i + 1]
             signal = strategy_function(current_data, verbose=False, **strategy_kwargs)
 
+        close_price = closes[i]
+
         if signal is None:
-            equity_curve.append(balance if position == 0 else _mark_to_market(balance, entry_price, stock_data.iloc[i]["close_price"], slippage))
+            equity_curve.append(balance if position == 0 else _mark_to_market(balance, entry_price, close_price, slippage))
             continue
 
-        close_price = stock_data.iloc[i]["close_price"]
-
         if signal and position == 0 and last_signal != "buy":
             fill_price = close_price * (1 + slippage)
             fee = balance * fee_rate
@@ -114,7 +130,7 @@ def _run_backtest(
             equity_curve.append(balance)
 
     if position == 1:
-        final_price = stock_data.iloc[-1]["close_price"] * (1 - slippage)
+        final_price = closes[-1] * (1 - slippage)
         gross_profit = ((final_price - entry_price) / entry_price) * balance
         fee = (balance + gross_profit) * fee_rate
         balance += gross_profit - fee
@@ -132,9 +148,25 @@ def _run_backtest(
         "total_fees": total_fees,
         "sharpe_approx": sharpe_approx,
         "final_balance": balance,
+        "equity_curve": equity_curve,
     }
 
 
+def _signal_series(stock_data, strategy_function, strategy_instance, strategy_kwargs):
+    signal_series = getattr(strategy_function, "signal_series", None)
+    if signal_series is None or strategy_instance:
+        return None
+    signals = signal_series(stock_data, **strategy_kwargs)
+    if signals is None:
+        return None
+    signals = np.asarray(signals, dtype=np.float64)
+    if len(signals) != len(stock_data):
+        raise ValueError(
+            f"signal_series returned {len(signals)} values for {len(stock_data)} candles"
+        )
+    return signals.tolist()
+
+
 def _mark_to_market(balance, entry_price, close_price, slippage):
     exit_price = close_price * (1 - slippage)
     return balance + ((exit_price - entry_price) / entry_price) * balance
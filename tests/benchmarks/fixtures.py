@@ -0,0 +1,52 @@
+"""Reproducible synthetic market data for the benchmark suite."""
+import numpy as np
+import pandas as pd
+
+EPOCH_MS = 1_735_689_600_000
+HOUR_MS = 3_600_000
+
+
+def synthetic_klines(n: int, seed: int = 42) -> list[list]:
+    """``n`` Binance kline rows (strings, as the REST API returns them) from a seeded random walk."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0, 0.004, n)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.lognormal(6, 0.5, n)
+    open_time = EPOCH_MS + np.arange(n, dtype=np.int64) * HOUR_MS
+    return [
+        [int(t), f"{o:.4f}", f"{h:.4f}", f"{l:.4f}", f"{c:.4f}", f"{v:.4f}",
+         int(t) + HOUR_MS - 1, f"{c * v:.4f}", 100, "0", "0", "0"]
+        for t, o, h, l, c, v in zip(open_time, open_, high, low, close, volume)
+    ]
+
+
+def synthetic_candles(n: int, seed: int = 42) -> pd.DataFrame:
+    """The same walk as ``synthetic_klines``, already normalized."""
+    from services.market_data import MarketDataService
+
+    return MarketDataService.normalize_klines(synthetic_klines(n, seed))
+
+
+def synthetic_orders(candles: pd.DataFrame, every: int = 10, operation_code: str = "BTCUSDT") -> list[dict]:
+    """Alternating FILLED BUY/SELL rows (``orders_log`` shape) every ``every`` candles."""
+    orders = []
+    closes = candles["close_price"].to_numpy()
+    times = pd.to_datetime(candles["open_time"], utc=True)
+    for i, index in enumerate(range(0, len(candles), every)):
+        price = float(closes[index])
+        orders.append(
+            {
+                "order_id": i + 1,
+                "operation_code": operation_code,
+                "side": "BUY" if i % 2 == 0 else "SELL",
+                "status": "FILLED",
+                "quantity": 0.01,
+                "price": price,
+                "total_quote": 0.01 * price,
+                "created_at": times.iloc[index].isoformat(),
+            }
+        )
+    return orders
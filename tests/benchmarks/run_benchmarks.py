@@ -0,0 +1,198 @@
+"""
+Benchmarks dos caminhos quentes do bot sobre candles sinteticos reproduziveis.
+
+Uso:
+    python tests/benchmarks/run_benchmarks.py [--sizes 1000 10000 100000] [--cases regime] \
+        [--repeat 3] [--out data/benchmarks.json] [--threshold 0.25] [--update-baseline]
+
+Mede operacoes por segundo (melhor de ``--repeat`` rodadas) e pico de memoria
+(tracemalloc) de cada caso, grava o JSON em ``--out`` e compara com a linha de
+base em tests/benchmarks/baseline.json: sai com codigo 1 se algum caso ficou
+mais lento (ou usou mais memoria) que a base alem de ``--threshold``, ou se a
+base nao existe. A base depende da maquina; gere-a com ``--update-baseline``
+no mesmo ambiente.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+for path in (ROOT / "src", ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks.fixtures import synthetic_candles, synthetic_klines, synthetic_orders  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+# execute() cycles are per candle, so the replay case walks a fixed prefix of every fixture.
+REPLAY_CANDLES = 600
+REPLAY_WARMUP = 200
+MIN_SAMPLE_SECONDS = 0.2
+STRATEGY_KWARGS = {"moving_average_antecipation": {"volatility_factor": 0.5}}
+
+
+def build_cases(size: int, seed: int = 42) -> dict:
+    """``{name: (callable, bars per call)}`` for one fixture size."""
+    from backtest.replay import replay_history
+    from indicators.atr import atr, compute_trailing_stop
+    from services.breakout_detector import BreakoutDetector
+    from services.market_data import MarketDataService
+    from services.outcome_history import match_trades_and_open_lots
+    from services.regime_detector import RegimeDetector
+    from strategies.registry import STRATEGY_REGISTRY
+
+    klines = synthetic_klines(size, seed)
+    candles = synthetic_candles(size, seed)
+    atr_values = atr(candles, window=14)
+    orders = synthetic_orders(candles)
+    regime = RegimeDetector()
+    breakout = BreakoutDetector()
+    breakout_price = float(candles["high_price"].iloc[-30:-1].max())
+    replay_frame = candles.iloc[:REPLAY_CANDLES].reset_index(drop=True)
+
+    cases = {
+        "normalize_klines": (lambda: MarketDataService.normalize_klines(klines), size),
+        "regime_detector": (lambda: regime.evaluate(candles), size),
+        "breakout_detector": (lambda: breakout.evaluate(candles, breakout_price), size),
+        "trailing_stop": (
+            lambda: compute_trailing_stop(candles["close_price"], atr_values, 2.5),
+            size,
+        ),
+        "match_trades": (lambda: match_trades_and_open_lots(orders), len(orders)),
+        "engine_replay": (
+            lambda: replay_history(replay_frame, warmup=REPLAY_WARMUP),
+            len(replay_frame) - REPLAY_WARMUP,
+        ),
+    }
+    for name, strategy in STRATEGY_REGISTRY.items():
+        kwargs = {"verbose": False, **STRATEGY_KWARGS.get(name, {})}
+        cases[f"strategy.{name}"] = (
+            lambda strategy=strategy, kwargs=kwargs: strategy(candles, **kwargs),
+            size,
+        )
+    return cases
+
+
+def measure(fn, bars: int, repeat: int = 3) -> dict:
+    """Best-of-``repeat`` throughput of ``fn`` and the peak memory it allocates."""
+    timer = timeit.Timer(fn)
+    # Some strategies print their analysis even with verbose=False.
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        number, elapsed = timer.autorange()
+        if elapsed < MIN_SAMPLE_SECONDS:
+            number = max(number, int(number * MIN_SAMPLE_SECONDS / max(elapsed, 1e-9)))
+        best = min(timer.repeat(repeat=max(1, repeat), number=number)) / number
+
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        "bars": bars,
+        "seconds_per_op": best,
+        "ops_per_sec": 1.0 / best,
+        "bars_per_sec": bars / best,
+        "peak_mib": peak / 2**20,
+    }
+
+
+def run(sizes=DEFAULT_SIZES, cases=None, repeat: int = 3, seed: int = 42, log=print) -> dict:
+    results = {}
+    for size in sizes:
+        for name, (fn, bars) in build_cases(size, seed).items():
+            if cases and not any(pattern in name for pattern in cases):
+                continue
+            key = f"{name}@{size}"
+            results[key] = {"case": name, "size": size, **measure(fn, bars, repeat)}
+            log(
+                f"{key:<42} {results[key]['ops_per_sec']:>12.2f} ops/s "
+                f"{results[key]['peak_mib']:>9.2f} MiB"
+            )
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """
+    Regressions of ``current`` against ``baseline`` (both ``run`` reports):
+    cases whose ops/sec dropped, or whose peak memory grew, by more than
+    ``threshold`` (a fraction). Cases missing from either side are ignored.
+    """
+    regressions = []
+    baseline_results = baseline.get("results", {})
+    for key, result in sorted(current.get("results", {}).items()):
+        base = baseline_results.get(key)
+        if base is None:
+            continue
+        speed = result["ops_per_sec"] / base["ops_per_sec"] - 1 if base["ops_per_sec"] else 0.0
+        if speed < -threshold:
+            regressions.append(
+                f"{key}: {result['ops_per_sec']:.2f} ops/s vs {base['ops_per_sec']:.2f} ({speed:+.1%})"
+            )
+        memory = result["peak_mib"] / base["peak_mib"] - 1 if base["peak_mib"] else 0.0
+        if memory > threshold:
+            regressions.append(
+                f"{key}: {result['peak_mib']:.2f} MiB vs {base['peak_mib']:.2f} ({memory:+.1%})"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--cases", nargs="+", help="filtra casos pelo nome (substring)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=str(ROOT / "data" / "benchmarks.json"))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="fracao tolerada, ex.: 0.25")
+    parser.add_argument("--update-baseline", action="store_true", help="grava o resultado como nova base")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report = run(args.sizes, args.cases, args.repeat, args.seed)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"Resultados em {out} ({time.perf_counter() - started:.1f}s)")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"Linha de base atualizada em {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"Sem linha de base em {baseline_path}; rode com --update-baseline.")
+        return 1
+    regressions = compare(report, json.loads(baseline_path.read_text()), args.threshold)
+    for line in regressions:
+        print(f"REGRESSAO {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from binance.async_client import AsyncClient
+from binance.exceptions import BinanceAPIException
+
+from backtest.replay import build_replay_engine
+from core.async_runtime import CycleReads, prefetch_reads, run_assets
+from modules.BinanceClient import AsyncBinanceClient
+from persistence.state_store import StateStore
+from services.market_data import MarketDataService
+from services.order_history import OrderHistory
+
+
+def _flat(n: int, price: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "close_price": [price] * n,
+            "open_price": [price] * n,
+            "high_price": [price + 1] * n,
+            "low_price": [price - 1] * n,
+            "volume": [1000.0] * n,
+        }
+    )
+
+
+class FakeAsyncClient:
+    """Records calls; every read waits for all assets to be in flight before returning."""
+
+    def __init__(self, in_flight_target: int):
+        self.calls = []
+        self.in_flight = 0
+        self.overlapped = asyncio.Event()
+        self.in_flight_target = in_flight_target
+        self.closed = False
+
+    async def _call(self, name, result, **kwargs):
+        self.calls.append((name, kwargs))
+        self.in_flight += 1
+        if self.in_flight >= self.in_flight_target:
+            self.overlapped.set()
+        await asyncio.wait_for(self.overlapped.wait(), 5)
+        self.in_flight -= 1
+        return result
+
+    async def get_account(self):
+        return await self._call("get_account", {"balances": []})
+
+    async def get_open_orders(self, **kwargs):
+        return await self._call("get_open_orders", [], **kwargs)
+
+    async def get_all_orders(self, **kwargs):
+        return await self._call("get_all_orders", [], **kwargs)
+
+    async def get_klines(self, **kwargs):
+        return await self._call("get_klines", [], **kwargs)
+
+    async def close_connection(self):
+        self.closed = True
+
+
+class _ClientWithoutMarketData:
+    def get_klines(self, **kwargs):
+        raise AssertionError("unexpected REST call")
+
+
+def _fake_bot(symbol: str, *, stream_state=None):
+    return SimpleNamespace(
+        operation_code=symbol,
+        time_to_sleep=0.01,
+        order_history=OrderHistory(None, symbol),
+        market_data=MarketDataService(_ClientWithoutMarketData(), symbol, "1h"),
+        _account_state=lambda: stream_state,
+    )
+
+
+def test_prefetch_overlaps_reads_of_every_asset():
+    bots = [_fake_bot("BTCUSDT"), _fake_bot("ETHUSDT")]
+    client = FakeAsyncClient(in_flight_target=8)
+
+    async def run():
+        return await asyncio.gather(*(prefetch_reads(bot, client) for bot in bots))
+
+    reads = asyncio.run(run())
+
+    assert client.overlapped.is_set()
+    assert reads[0] == CycleReads(
+        account_data={"balances": []},
+        open_orders=[],
+        klines=({"symbol": "BTCUSDT", "interval": "1h", "limit": 1000}, []),
+        orders=({"symbol": "BTCUSDT", "limit": 100}, []),
+    )
+
+
+def test_prefetch_leaves_stream_backed_reads_alone():
+    bot = _fake_bot("BTCUSDT", stream_state=object())
+    client = FakeAsyncClient(in_flight_target=1)
+
+    reads = asyncio.run(prefetch_reads(bot, client))
+
+    assert [name for name, _ in client.calls] == ["get_klines"]
+    assert reads.account_data is None and reads.orders is None
+
+
+def test_engine_uses_prefetched_reads_for_one_update_only(tmp_path):
+    bot, engine = build_replay_engine(
+        _flat(5, 100.0), store=StateStore(tmp_path / "reads.db"), quote_balance=50.0
+    )
+    engine.bootstrap()
+    prefetched = {"balances": [{"asset": "USDT", "free": "7", "locked": "0"}]}
+
+    engine._reads = CycleReads(account_data=prefetched, open_orders=[])
+    engine.update_all_data()
+    assert bot.account_data is prefetched
+
+    engine.update_all_data()
+    assert bot.account_data is not prefetched
+
+
+def test_run_assets_feeds_each_cycle_its_prefetch_and_closes_the_client():
+    stop = threading.Event()
+    cycles = []
+    client = FakeAsyncClient(in_flight_target=1)
+
+    def build_bot(asset):
+        if asset == "BROKEN":
+            raise ValueError("bad asset")
+        return _fake_bot(asset)
+
+    def cycle_runner(bot):
+        def run_cycle(reads):
+            cycles.append((bot.operation_code, reads))
+            if len(cycles) >= 4:
+                stop.set()
+
+        return run_cycle
+
+    run_assets(
+        ["BTCUSDT", "ETHUSDT", "BROKEN"],
+        build_bot=build_bot,
+        cycle_runner=cycle_runner,
+        make_client=lambda: client,
+        stop_event=stop,
+    )
+
+    assert {symbol for symbol, _ in cycles} == {"BTCUSDT", "ETHUSDT"}
+    assert all(isinstance(reads, CycleReads) for _, reads in cycles)
+    assert client.closed
+
+
+def _api_error(code: int, status: int = 400) -> BinanceAPIException:
+    return BinanceAPIException(None, status, f'{{"code": {code}, "msg": "error"}}')
+
+
+class FakeClock:
+    API_KEY = "key"
+    API_SECRET = "secret"
+    testnet = True
+    sync = True
+    sync_interval = 300_000
+    max_retries = 3
+    retry_backoff = 0.0
+
+    def __init__(self):
+        self.timestamp_offset = 0
+        self.last_sync_time = 10**15
+        self.forced = 0
+
+    def sync_time_offset(self, force=False):
+        if force:
+            self.forced += 1
+            self.timestamp_offset = -500
+        return True
+
+
+def test_async_client_resyncs_shared_clock_on_timestamp_error(monkeypatch):
+    sent = []
+    errors = [_api_error(-1021)]
+
+    async def fake_request(self, method, uri, signed, force_params=False, **kwargs):
+        sent.append((self.timestamp_offset, dict(kwargs["data"])))
+        if errors:
+            raise errors.pop()
+        kwargs["data"]["timestamp"] = 1
+        kwargs["data"]["signature"] = "sig"
+        return {"ok": True}
+
+    monkeypatch.setattr(AsyncClient, "_request", fake_request)
+    clock = FakeClock()
+
+    async def run():
+        client = AsyncBinanceClient(clock)
+        try:
+            return await client._request("get", "account", True, data={"omitZeroBalances": "true"})
+        finally:
+            await client.close_connection()
+
+    assert asyncio.run(run()) == {"ok": True}
+    assert clock.forced == 1
+    assert [offset for offset, _ in sent] == [0, -500]
+    assert all("signature" not in data and "timestamp" not in data for _, data in sent)
+    assert sent[1][1] == {"omitZeroBalances": "true", "recvWindow": 10000}
+
+
+def test_async_client_gives_up_on_non_retryable_errors(monkeypatch):
+    calls = []
+
+    async def fake_request(self, method, uri, signed, force_params=False, **kwargs):
+        calls.append(uri)
+        raise _api_error(-2010)
+
+    monkeypatch.setattr(AsyncClient, "_request", fake_request)
+
+    async def run():
+        client = AsyncBinanceClient(FakeClock())
+        try:
+            await client._request("post", "order", True, data={})
+        finally:
+            await client.close_connection()
+
+    with pytest.raises(BinanceAPIException):
+        asyncio.run(run())
+    assert calls == ["order"]
@@ -3,7 +3,7 @@ import pandas as pd
 import pytest
 
 from strategies import atr_trend
-from strategies.atr_trend import getAtrTrendStrategy
+from strategies.atr_trend import get_atr_trend_snapshot, getAtrTrendStrategy
 
 
 def _make_ohlc(n: int, base: float = 100.0, trend: float = 0.0) -> pd.DataFrame:
@@ -71,3 +71,118 @@ def test_emits_false_when_trailing_short(monkeypatch):
     monkeypatch.setattr(atr_trend, "compute_ut_position", forced_short)
     result = getAtrTrendStrategy(data, verbose=False)
     assert result is False
+
+
+def _reference_trailing_stop(close, atr_values, multiplier):
+    trailing_stop = pd.Series(np.nan, index=close.index)
+    for i in range(1, len(close)):
+        prev_stop = trailing_stop.iloc[i - 1]
+        if pd.isna(prev_stop):
+            prev_stop = close.iloc[i - 1]
+        curr_close = close.iloc[i]
+        prev_close = close.iloc[i - 1]
+        curr_atr = atr_values.iloc[i]
+        if pd.isna(curr_atr):
+            trailing_stop.iloc[i] = prev_stop
+            continue
+        if curr_close > prev_stop and prev_close > prev_stop:
+            trailing_stop.iloc[i] = max(prev_stop, curr_close - multiplier * curr_atr)
+        elif curr_close < prev_stop and prev_close < prev_stop:
+            trailing_stop.iloc[i] = min(prev_stop, curr_close + multiplier * curr_atr)
+        elif curr_close > prev_stop:
+            trailing_stop.iloc[i] = curr_close - multiplier * curr_atr
+        else:
+            trailing_stop.iloc[i] = curr_close + multiplier * curr_atr
+    return trailing_stop
+
+
+def _reference_ut_position(close, trailing_stop):
+    pos = np.zeros(len(close))
+    for i in range(1, len(close)):
+        if pd.isna(trailing_stop.iloc[i - 1]) or pd.isna(trailing_stop.iloc[i]):
+            pos[i] = pos[i - 1]
+            continue
+        if close.iloc[i - 1] < trailing_stop.iloc[i - 1] and close.iloc[i] > trailing_stop.iloc[i]:
+            pos[i] = 1
+        elif close.iloc[i - 1] > trailing_stop.iloc[i - 1] and close.iloc[i] < trailing_stop.iloc[i]:
+            pos[i] = -1
+        else:
+            pos[i] = pos[i - 1]
+    return pos
+
+
+@pytest.mark.parametrize("multiplier", [1.0, 2.5])
+def test_array_trailing_stop_matches_reference_loop(multiplier):
+    from indicators.atr import atr, compute_trailing_stop, compute_ut_position
+
+    rng = np.random.default_rng(7)
+    data = _make_ohlc(400, base=100, trend=0.05)
+    data["close_price"] += rng.normal(0, 1.5, len(data)).cumsum()
+    data["high_price"] = data["close_price"] + 1.0
+    data["low_price"] = data["close_price"] - 1.0
+    close = data["close_price"]
+    atr_values = atr(data, window=14)
+
+    expected_stop = _reference_trailing_stop(close, atr_values, multiplier)
+    stop = compute_trailing_stop(close, atr_values, multiplier)
+    assert stop.index.equals(close.index)
+    np.testing.assert_array_equal(stop.to_numpy(), expected_stop.to_numpy())
+    np.testing.assert_array_equal(
+        compute_ut_position(close, stop), _reference_ut_position(close, expected_stop)
+    )
+
+
+@pytest.mark.parametrize("multiplier", [1.0, 2.5])
+def test_both_kernel_implementations_match_reference_loop(multiplier):
+    # compute_* dispatch to one of the two (numba or plain Python); check both
+    # directly. Without numba the kernels run uncompiled, same logic.
+    from indicators.atr import (
+        _trailing_stop_kernel,
+        _trailing_stop_python,
+        _ut_position_kernel,
+        _ut_position_python,
+        atr,
+    )
+
+    rng = np.random.default_rng(11)
+    data = _make_ohlc(300, base=100, trend=-0.03)
+    data["close_price"] += rng.normal(0, 2.0, len(data)).cumsum()
+    data["high_price"] = data["close_price"] + 1.0
+    data["low_price"] = data["close_price"] - 1.0
+    close = data["close_price"]
+    atr_values = atr(data, window=14)
+    expected_stop = _reference_trailing_stop(close, atr_values, multiplier)
+    expected_pos = _reference_ut_position(close, expected_stop)
+    closes = close.to_numpy(dtype=np.float64)
+    atrs = atr_values.to_numpy(dtype=np.float64)
+
+    for trailing_stop, ut_position in (
+        (_trailing_stop_kernel, _ut_position_kernel),
+        (_trailing_stop_python, _ut_position_python),
+    ):
+        stop = trailing_stop(closes, atrs, multiplier)
+        np.testing.assert_array_equal(stop, expected_stop.to_numpy())
+        np.testing.assert_array_equal(ut_position(closes, stop), expected_pos)
+
+
+def test_atr_trend_snapshot_with_indicator_stream_matches_batch():
+    from indicators.streaming import IndicatorStream
+
+    rng = np.random.default_rng(11)
+    close = 100 + rng.normal(0, 1, 300).cumsum()
+    data = pd.DataFrame(
+        {
+            "close_price": close,
+            "high_price": close + 1.0,
+            "low_price": close - 1.0,
+        }
+    )
+    batch = get_atr_trend_snapshot(data, atr_period=14, atr_multiplier=2.5, trend_sma_period=50)
+    streamed = get_atr_trend_snapshot(
+        data,
+        atr_period=14,
+        atr_multiplier=2.5,
+        trend_sma_period=50,
+        indicators=IndicatorStream().sync(data),
+    )
+    assert streamed == batch
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from backtests_results import diff_runs
+from persistence.backtest_results import (
+    BacktestResultStore,
+    cached_backtest,
+    code_version,
+    data_range,
+    pack_equity,
+    unpack_equity,
+)
+from services.candle_frame import CandleFrame
+from strategies.moving_average import getMovingAverageTradeStrategy
+
+EPOCH = 1_735_689_600_000
+
+
+def _candles(n=300, drift=0.0) -> CandleFrame:
+    i = np.arange(n)
+    close = 100 + 8 * np.sin(i / 15) + drift * i
+    values = np.stack([close, close, close + 1, close - 1, np.full(n, 50.0)])
+    return CandleFrame(values, EPOCH + i * 3_600_000)
+
+
+def _run(store, candles, **params):
+    return cached_backtest(
+        store,
+        strategy_name="moving_average",
+        strategy_function=getMovingAverageTradeStrategy,
+        candles=candles,
+        params={"fast_window": 7, "slow_window": 40, **params},
+        symbol="BTCUSDT",
+        interval="1h",
+        version="v1",
+        periods=300,
+    )
+
+
+def test_identical_inputs_hit_the_cache(tmp_path):
+    store = BacktestResultStore(tmp_path / "runs.db")
+    candles = _candles()
+
+    first, hit_first = _run(store, candles)
+    second, hit_second = _run(store, candles)
+
+    assert (hit_first, hit_second) == (False, True)
+    assert second["profit_percentage"] == first["profit_percentage"]
+    assert second["trades"] == first["trades"]
+    assert second["equity_curve"] == pytest.approx(first["equity_curve"], rel=1e-6)
+    assert store.count() == 1
+
+
+def test_params_data_and_code_version_change_the_key(tmp_path):
+    store = BacktestResultStore(tmp_path / "runs.db")
+    candles = _candles()
+    _run(store, candles)
+
+    assert _run(store, candles, fast_window=9)[1] is False
+    assert _run(store, _candles(drift=0.01))[1] is False
+    assert cached_backtest(
+        store,
+        strategy_name="moving_average",
+        strategy_function=getMovingAverageTradeStrategy,
+        candles=candles,
+        params={"fast_window": 7, "slow_window": 40},
+        symbol="BTCUSDT",
+        interval="1h",
+        version="v2",
+        periods=300,
+    )[1] is False
+    assert store.count() == 4
+
+
+def test_rankings_and_prefix_lookup(tmp_path):
+    store = BacktestResultStore(tmp_path / "runs.db")
+    candles = _candles()
+    for fast in (5, 7, 9, 11):
+        _run(store, candles, fast_window=fast)
+
+    by_profit = store.top("profit")
+    by_drawdown = store.top("drawdown", limit=2)
+    profits = [run.metrics["profit_percentage"] for run in by_profit]
+    assert profits == sorted(profits, reverse=True)
+    assert len(by_drawdown) == 2
+    assert by_drawdown[0].metrics["max_drawdown_pct"] <= by_drawdown[1].metrics["max_drawdown_pct"]
+    assert by_profit[0].equity_blob is None
+
+    best = store.get(by_profit[0].run_key[:12])
+    assert best.run_key == by_profit[0].run_key
+    assert len(best.equity_curve) > 0
+    assert store.get("zz") is None
+    with pytest.raises(ValueError):
+        store.top("calmar")
+
+
+def test_diff_lists_changed_params_and_metric_deltas(tmp_path):
+    store = BacktestResultStore(tmp_path / "runs.db")
+    candles = _candles()
+    _run(store, candles, fast_window=5)
+    _run(store, candles, fast_window=9)
+    a, b = (store.get(run.run_key) for run in store.top("profit"))
+
+    lines = diff_runs(a, b)
+
+    assert any(line.startswith("fast_window") for line in lines)
+    assert not any(line.startswith("slow_window") for line in lines)
+    assert any(line.startswith("profit_percentage") for line in lines)
+    assert lines[-1].startswith("equity max gap")
+
+
+def test_equity_blob_is_float32():
+    curve = [1000.0, 1001.5, 999.25]
+
+    blob = pack_equity(curve)
+
+    assert len(blob) == 4 * len(curve)
+    assert unpack_equity(blob).tolist() == curve
+
+
+def test_data_range_and_code_version_are_stable():
+    candles = _candles()
+
+    assert data_range(candles) == data_range(_candles())
+    assert data_range(candles)["start"] == EPOCH
+    assert data_range(candles)["candles"] == 300
+    assert code_version() == code_version()
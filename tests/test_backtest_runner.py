@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.atr_trend import atr_trend_signal_series, getAtrTrendStrategy
+from strategies.moving_average import getMovingAverageTradeStrategy
+from tests.backtestRunner import backtestRunner
+
+
+def _make_ohlc(n: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.5, n))
+    return pd.DataFrame(
+        {
+            "close_price": close,
+            "open_price": close - 0.3,
+            "high_price": close + rng.uniform(0.2, 2.0, n),
+            "low_price": close - rng.uniform(0.2, 2.0, n),
+            "volume": rng.uniform(100, 1000, n),
+            "open_time": pd.date_range("2024-01-01", periods=n, freq="4h"),
+        }
+    )
+
+
+def _without_series(strategy):
+    def prefix_only(stock_data, **kwargs):
+        return strategy(stock_data, **kwargs)
+
+    prefix_only.__name__ = strategy.__name__
+    return prefix_only
+
+
+@pytest.mark.parametrize(
+    "strategy, kwargs",
+    [
+        (getAtrTrendStrategy, {"atr_period": 14, "atr_multiplier": 2.5, "trend_sma_period": 50}),
+        (getAtrTrendStrategy, {"atr_period": 10, "atr_multiplier": 1.5, "trend_sma_period": 20}),
+        (getMovingAverageTradeStrategy, {"fast_window": 7, "slow_window": 25}),
+    ],
+)
+def test_signal_series_matches_prefix_loop(strategy, kwargs):
+    data = _make_ohlc(400)
+
+    fast = backtestRunner(data, strategy, periods=400, verbose=False, **kwargs)
+    slow = backtestRunner(data, _without_series(strategy), periods=400, verbose=False, **kwargs)
+
+    assert fast["trades"] > 0
+    assert fast == slow
+
+
+def test_atr_signal_series_matches_each_prefix():
+    data = _make_ohlc(120)
+    kwargs = {"atr_period": 10, "atr_multiplier": 2.0, "trend_sma_period": 20}
+
+    signals = atr_trend_signal_series(data, **kwargs)
+
+    for i in range(len(data)):
+        expected = getAtrTrendStrategy(data.iloc[: i + 1], verbose=False, **kwargs)
+        got = None if np.isnan(signals[i]) else bool(signals[i])
+        assert got == expected, i
+
+
+def test_signal_series_declines_rows_the_strategy_would_drop():
+    data = _make_ohlc(120)
+    data.loc[50, "close_price"] = np.nan
+
+    assert atr_trend_signal_series(data) is None
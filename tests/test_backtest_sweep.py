@@ -0,0 +1,122 @@
+import csv
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.sweep import MappedCandles, SweepSpec, completed_keys, param_key, run_sweep
+from services.candle_frame import CandleFrame
+from strategies.atr_trend import getAtrTrendStrategy
+from tests.backtestRunner import backtestRunner
+
+
+def _candles(n: int = 300) -> CandleFrame:
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1.5, n))
+    frame = pd.DataFrame(
+        {
+            "close_price": close,
+            "open_time": pd.date_range("2024-01-01", periods=n, freq="4h", tz="UTC"),
+            "open_price": close - 0.3,
+            "high_price": close + 1.0,
+            "low_price": close - 1.0,
+            "volume": rng.uniform(100, 1000, n),
+        }
+    )
+    return CandleFrame.from_frame(frame)
+
+
+def _spec() -> SweepSpec:
+    return SweepSpec(
+        strategy="atr_trend",
+        grid={"atr_multiplier": [1.5, 2.5], "trend_sma_period": [20, 50]},
+        fixed={"atr_period": 10},
+        periods=300,
+    )
+
+
+def _rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_spec_from_yaml_expands_grid(tmp_path):
+    config = tmp_path / "sweep.yaml"
+    config.write_text(
+        "strategy: atr_trend\ngrid:\n  atr_period: [10, 14]\n  atr_multiplier: 2.0\n",
+        encoding="utf-8",
+    )
+
+    spec = SweepSpec.from_yaml(config)
+
+    assert spec.combinations() == [
+        {"atr_multiplier": 2.0, "atr_period": 10},
+        {"atr_multiplier": 2.0, "atr_period": 14},
+    ]
+
+
+def test_spec_rejects_unknown_strategy(tmp_path):
+    config = tmp_path / "sweep.yaml"
+    config.write_text("strategy: nope\ngrid:\n  a: [1]\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        SweepSpec.from_yaml(config)
+
+
+def test_mapped_candles_round_trip():
+    candles = _candles(50)
+
+    with MappedCandles(candles) as mapped:
+        loaded = MappedCandles.load(mapped.path)
+        assert np.array_equal(loaded.close, candles.close)
+        assert np.array_equal(loaded.open_time, candles.open_time)
+
+
+def test_sweep_matches_direct_backtests(tmp_path):
+    out = tmp_path / "sweep.csv"
+    candles = _candles()
+
+    ran = run_sweep(_spec(), candles, out, max_workers=2)
+
+    rows = {row["key"]: row for row in _rows(out)}
+    assert ran == 4 and len(rows) == 4
+    params = {"atr_multiplier": 2.5, "trend_sma_period": 50}
+    expected = backtestRunner(
+        candles.to_frame(), getAtrTrendStrategy, periods=300, verbose=False, atr_period=10, **params
+    )
+    row = rows[param_key(params)]
+    assert int(row["trades"]) == expected["trades"]
+    assert float(row["final_balance"]) == pytest.approx(expected["final_balance"])
+
+
+def test_sweep_resumes_after_torn_write(tmp_path):
+    out = tmp_path / "sweep.csv"
+    candles = _candles()
+    run_sweep(_spec(), candles, out, max_workers=1)
+    lines = out.read_text(encoding="utf-8").splitlines(keepends=True)
+    # Keep the header and two rows, then half of a third one.
+    out.write_text("".join(lines[:3]) + lines[3][:10], encoding="utf-8")
+
+    assert len(completed_keys(out)) == 2
+    assert run_sweep(_spec(), candles, out, max_workers=1) == 2
+    assert len(_rows(out)) == 4
+    assert run_sweep(_spec(), candles, out, max_workers=1) == 0
+
+
+def test_sweep_refuses_to_resume_under_other_inputs(tmp_path):
+    out = tmp_path / "sweep.csv"
+    candles = _candles()
+    run_sweep(_spec(), candles, out, max_workers=1)
+    changed_fixed = _spec()
+    changed_fixed.fixed = {"atr_period": 14}
+    changed_fees = _spec()
+    changed_fees.fee_rate = 0.002
+
+    with pytest.raises(ValueError, match="fixed"):
+        run_sweep(changed_fixed, candles, out, max_workers=1)
+    with pytest.raises(ValueError, match="fee_rate"):
+        run_sweep(changed_fees, candles, out, max_workers=1)
+    with pytest.raises(ValueError, match="data"):
+        run_sweep(_spec(), _candles(280), out, max_workers=1)
+    assert len(_rows(out)) == 4
+    assert run_sweep(_spec(), candles, out, max_workers=1) == 0
@@ -0,0 +1,62 @@
+import sys
+
+import pytest
+
+from benchmarks.fixtures import synthetic_candles, synthetic_klines, synthetic_orders
+from benchmarks.run_benchmarks import compare, main, measure
+
+
+def _report(**results):
+    return {
+        "results": {
+            key: {"ops_per_sec": ops, "peak_mib": mib} for key, (ops, mib) in results.items()
+        }
+    }
+
+
+def test_compare_flags_slowdowns_and_memory_growth_beyond_threshold():
+    baseline = _report(**{"a@1000": (100.0, 1.0), "b@1000": (100.0, 1.0), "c@1000": (100.0, 1.0)})
+    current = _report(**{"a@1000": (80.0, 1.2), "b@1000": (70.0, 1.0), "c@1000": (100.0, 1.5)})
+
+    regressions = compare(current, baseline, threshold=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("b@1000") and "ops/s" in regressions[0]
+    assert regressions[1].startswith("c@1000") and "MiB" in regressions[1]
+
+
+def test_compare_ignores_cases_missing_from_the_baseline():
+    current = _report(**{"new@1000": (1.0, 50.0)})
+
+    assert compare(current, _report(), threshold=0.1) == []
+    assert compare(current, {}, threshold=0.1) == []
+
+
+def test_measure_reports_throughput_and_peak_memory():
+    result = measure(lambda: bytearray(2**20), bars=10, repeat=1)
+
+    assert result["ops_per_sec"] > 0
+    assert result["bars_per_sec"] == pytest.approx(result["ops_per_sec"] * 10)
+    assert result["peak_mib"] >= 1.0
+
+
+def test_fixtures_are_reproducible():
+    assert synthetic_klines(50) == synthetic_klines(50)
+    assert synthetic_klines(50, seed=1) != synthetic_klines(50)
+    candles = synthetic_candles(100)
+    orders = synthetic_orders(candles, every=10)
+    assert len(candles) == 100
+    assert [order["side"] for order in orders[:3]] == ["BUY", "SELL", "BUY"]
+
+
+def test_main_fails_without_a_baseline(tmp_path, monkeypatch):
+    base_args = ["run_benchmarks.py", "--sizes", "50", "--cases", "normalize_klines", "--repeat", "1"]
+    baseline = tmp_path / "baseline.json"
+    out = ["--out", str(tmp_path / "out.json"), "--baseline", str(baseline)]
+
+    monkeypatch.setattr(sys, "argv", base_args + out)
+    assert main() == 1
+
+    monkeypatch.setattr(sys, "argv", base_args + out + ["--update-baseline"])
+    assert main() == 0
+    assert baseline.exists()
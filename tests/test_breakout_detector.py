@@ -56,3 +56,14 @@ def test_can_reenter_grid_respects_cooldown(detector):
     assert detector.can_reenter_grid(adx_value=18, cooldown_remaining=2) is False
     assert detector.can_reenter_grid(adx_value=18, cooldown_remaining=0) is True
     assert detector.can_reenter_grid(adx_value=30, cooldown_remaining=0) is False
+
+
+def test_breakout_with_indicator_stream_matches_batch(detector):
+    from indicators.streaming import IndicatorStream
+
+    data = _make_breakout_data()
+    stream = IndicatorStream().sync(data)
+    batch = detector.evaluate(data, breakout_price=67000)
+    streamed = detector.evaluate(data, breakout_price=67000, indicators=stream)
+    assert streamed.confirmed == batch.confirmed
+    assert streamed.signals == pytest.approx(batch.signals)
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.replay import ReplayMarketData
+from services.candle_frame import CandleFrame
+
+HOUR_MS = 3_600_000
+
+
+def _kline(open_ms: int, close: float) -> list:
+    return [
+        open_ms,
+        str(close - 0.5),
+        str(close + 1),
+        str(close - 1),
+        str(close),
+        "10.5",
+        open_ms + HOUR_MS - 1,
+        "1000.0",
+        5,
+        "5.0",
+        "500.0",
+        "0",
+    ]
+
+
+def test_from_klines_parses_once_into_float64_columns():
+    candles = CandleFrame.from_klines([_kline(i * HOUR_MS, 100.0 + i) for i in range(4)])
+
+    assert len(candles) == 4
+    assert candles.close.dtype == np.float64
+    assert candles.open_time.dtype == np.int64
+    assert list(candles.close) == [100.0, 101.0, 102.0, 103.0]
+    assert list(candles.open) == [99.5, 100.5, 101.5, 102.5]
+    with pytest.raises(ValueError):
+        candles.close[0] = 1.0
+
+
+def test_to_frame_keeps_legacy_layout_and_shares_buffers():
+    candles = CandleFrame.from_klines([_kline(i * HOUR_MS, 100.0 + i) for i in range(4)])
+    frame = candles.to_frame()
+
+    assert list(frame.columns) == [
+        "close_price",
+        "open_time",
+        "open_price",
+        "high_price",
+        "low_price",
+        "volume",
+    ]
+    assert str(frame["open_time"].dt.tz) == "America/Sao_Paulo"
+    assert frame["open_time"].iloc[1] == pd.Timestamp(HOUR_MS, unit="ms", tz="UTC")
+    assert np.shares_memory(frame["close_price"].to_numpy(), candles.close)
+    assert candles.to_frame() is frame
+
+    window = candles[1:3].to_frame()
+    assert list(window.index) == [0, 1]
+    assert np.shares_memory(window["volume"].to_numpy(), candles.volume)
+
+
+def test_append_replaces_forming_candle_and_trims():
+    candles = CandleFrame.from_klines([_kline(i * HOUR_MS, 100.0 + i) for i in range(5)])
+    fresh = CandleFrame.from_klines([_kline(4 * HOUR_MS, 200.0), _kline(5 * HOUR_MS, 201.0)])
+
+    merged = candles.append(fresh, limit=5)
+
+    assert list(merged.open_time // HOUR_MS) == [1, 2, 3, 4, 5]
+    assert list(merged.close) == [101.0, 102.0, 103.0, 200.0, 201.0]
+    assert list(candles.close)[-1] == 104.0
+
+
+def test_from_frame_round_trips_open_time():
+    candles = CandleFrame.from_klines([_kline(i * HOUR_MS, 100.0 + i) for i in range(3)])
+    rebuilt = CandleFrame.from_frame(candles.to_frame())
+    assert np.array_equal(rebuilt.open_time, candles.open_time)
+    assert np.array_equal(rebuilt.close, candles.close)
+
+
+def test_replay_market_data_serves_views():
+    frame = pd.DataFrame(
+        {
+            "close_price": [1.0, 2.0, 3.0],
+            "open_price": [1.0, 2.0, 3.0],
+            "high_price": [1.5, 2.5, 3.5],
+            "low_price": [0.5, 1.5, 2.5],
+            "volume": [10.0, 20.0, 30.0],
+        }
+    )
+    market = ReplayMarketData(frame, end_index=2)
+    first = market.fetch_klines()
+    market.end_index = 3
+    second = market.fetch_klines()
+
+    assert list(first["close_price"]) == [1.0, 2.0]
+    assert list(second["close_price"]) == [1.0, 2.0, 3.0]
+    assert np.shares_memory(first["close_price"].to_numpy(), second["close_price"].to_numpy())
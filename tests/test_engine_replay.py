@@ -1,7 +1,16 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from backtest.replay import build_replay_engine
+from backtest.replay import ReplayMarketData, build_replay_engine, replay_history
 from persistence.state_store import StateStore
 
 
@@ -43,6 +52,28 @@ def test_replay_pauses_in_gray_with_short_history(tmp_path):
     assert engine._last_strategy_decision is None
 
 
+def test_execute_flushes_coalesced_state_even_when_the_cycle_fails(tmp_path):
+    store = StateStore(tmp_path / "replay.db")
+    bot, engine = build_replay_engine(_ohlc(10), store=store)
+    engine.bootstrap()
+    reader = StateStore(tmp_path / "replay.db")
+    writes = []
+
+    def failing_cycle():
+        engine.state.take_profit_index = 2
+        engine._save_state()
+        engine._save_state()
+        writes.append(reader.load_state(bot.operation_code).take_profit_index)
+        raise RuntimeError("exchange down")
+
+    engine._execute_cycle = failing_cycle
+    with pytest.raises(RuntimeError):
+        engine.execute()
+
+    assert writes == [0]
+    assert reader.load_state(bot.operation_code).take_profit_index == 2
+
+
 def test_replay_stop_loss_sells_before_strategy(tmp_path):
     store = StateStore(tmp_path / "replay.db")
     data = _ohlc(5, last_price=90.0, prev_price=90.0)
@@ -104,3 +135,162 @@ def test_replay_bot_fields_are_engine_state(tmp_path):
     assert loaded.last_buy_price == pytest.approx(123.45)
     assert loaded.last_trade_decision is True
     assert loaded.take_profit_index == 2
+
+
+def _hourly(n: int) -> pd.DataFrame:
+    frame = _ohlc(n, last_price=100.0, prev_price=100.0)
+    frame.insert(1, "open_time", pd.date_range("2024-01-01", periods=n, freq="1h", tz="UTC"))
+    return frame
+
+
+def _flip(stock_data, **_kwargs):
+    return len(stock_data) % 2 == 0
+
+
+def test_replay_market_data_serves_limit_window_views():
+    frame = _hourly(10)
+    market = ReplayMarketData(frame, end_index=6)
+
+    window = market.fetch_klines(limit=3)
+
+    assert window["close_price"].tolist() == frame["close_price"].iloc[3:6].tolist()
+    assert list(window.index) == [0, 1, 2]
+    assert np.shares_memory(
+        window["close_price"].to_numpy(), market.fetch_klines(limit=6)["close_price"].to_numpy()
+    )
+
+
+def test_replay_history_records_equity_and_trades_quietly(capsys):
+    frame = _hourly(30)
+
+    result = replay_history(frame, warmup=5, main_strategy=_flip)
+
+    assert capsys.readouterr().out == ""
+    assert len(result.equity_curve) == 26
+    assert [t["side"] for t in result.trades[:2]] == ["BUY", "SELL"]
+    assert result.trades[0]["time"].startswith("2024-01-01T")
+    assert {o["kind"] for o in result.outcomes} == {"sell"}
+    assert result.final_equity == pytest.approx(result.equity_curve[-1])
+
+
+def test_quiet_replay_only_silences_its_own_thread(caplog, capsys):
+    frame = _hourly(12)
+    seen = []
+
+    def strategy(stock_data, **kwargs):
+        if not seen:
+            def other():
+                logging.warning("dashboard request")
+                print("dashboard output")
+
+            worker = threading.Thread(target=other)
+            worker.start()
+            worker.join()
+            logging.warning("replay cycle")
+        seen.append(len(stock_data))
+        return _flip(stock_data, **kwargs)
+
+    with caplog.at_level(logging.INFO):
+        replay_history(frame, warmup=5, main_strategy=strategy)
+        logging.warning("after replay")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert "dashboard request" in messages and "after replay" in messages
+    assert "replay cycle" not in messages
+    assert capsys.readouterr().out == "dashboard output\n"
+
+
+_BLOCKED_REPLAY = """
+import pandas as pd
+from backtest.replay import replay_history
+
+n = 60
+frame = pd.DataFrame({
+    "open_time": pd.date_range("2024-01-01", periods=n, freq="1h", tz="UTC"),
+    "close_price": [100.0] * n,
+    "open_price": [100.0] * n,
+    "high_price": [101.0] * n,
+    "low_price": [99.0] * n,
+    "volume": [1000.0] * n,
+})
+# 1 USDT cannot buy a step: every cycle logs "Order blocked".
+replay_history(frame, warmup=5, quote_balance=1.0, main_strategy=lambda stock_data, **kw: True)
+"""
+
+
+def test_quiet_replay_writes_nothing_without_configured_logging():
+    # A fresh interpreter: no handlers yet, so the first warning runs basicConfig.
+    root = Path(__file__).resolve().parents[1]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(root / "src"), str(root)]))
+    done = subprocess.run(
+        [sys.executable, "-c", _BLOCKED_REPLAY],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+
+    assert done.returncode == 0, done.stderr
+    assert done.stderr == ""
+    assert done.stdout == ""
+
+
+def test_replay_history_window_and_outcomes_order(tmp_path):
+    frame = _hourly(30)
+    store = StateStore(tmp_path / "replay.db")
+    store.record_outcome(
+        {"kind": "sell", "operation_code": "OLD", "pnl_usd": 1.0, "occurred_at": "2020-01-01T00:00:00+00:00"}
+    )
+    seen = []
+
+    def strategy(stock_data, **kwargs):
+        seen.append(len(stock_data))
+        return len(seen) % 2 == 1
+
+    result = replay_history(frame, warmup=5, window=8, store=store, main_strategy=strategy)
+
+    assert max(seen) == 8
+    times = [o["occurred_at"] for o in result.outcomes]
+    assert times == sorted(times) and len(times) > 1
+    assert all(o["operation_code"] != "OLD" for o in result.outcomes)
+
+
+def test_replay_history_daily_limits_follow_candle_time():
+    frame = _hourly(72)
+
+    result = replay_history(frame, warmup=5, main_strategy=_flip, max_trades_per_day=2)
+
+    per_day = Counter(t["time"][:10] for t in result.trades)
+    assert set(per_day) == {"2024-01-01", "2024-01-02", "2024-01-03"}
+    assert max(per_day.values()) <= 2
+
+
+def test_shared_order_lock_refreshes_quote_balance_before_buy(tmp_path):
+    data = pd.DataFrame(
+        {
+            "close_price": [100.0] * 5,
+            "open_price": [100.0] * 5,
+            "high_price": [101.0] * 5,
+            "low_price": [99.0] * 5,
+            "volume": [1000.0] * 5,
+        }
+    )
+    bot, engine = build_replay_engine(data, store=StateStore(tmp_path / "lock.db"))
+    engine.bootstrap()
+    lock = threading.Lock()
+    engine.order_lock = lock
+    seen = []
+    original = bot.getUpdatedAccountData
+
+    def refreshed():
+        seen.append(lock.locked())
+        return original()
+
+    bot.getUpdatedAccountData = refreshed
+    bot.quote_balance = 500.0
+
+    order = engine._place_buy()
+
+    assert seen == [True]
+    assert order["side"] == "BUY"
+    assert float(order["executedQty"]) * 99.8 <= 500.0
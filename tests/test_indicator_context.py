@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicators.context as context_module
+from backtest.replay import build_replay_engine
+from indicators.adx import adx
+from indicators.atr import atr
+from indicators.context import IndicatorContext
+from indicators.rsi import rsi
+from persistence.state_store import StateStore
+
+
+def _ohlc(n: int, seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    return pd.DataFrame(
+        {
+            "close_price": [str(value) for value in close],
+            "open_price": close - 0.2,
+            "high_price": close + 1.0,
+            "low_price": close - 1.0,
+            "volume": rng.uniform(500, 1500, n),
+        }
+    )
+
+
+def test_context_values_match_batch_indicators():
+    data = _ohlc(120)
+    numeric = data.astype(float)
+    context = IndicatorContext(data)
+
+    assert context.adx(14).value == pytest.approx(float(adx(numeric, period=14).iloc[-1]))
+    assert context.rsi(14).value == pytest.approx(rsi(numeric["close_price"], 14, True))
+    assert context.atr(14).tail(2) == pytest.approx(atr(numeric, window=14).iloc[-2:].tolist())
+    assert context.sma(20, column="volume").value == pytest.approx(
+        numeric["volume"].iloc[-20:].mean()
+    )
+
+
+def test_context_computes_each_series_once(monkeypatch):
+    calls = []
+    original = context_module.adx
+    monkeypatch.setattr(
+        context_module, "adx", lambda *a, **k: calls.append(1) or original(*a, **k)
+    )
+    context = IndicatorContext(_ohlc(80))
+
+    first = context.adx(14)
+    assert context.adx(14) is first
+    context.adx(10)
+    assert len(calls) == 2
+
+    trailing = context.trailing_stop(14, 2.5)
+    assert trailing.atr is context.atr(14)
+    assert context.trailing_stop(14, 2.5) is trailing
+
+
+def test_engine_shares_one_context_per_cycle(tmp_path, monkeypatch):
+    calls = []
+    original = context_module.adx
+    monkeypatch.setattr(
+        context_module, "adx", lambda *a, **k: calls.append(1) or original(*a, **k)
+    )
+    data = _ohlc(120).astype(float)
+    _bot, engine = build_replay_engine(
+        data,
+        store=StateStore(tmp_path / "replay.db"),
+        regime_enabled=True,
+        main_strategy=lambda **_k: None,
+    )
+    engine.bootstrap()
+    engine.execute()
+
+    context = engine.indicators
+    assert context is engine.indicators
+    assert len(calls) == 1
+
+    engine.update_all_data()
+    assert engine.indicators is not context
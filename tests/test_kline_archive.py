@@ -0,0 +1,104 @@
+import zipfile
+
+import numpy as np
+import pytest
+
+from persistence.kline_archive import KlineArchive, import_binance_dumps, read_binance_dump
+from services.archive_market_data import ArchiveMarketData
+from services.candle_frame import CandleFrame
+
+HOUR_MS = 3_600_000
+EPOCH = 1_735_689_600_000  # 2025-01-01 UTC
+
+
+def _klines(start: int, count: int) -> list[list]:
+    rows = []
+    for i in range(start, start + count):
+        price = 100.0 + i
+        open_time = EPOCH + i * HOUR_MS
+        rows.append(
+            [open_time, str(price - 0.5), str(price + 1), str(price - 1), str(price), "10.0",
+             open_time + HOUR_MS - 1, "0", 1, "0", "0", "0"]
+        )
+    return rows
+
+
+def _dump_line(row, time_scale: int = 1) -> str:
+    fields = [row[0] * time_scale, *row[1:6], row[6] * time_scale, *row[7:]]
+    return ",".join(str(value) for value in fields)
+
+
+def test_append_skips_rows_already_archived(tmp_path):
+    archive = KlineArchive("btcusdt", "1h", root=tmp_path)
+
+    assert archive.append(CandleFrame.from_klines(_klines(0, 5))) == 5
+    assert archive.append(CandleFrame.from_klines(_klines(3, 4))) == 2
+
+    candles = archive.read()
+    assert len(archive) == 7
+    assert candles.open_time.tolist() == [EPOCH + i * HOUR_MS for i in range(7)]
+    assert candles.close.tolist() == [100.0, 101.0, 102.0, 103.0, 104.0, 105.0, 106.0]
+
+
+def test_read_range_and_frame(tmp_path):
+    archive = KlineArchive("BTCUSDT", "1h", root=tmp_path)
+    archive.append(CandleFrame.from_klines(_klines(0, 10)))
+
+    window = archive.read(start=EPOCH + 2 * HOUR_MS, end=EPOCH + 5 * HOUR_MS)
+
+    assert window.close.tolist() == [102.0, 103.0, 104.0]
+    frame = window.to_frame()
+    assert frame["high_price"].tolist() == [103.0, 104.0, 105.0]
+    assert str(frame["open_time"].dt.tz) == "America/Sao_Paulo"
+
+
+def test_torn_append_is_ignored_and_repaired(tmp_path):
+    archive = KlineArchive("BTCUSDT", "1h", root=tmp_path)
+    archive.append(CandleFrame.from_klines(_klines(0, 3)))
+    # Simulate a crash after the prices were written but before open_time.
+    with open(archive.path / "prices.f64", "ab") as f:
+        f.write(np.zeros(5, dtype="<f8").tobytes())
+
+    assert len(archive) == 3
+    assert archive.append(CandleFrame.from_klines(_klines(3, 1))) == 1
+    assert archive.read().close.tolist() == [100.0, 101.0, 102.0, 103.0]
+
+
+def test_read_binance_dump_zip_with_microseconds(tmp_path):
+    rows = _klines(0, 3)
+    path = tmp_path / "BTCUSDT-1h-2025-01.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "BTCUSDT-1h-2025-01.csv",
+            "\n".join(_dump_line(row, time_scale=1000) for row in rows) + "\n",
+        )
+
+    candles = read_binance_dump(path)
+
+    assert candles.open_time.tolist() == [EPOCH, EPOCH + HOUR_MS, EPOCH + 2 * HOUR_MS]
+    assert candles.volume.tolist() == [10.0, 10.0, 10.0]
+
+
+def test_import_dumps_in_chronological_order(tmp_path):
+    header = "open_time,open,high,low,close,volume,close_time,quote_volume,count,tb_base,tb_quote,ignore\n"
+    late = tmp_path / "late.csv"
+    early = tmp_path / "early.csv"
+    late.write_text(header + "\n".join(_dump_line(r) for r in _klines(5, 5)) + "\n")
+    early.write_text("\n".join(_dump_line(r) for r in _klines(0, 6)) + "\n")
+    archive = KlineArchive("BTCUSDT", "1h", root=tmp_path / "klines")
+
+    assert import_binance_dumps(archive, [late, early]) == 10
+    assert archive.read().close.tolist() == [100.0 + i for i in range(10)]
+
+
+def test_archive_market_data_serves_tail_before_end_time(tmp_path):
+    archive = KlineArchive("BTCUSDT", "1h", root=tmp_path)
+    archive.append(CandleFrame.from_klines(_klines(0, 20)))
+    market = ArchiveMarketData(archive, end_time=EPOCH + 10 * HOUR_MS, filters={"step_size": 0.001})
+
+    frame = market.fetch_klines(limit=4)
+
+    assert frame["close_price"].tolist() == [106.0, 107.0, 108.0, 109.0]
+    assert market.get_symbol_filters() == {"step_size": 0.001}
+    with pytest.raises(ValueError):
+        ArchiveMarketData(archive).get_symbol_filters()
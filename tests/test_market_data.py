@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+
+from services.market_data import MarketDataService
+
+HOUR_MS = 3_600_000
+
+
+def _kline(open_ms: int, close: float) -> list:
+    return [
+        open_ms,
+        str(close),
+        str(close + 1),
+        str(close - 1),
+        str(close),
+        "10.0",
+        open_ms + HOUR_MS - 1,
+        "1000.0",
+        5,
+        "5.0",
+        "500.0",
+        "0",
+    ]
+
+
+def test_fetch_klines_warms_up_then_requests_only_new_candles():
+    client = MagicMock()
+    client.get_klines.side_effect = [
+        [_kline(i * HOUR_MS, 100.0 + i) for i in range(5)],
+        [_kline(4 * HOUR_MS, 200.0), _kline(5 * HOUR_MS, 201.0)],
+    ]
+    service = MarketDataService(client, "BTCUSDT", "1h")
+
+    first = service.fetch_klines(limit=5)
+    second = service.fetch_klines(limit=5)
+
+    assert len(first) == 5
+    assert client.get_klines.call_args_list[1].kwargs["startTime"] == 4 * HOUR_MS
+    assert len(second) == 5
+    assert list(second["close_price"]) == [101.0, 102.0, 103.0, 200.0, 201.0]
+    assert second["open_time"].is_monotonic_increasing
+    assert list(first["close_price"])[-1] == 104.0
+
+
+def test_fetch_klines_keeps_window_when_nothing_new():
+    client = MagicMock()
+    client.get_klines.side_effect = [
+        [_kline(i * HOUR_MS, 100.0 + i) for i in range(3)],
+        [],
+    ]
+    service = MarketDataService(client, "BTCUSDT", "1h")
+    first = service.fetch_klines(limit=3)
+    assert service.fetch_klines(limit=3) is first
+
+
+def test_fetch_klines_rewarms_after_long_gap_or_invalidate():
+    client = MagicMock()
+    window = [_kline(i * HOUR_MS, 100.0 + i) for i in range(3)]
+    client.get_klines.side_effect = [
+        window,
+        [_kline((10 + i) * HOUR_MS, 300.0 + i) for i in range(3)],
+        [_kline((20 + i) * HOUR_MS, 400.0 + i) for i in range(3)],
+        window,
+    ]
+    service = MarketDataService(client, "BTCUSDT", "1h")
+    service.fetch_klines(limit=3)
+
+    rewarmed = service.fetch_klines(limit=3)
+    assert list(rewarmed["close_price"]) == [400.0, 401.0, 402.0]
+    assert "startTime" not in client.get_klines.call_args_list[2].kwargs
+
+    service.invalidate_klines()
+    service.fetch_klines(limit=3)
+    assert "startTime" not in client.get_klines.call_args_list[3].kwargs
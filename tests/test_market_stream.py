@@ -0,0 +1,173 @@
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from websockets.sync.server import serve
+
+from services.market_stream import StreamingMarketData
+
+HOUR_MS = 3_600_000
+
+
+def _kline(open_ms: int, close: float) -> list:
+    return [
+        open_ms,
+        str(close),
+        str(close + 1),
+        str(close - 1),
+        str(close),
+        "10.0",
+        open_ms + HOUR_MS - 1,
+        "1000.0",
+        5,
+        "5.0",
+        "500.0",
+        "0",
+    ]
+
+
+def _kline_event(open_ms: int, close: float) -> str:
+    return json.dumps(
+        {
+            "stream": "btcusdt@kline_1h",
+            "data": {
+                "e": "kline",
+                "s": "BTCUSDT",
+                "k": {
+                    "t": open_ms,
+                    "o": str(close),
+                    "h": str(close + 1),
+                    "l": str(close - 1),
+                    "c": str(close),
+                    "v": "10.0",
+                    "x": False,
+                },
+            },
+        }
+    )
+
+
+class StandInServer:
+    """Local websocket server playing the Binance combined stream."""
+
+    def __init__(self):
+        self.outbox: list[str] = []
+        self.paths: list[str] = []
+        self.connected = threading.Event()
+        self._drop = threading.Event()
+        self._server = serve(self._handler, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self._server.socket.getsockname()[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def _handler(self, connection):
+        self.paths.append(connection.request.path)
+        self._drop.clear()
+        self.connected.set()
+        while not self._drop.is_set():
+            while self.outbox:
+                connection.send(self.outbox.pop(0))
+            time.sleep(0.01)
+        self.connected.clear()
+
+    def drop(self):
+        self._drop.set()
+
+    def close(self):
+        self.drop()
+        self._server.shutdown()
+
+
+def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.fixture
+def server():
+    stand_in = StandInServer()
+    yield stand_in
+    stand_in.close()
+
+
+def test_stream_updates_window_without_rest_and_backfills_after_drop(server):
+    client = MagicMock()
+    client.get_klines.side_effect = [
+        [_kline(i * HOUR_MS, 100.0 + i) for i in range(5)],
+        [_kline(i * HOUR_MS, 295.0 + i) for i in range(5, 8)],
+    ]
+    prices = []
+    market = StreamingMarketData(
+        client, "BTCUSDT", "1h", ws_url=server.url, reconnect_delay=0.05
+    )
+    market.add_listener(prices.append)
+    market.start()
+    try:
+        server.connected.wait(5)
+        _wait_for(lambda: market.is_live)
+        assert server.paths[0] == "/stream?streams=btcusdt@kline_1h/btcusdt@bookTicker"
+
+        market.fetch_klines(limit=5)
+        market.fetch_klines(limit=5)
+        assert client.get_klines.call_count == 1
+
+        server.outbox.append(_kline_event(4 * HOUR_MS, 150.0))
+        server.outbox.append(_kline_event(5 * HOUR_MS, 151.0))
+        server.outbox.append(json.dumps({"u": 1, "s": "BTCUSDT", "b": "151.5", "a": "151.7"}))
+        _wait_for(lambda: market.best_ask == 151.7)
+
+        window = market.fetch_klines(limit=5)
+        assert client.get_klines.call_count == 1
+        assert list(window["close_price"]) == [101.0, 102.0, 103.0, 150.0, 151.0]
+        _wait_for(lambda: prices and prices[-1] == 151.5)
+        assert prices == sorted(prices) and set(prices) <= {150.0, 151.0, 151.5}
+
+        server.drop()
+        _wait_for(lambda: not market.is_live)
+        backfilled = market.fetch_klines(limit=5)
+        assert client.get_klines.call_args_list[1].kwargs["startTime"] == 5 * HOUR_MS
+        assert list(backfilled["close_price"]) == [103.0, 150.0, 300.0, 301.0, 302.0]
+
+        _wait_for(lambda: market.is_live)
+    finally:
+        market.stop()
+
+
+def test_slow_listener_gets_latest_price_off_the_reader_thread(server):
+    client = MagicMock()
+    client.get_klines.return_value = [_kline(i * HOUR_MS, 100.0 + i) for i in range(5)]
+    release = threading.Event()
+    calls = []
+
+    def slow_listener(price):
+        calls.append((price, threading.current_thread().name))
+        release.wait(5)
+
+    market = StreamingMarketData(
+        client, "BTCUSDT", "1h", ws_url=server.url, reconnect_delay=0.05
+    )
+    market.add_listener(slow_listener)
+    market.start()
+    try:
+        _wait_for(lambda: market.is_live)
+        market.fetch_klines(limit=5)
+        server.outbox.append(json.dumps({"u": 1, "s": "BTCUSDT", "b": "150.0", "a": "150.2"}))
+        _wait_for(lambda: calls)
+        # The listener is still busy: the reader keeps applying messages.
+        for bid in (151.0, 152.0, 153.0):
+            server.outbox.append(json.dumps({"u": 2, "s": "BTCUSDT", "b": str(bid), "a": "160.0"}))
+        server.outbox.append(_kline_event(4 * HOUR_MS, 154.0))
+        _wait_for(lambda: market.fetch_klines(limit=5)["close_price"].iloc[-1] == 154.0)
+
+        release.set()
+        _wait_for(lambda: len(calls) == 2)
+        assert [price for price, _ in calls] == [150.0, 154.0]
+        assert calls[0][1] == "market-prices-BTCUSDT"
+    finally:
+        release.set()
+        market.stop()
@@ -0,0 +1,157 @@
+import pandas as pd
+import pytest
+
+from backtest.matching import MatchingBroker
+from backtest.replay import build_replay_engine, replay_history
+from persistence.state_store import MEMORY_DB, StateStore
+from services.grid_spot import GridSpotManager
+from services.regime_detector import RegimeResult
+from services.risk_manager import RiskManager
+
+
+def _flat(n: int, price: float = 100.0) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "close_price": [price] * n,
+            "open_price": [price] * n,
+            "high_price": [price + 0.5] * n,
+            "low_price": [price - 0.5] * n,
+            "volume": [10.0] * n,
+        }
+    )
+
+
+def _setup(quote_balance=1000.0, base_balance=0.0, **broker_kwargs):
+    broker = MatchingBroker(**broker_kwargs)
+    bot, engine = build_replay_engine(
+        _flat(5),
+        store=StateStore(MEMORY_DB),
+        quote_balance=quote_balance,
+        base_balance=base_balance,
+        broker=broker,
+    )
+    broker.match(100.0, 100.5, 99.5, 100.0, 10.0)
+    return bot, engine, broker
+
+
+def test_resting_buy_fills_when_a_later_low_crosses_it():
+    bot, engine, broker = _setup(fee_rate=0.001)
+
+    order = engine.order_executor.place_limit("BUY", 1.0, 95.0)
+    assert order["status"] == "NEW"
+    assert bot.hasOpenBuyOrder()
+    assert bot.account_data["balances"][1]["locked"] == "95.0"
+
+    broker.match(99.0, 99.5, 95.5, 99.0, 10.0)
+    assert broker.open_orders and bot.base_balance == 0
+
+    broker.match(96.0, 96.5, 94.0, 95.0, 10.0)
+    assert broker.open_orders == []
+    assert bot.quote_balance == pytest.approx(905.0)
+    assert bot.base_balance == pytest.approx(0.999)
+    assert bot.last_buy_price == pytest.approx(95.0)
+    assert broker.fills[-1]["fee"] == pytest.approx(0.095)
+
+
+def test_gap_through_limit_fills_at_the_open():
+    bot, engine, broker = _setup(base_balance=1.0, fee_rate=0.0)
+
+    engine.order_executor.place_limit("SELL", 1.0, 102.0)
+    broker.match(104.0, 105.0, 103.0, 104.0, 10.0)
+
+    assert bot.quote_balance == pytest.approx(1104.0)
+    assert bot.last_sell_price == pytest.approx(104.0)
+
+
+def test_volume_participation_splits_fills_across_candles():
+    bot, engine, broker = _setup(participation=0.1, fee_rate=0.0)
+
+    engine.order_executor.place_limit("BUY", 1.5, 99.0)
+    broker.match(99.0, 99.5, 98.0, 99.0, 10.0)
+    order = broker.get_open_orders()[0]
+    assert order["status"] == "PARTIALLY_FILLED"
+    assert float(order["executedQty"]) == pytest.approx(1.0)
+
+    broker.match(99.0, 99.5, 98.0, 99.0, 10.0)
+    assert broker.open_orders == []
+    assert broker.orders[0]["status"] == "FILLED"
+    assert bot.base_balance == pytest.approx(1.5)
+
+
+def test_orders_are_rounded_and_unfunded_orders_rejected():
+    bot, engine, broker = _setup(quote_balance=50.0)
+
+    order = broker.create_order(side="BUY", type="LIMIT", quantity=0.12345, price=90.129)
+    assert (order["origQty"], order["price"]) == ("0.123", "90.12")
+
+    rejected = broker.create_order(side="BUY", type="LIMIT", quantity=1.0, price=90.0)
+    assert rejected["status"] == "REJECTED"
+
+    bot.cancelAllOrders()
+    assert broker.get_open_orders() == []
+    assert broker.orders[0]["status"] == "CANCELED"
+
+
+def test_marketable_limit_fills_at_mark_price():
+    bot, engine, broker = _setup(fee_rate=0.0)
+
+    order = broker.create_order(side="BUY", type="LIMIT", quantity=1.0, price=101.0)
+
+    assert order["status"] == "FILLED"
+    assert bot.quote_balance == pytest.approx(900.0)
+
+
+def test_grid_orders_rest_and_fill_against_candles():
+    bot, engine, broker = _setup(fee_rate=0.0)
+    grid = GridSpotManager(levels=4, capital_pct=40.0)
+    regime = RegimeResult(
+        regime="LATERAL", score=3, support=97.0, resistance=103.0, channel_width_pct=6.0
+    )
+    risk = RiskManager(
+        acceptable_loss_pct=1.0,
+        stop_loss_pct=2.0,
+        take_profit_at=[],
+        take_profit_amount=[],
+        state_store=engine.state_store,
+        operation_code=bot.operation_code,
+    )
+
+    def sync():
+        return grid.sync_grid(
+            bot=bot,
+            order_executor=engine.order_executor,
+            risk_manager=risk,
+            regime=regime,
+            operation_code=bot.operation_code,
+            quote_balance=bot.quote_balance,
+            base_balance=bot.base_balance,
+            open_orders=bot.getOpenOrders(),
+            min_notional=bot.min_notional,
+            step_size=bot.step_size,
+        )
+
+    assert sync()["placed"] == 2
+    # Levels already resting are recognised by their tick-rounded price.
+    assert sync()["placed"] == 0
+
+    broker.match(99.0, 99.5, 96.5, 98.0, 1000.0)
+    assert broker.open_orders == []
+    assert sorted(f["price"] for f in broker.fills) == [pytest.approx(97.0), pytest.approx(99.0)]
+    assert bot.base_balance > 0
+
+
+def test_replay_history_with_matching_broker_charges_fees():
+    frame = _flat(30)
+
+    result = replay_history(
+        frame,
+        warmup=5,
+        main_strategy=lambda stock_data, **_k: len(stock_data) % 2 == 0,
+        broker=MatchingBroker(fee_rate=0.001),
+        # Binance holds quantity * limit price: leave room above the sizing price.
+        traded_percentage=90.0,
+    )
+
+    assert [t["side"] for t in result.trades[:2]] == ["BUY", "SELL"]
+    assert all(t["fee"] > 0 for t in result.trades)
+    assert result.final_equity < result.initial_equity
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from backtest.monte_carlo import bootstrap_equity, monte_carlo_trades, trade_pnls
+
+
+def _trades(pnls, days):
+    return [
+        {"pnl_usd": pnl, "occurred_at": f"2025-01-{day:02d}T{i % 24:02d}:00:00+00:00"}
+        for i, (pnl, day) in enumerate(zip(pnls, days))
+    ]
+
+
+def test_shuffle_keeps_the_final_return_and_spreads_drawdown():
+    trades = _trades([50, -30, 20, -40, 60, -10], [1, 1, 2, 2, 3, 3])
+
+    result = monte_carlo_trades(trades, initial_balance=1000, n_paths=2_000, seed=1)
+
+    assert result.final_return_pct == pytest.approx(np.full(2_000, 5.0))
+    assert result.max_drawdown_pct.min() < result.max_drawdown_pct.max()
+    assert result.max_drawdown_pct.max() <= 80 / 1000 * 100 + 1e-9
+    assert result.prob_ruin == 0.0
+    assert result.prob_daily_limit is None
+
+
+def test_daily_loss_limit_uses_the_original_day_slots():
+    trades = _trades([-60, -60, 100, 100], [1, 1, 2, 2])
+
+    result = monte_carlo_trades(
+        trades, initial_balance=1000, n_paths=4_000, max_daily_loss_usdt=100, seed=3
+    )
+
+    # The limit is hit only when both losses fall on the same day: 2 of 6 orderings.
+    assert result.prob_daily_limit == pytest.approx(1 / 3, abs=0.03)
+
+
+def test_bootstrap_reaches_ruin_with_heavy_losses():
+    trades = _trades([-300, -300, 10, 10], [1, 2, 3, 4])
+
+    result = monte_carlo_trades(
+        trades, initial_balance=1000, n_paths=3_000, method="bootstrap", seed=5
+    )
+
+    # Ruin (-50%) needs at least two -300 draws in four: 1 - P(0 or 1) = 11/16.
+    assert result.prob_ruin == pytest.approx(11 / 16, abs=0.03)
+
+
+def test_results_do_not_depend_on_worker_count():
+    trades = _trades(np.linspace(-20, 25, 40), np.repeat(np.arange(1, 11), 4))
+
+    serial = monte_carlo_trades(trades, initial_balance=500, n_paths=12_000, method="bootstrap", seed=9)
+    parallel = monte_carlo_trades(
+        trades, initial_balance=500, n_paths=12_000, method="bootstrap", seed=9, max_workers=2
+    )
+
+    assert np.array_equal(serial.final_return_pct, parallel.final_return_pct)
+    assert np.array_equal(serial.max_drawdown_pct, parallel.max_drawdown_pct)
+
+
+def test_trade_pnls_skips_buys_and_sorts_by_time():
+    trades = [
+        {"side": "BUY", "pnl_usd": None, "time": 1_735_689_600_000},
+        {"side": "SELL", "pnl_usd": 5.0, "time": 1_735_776_000_000},
+        {"side": "SELL", "pnl_usd": -2.0, "time": 1_735_693_200_000},
+    ]
+
+    pnls, days = trade_pnls(trades)
+
+    assert pnls.tolist() == [-2.0, 5.0]
+    assert days.tolist() == [0, 1]
+
+
+def test_block_bootstrap_of_a_flat_curve_is_flat():
+    result = bootstrap_equity([1000.0] * 50, n_paths=500, seed=2)
+
+    assert np.allclose(result.final_return_pct, 0)
+    assert np.allclose(result.max_drawdown_pct, 0)
+    assert result.summary()["paths"] == 500
+
+
+def test_block_bootstrap_resamples_the_curve_returns():
+    equity = 1000 * np.cumprod(np.r_[1.0, np.full(30, 1.01), np.full(30, 0.99)])
+
+    result = bootstrap_equity(equity, n_paths=2_000, block_size=5, seed=4)
+
+    assert result.final_return_pct.std() > 0
+    assert result.max_drawdown_pct.max() > 0
+    with pytest.raises(ValueError):
+        monte_carlo_trades([], initial_balance=1000)
+
+
+
+def test_chunk_size_follows_path_length(monkeypatch):
+    import backtest.monte_carlo as monte_carlo
+
+    assert monte_carlo.chunk_paths(40) == monte_carlo.CHUNK_PATHS
+    assert monte_carlo.chunk_paths(50_000) == monte_carlo.CHUNK_CELLS // 50_001
+    assert monte_carlo.chunk_paths(10**9) == 1
+
+    monkeypatch.setattr(monte_carlo, "CHUNK_CELLS", 401 * 64)
+    equity = 1000 * np.cumprod(1 + np.random.default_rng(0).normal(0, 0.01, 401))
+    serial = bootstrap_equity(equity, n_paths=300, block_size=20, seed=6)
+    parallel = bootstrap_equity(equity, n_paths=300, block_size=20, seed=6, max_workers=2)
+
+    assert serial.n_paths == 300
+    assert np.array_equal(serial.final_return_pct, parallel.final_return_pct)
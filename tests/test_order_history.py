@@ -0,0 +1,125 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from backtest.replay import build_replay_engine
+from persistence.state_store import StateStore
+from services.market_data import MarketDataService
+from services.order_history import OrderHistory
+
+
+def _order(order_id: int, side: str, status: str = "FILLED", quote: float = 100.0) -> dict:
+    return {
+        "orderId": order_id,
+        "side": side,
+        "status": status,
+        "time": order_id * 1000,
+        "executedQty": "1" if status == "FILLED" else "0",
+        "cummulativeQuoteQty": str(quote) if status == "FILLED" else "0",
+    }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_buy_and_sell_share_one_request_per_cycle():
+    orders = [_order(1, "BUY", quote=90), _order(2, "SELL", quote=95), _order(3, "BUY", quote=92)]
+    client = MagicMock()
+    client.get_all_orders.return_value = orders
+    history = OrderHistory(client, "BTCUSDT", clock=FakeClock())
+
+    assert history.last_fill_price("BUY") == MarketDataService.get_last_fill_price(orders, "BUY")
+    assert history.last_fill_price("SELL") == MarketDataService.get_last_fill_price(orders, "SELL")
+    client.get_all_orders.assert_called_once_with(symbol="BTCUSDT", limit=100)
+
+
+def test_later_cycles_fetch_from_oldest_open_order_or_after_last_id():
+    clock = FakeClock()
+    client = MagicMock()
+    client.get_all_orders.side_effect = [
+        [_order(1, "BUY", quote=90), _order(2, "SELL", status="NEW")],
+        [_order(2, "SELL", quote=99), _order(3, "BUY", quote=97)],
+        [],
+    ]
+    history = OrderHistory(client, "BTCUSDT", clock=clock)
+    assert history.last_fill_prices() == {"BUY": 90.0, "SELL": 0.0}
+
+    clock.now = 60
+    assert history.last_fill_prices() == {"BUY": 97.0, "SELL": 99.0}
+    assert client.get_all_orders.call_args.kwargs == {
+        "symbol": "BTCUSDT",
+        "orderId": 2,
+        "limit": 100,
+    }
+
+    clock.now = 120
+    history.last_fill_prices()
+    assert client.get_all_orders.call_args.kwargs["orderId"] == 4
+    assert [order["orderId"] for order in history.orders()] == [1, 2, 3]
+
+
+def test_pages_until_short_page_and_keeps_window():
+    clock = FakeClock()
+    client = MagicMock()
+    client.get_all_orders.side_effect = [
+        [_order(1, "BUY"), _order(2, "BUY")],
+        [_order(3, "BUY"), _order(4, "SELL")],
+        [_order(5, "BUY", quote=80)],
+    ]
+    history = OrderHistory(client, "BTCUSDT", limit=2, clock=clock)
+    history.refresh()
+    clock.now = 60
+    history.refresh()
+
+    assert [call.kwargs.get("orderId") for call in client.get_all_orders.call_args_list] == [
+        None,
+        3,
+        5,
+    ]
+    assert [order["orderId"] for order in history.orders()] == [4, 5]
+    assert history.last_fill_price("BUY") == 80.0
+
+
+def test_engine_update_sees_an_order_placed_within_max_age(tmp_path):
+    client = MagicMock()
+    client.get_all_orders.side_effect = [
+        [_order(1, "BUY", quote=90)],
+        [_order(2, "BUY", quote=95)],
+    ]
+    prices = pd.DataFrame(
+        {
+            "close_price": [100.0] * 5,
+            "open_price": [100.0] * 5,
+            "high_price": [101.0] * 5,
+            "low_price": [99.0] * 5,
+            "volume": [1000.0] * 5,
+        }
+    )
+    bot, engine = build_replay_engine(prices, store=StateStore(tmp_path / "history.db"))
+    bot.order_history = OrderHistory(client, "BTCUSDT", clock=FakeClock())
+    bot.getLastBuyPrice = lambda verbose=False: bot.order_history.last_fill_price("BUY")
+
+    engine.update_all_data()
+    assert bot.last_buy_price == 90.0
+    # A buy fills and the post-order update runs two seconds later, inside max_age.
+    engine.update_all_data()
+
+    assert bot.last_buy_price == 95.0
+    assert client.get_all_orders.call_count == 2
+
+
+def test_prefetched_page_stands_in_for_the_refresh():
+    client = MagicMock()
+    history = OrderHistory(client, "BTCUSDT", clock=FakeClock())
+
+    request = history.next_request()
+    history.merge_prefetched(request, [_order(1, "BUY", quote=90)])
+
+    assert history.last_fill_price("BUY") == 90.0
+    client.get_all_orders.assert_not_called()
+    assert history.next_request() == {"symbol": "BTCUSDT", "orderId": 2, "limit": 100}
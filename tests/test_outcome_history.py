@@ -1,12 +1,17 @@
+import json
 from unittest.mock import MagicMock
 
 from persistence.state_store import StateStore
-from services.order_sync import sync_filled_orders_from_binance
+from services import outcome_history
+from services.order_sync import RequestBudget, sync_filled_orders_from_binance
 from services.outcome_history import (
     build_outcome_board,
     match_closed_trades,
+    match_trades_and_open_lots,
     rebuild_outcomes_from_orders,
     realized_pnl,
+    stored_outcome_board,
+    update_outcomes_from_orders,
 )
 
 
@@ -79,11 +84,10 @@ def test_sync_filled_orders_from_binance_inserts_missing(tmp_path):
     orders = store.list_orders(since="2026-08-01T00:00:00+00:00")
     assert [o["side"] for o in orders] == ["BUY", "SELL"]
     assert orders[0]["order_id"] == 65544291506
-    client.get_all_orders.assert_called_with(
-        symbol="BTCUSDT",
-        limit=1000,
-        startTime=1785542400000,
-    )
+    first_call, second_call = client.get_all_orders.call_args_list
+    assert first_call.kwargs == {"symbol": "BTCUSDT", "limit": 1000, "startTime": 1785542400000}
+    # The resting order 1 may still fill, so the cursor stays on it.
+    assert second_call.kwargs["orderId"] == 1
 
 
 def test_sync_filled_orders_from_binance_paginates_past_page_limit(tmp_path, monkeypatch):
@@ -141,6 +145,67 @@ def test_sync_filled_orders_from_binance_paginates_past_page_limit(tmp_path, mon
     assert [o["order_id"] for o in orders] == [10, 11, 12]
 
 
+def _binance_order(order_id, status="FILLED", side="BUY", update_ms=1785542500000):
+    return {
+        "orderId": order_id,
+        "side": side,
+        "type": "LIMIT",
+        "status": status,
+        "executedQty": "0.001" if status == "FILLED" else "0",
+        "cummulativeQuoteQty": "0.1" if status == "FILLED" else "0",
+        "updateTime": update_ms + order_id,
+    }
+
+
+def test_sync_resumes_each_symbol_from_its_cursor(tmp_path):
+    store = StateStore(tmp_path / "test.db")
+    history = {
+        "BTCUSDT": [_binance_order(10), _binance_order(11, status="CANCELED")],
+        "ETHUSDT": [_binance_order(20), _binance_order(21, side="SELL")],
+    }
+    calls = []
+
+    def _orders(symbol, limit, startTime, orderId=None):
+        calls.append((symbol, orderId))
+        return [row for row in history[symbol] if orderId is None or row["orderId"] >= orderId]
+
+    client = MagicMock()
+    client.get_all_orders.side_effect = _orders
+    cutoff = "2026-08-01T00:00:00+00:00"
+
+    first = sync_filled_orders_from_binance(client, store, ["BTCUSDT", "ETHUSDT"], cutoff_iso=cutoff)
+    history["ETHUSDT"].append(_binance_order(22, side="SELL"))
+    calls.clear()
+    second = sync_filled_orders_from_binance(client, store, ["BTCUSDT", "ETHUSDT"], cutoff_iso=cutoff)
+
+    assert (first["inserted"], first["scanned"]) == (3, 4)
+    assert (second["inserted"], second["scanned"]) == (1, 1)
+    assert sorted(calls) == [("BTCUSDT", 12), ("ETHUSDT", 22)]
+    cursor = json.loads(store.get_meta("order_sync_cursor:ETHUSDT"))
+    assert cursor["order_id"] == 23 and cursor["update_time"] == 1785542500022
+    assert len(store.list_orders()) == 4
+
+    calls.clear()
+    sync_filled_orders_from_binance(client, store, ["BTCUSDT"], cutoff_iso="2026-08-02T00:00:00+00:00")
+    assert calls == [("BTCUSDT", None)]
+
+
+def test_request_budget_waits_for_the_window_to_free_weight():
+    now = [0.0]
+    waits = []
+
+    def _sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    budget = RequestBudget(weight=40, window_seconds=60, clock=lambda: now[0], sleep=_sleep)
+    for _ in range(3):
+        budget.acquire(20)
+        now[0] += 1
+
+    assert waits == [58.0]
+
+
 def test_match_closed_trades_fifo_pairs_buys_and_sells():
     closed = match_closed_trades(
         [
@@ -401,3 +466,100 @@ def test_build_outcome_board_includes_open_cost_and_skips_unfilled():
     assert len(board["operations"]) == 1
     assert len(board["open_positions"]) == 1
     assert board["open_positions"][0]["stock_code"] == "ETH"
+
+
+def _log(store, order_id, symbol, side, qty, quote, created_at):
+    store.log_order(
+        symbol,
+        {
+            "orderId": order_id,
+            "side": side,
+            "type": "MARKET",
+            "status": "FILLED",
+            "executedQty": str(qty),
+            "cummulativeQuoteQty": str(quote),
+        },
+        created_at=created_at,
+    )
+
+
+def _snapshot(store):
+    outcomes = [
+        (row["order_id"], row["quantity"], row["pnl_usd"], row["partial_sell"])
+        for row in store.outcomes_since("2026-08-01")
+    ]
+    return outcomes, store.load_open_lots()
+
+
+def _full_rebuild_of(store, tmp_path):
+    fresh = StateStore(tmp_path / "fresh.db")
+    for order in store.list_orders(status=None):
+        _log(fresh, order["order_id"], order["operation_code"], order["side"],
+             order["quantity"], order["total_quote"], order["created_at"])
+    rebuild_outcomes_from_orders(fresh, cutoff_iso="2026-08-01T00:00:00+00:00", force=True)
+    return _snapshot(fresh)
+
+
+def test_incremental_update_matches_only_new_orders(tmp_path, monkeypatch):
+    store = StateStore(tmp_path / "test.db")
+    cutoff = "2026-08-01T00:00:00+00:00"
+    _log(store, 1, "BTCUSDT", "BUY", 0.002, 140, "2026-08-02T10:00:00+00:00")
+    _log(store, 2, "ETHUSDT", "BUY", 1.0, 2000, "2026-08-02T11:00:00+00:00")
+    _log(store, 3, "BTCUSDT", "SELL", 0.001, 75, "2026-08-03T10:00:00+00:00")
+    assert update_outcomes_from_orders(store, cutoff_iso=cutoff) == 1
+
+    _log(store, 4, "BTCUSDT", "BUY", 0.001, 72, "2026-08-04T10:00:00+00:00")
+    _log(store, 5, "BTCUSDT", "SELL", 0.003, 228, "2026-08-05T10:00:00+00:00")
+    matched = []
+    original = outcome_history._match_into
+    monkeypatch.setattr(
+        outcome_history,
+        "_match_into",
+        lambda orders, *args: matched.append(len(orders)) or original(orders, *args),
+    )
+
+    assert update_outcomes_from_orders(store, cutoff_iso=cutoff) == 1
+    assert update_outcomes_from_orders(store, cutoff_iso=cutoff) == 0
+    assert matched == [2]
+    outcomes, lots = _snapshot(store)
+    assert outcomes[-1][0] == 5 and outcomes[-1][3] == 1
+    assert set(lots) == {"ETHUSDT"}
+    assert (outcomes, lots) == _full_rebuild_of(store, tmp_path)
+
+
+def test_order_older_than_high_water_mark_triggers_full_rebuild(tmp_path):
+    store = StateStore(tmp_path / "test.db")
+    cutoff = "2026-08-01T00:00:00+00:00"
+    _log(store, 1, "BTCUSDT", "BUY", 0.001, 70, "2026-08-02T10:00:00+00:00")
+    _log(store, 3, "BTCUSDT", "SELL", 0.001, 75, "2026-08-04T10:00:00+00:00")
+    update_outcomes_from_orders(store, cutoff_iso=cutoff)
+
+    # A late-synced BUY placed before the SELL changes the FIFO cost basis.
+    _log(store, 2, "BTCUSDT", "BUY", 0.001, 60, "2026-08-03T10:00:00+00:00")
+    update_outcomes_from_orders(store, cutoff_iso=cutoff)
+
+    assert _snapshot(store) == _full_rebuild_of(store, tmp_path)
+    assert store.outcomes_high_water()["id"] == 3
+
+
+def test_order_outcomes_replace_live_rows_and_feed_the_board(tmp_path):
+    store = StateStore(tmp_path / "test.db")
+    cutoff = "2026-08-01T00:00:00+00:00"
+    update_outcomes_from_orders(store, cutoff_iso=cutoff)
+    _log(store, 1, "BTCUSDT", "BUY", 0.002, 140, "2026-08-02T10:00:00+00:00")
+    _log(store, 2, "BTCUSDT", "SELL", 0.001, 80, "2026-08-03T10:00:00+00:00")
+    store.record_outcome(
+        {"kind": "take_profit", "operation_code": "BTCUSDT", "order_id": 2,
+         "pnl_usd": 9.99, "occurred_at": "2026-08-03T10:00:01+00:00"}
+    )
+
+    update_outcomes_from_orders(store, cutoff_iso=cutoff)
+    board = stored_outcome_board(store, cutoff)
+
+    rows = store.list_outcomes()
+    assert len(rows) == 1 and rows[0]["source"] == "orders" and rows[0]["pnl_usd"] == 10.0
+    orders = store.list_orders(since=cutoff)
+    closed, open_lots = match_trades_and_open_lots(orders)
+    expected = build_outcome_board(closed, open_lots=open_lots)
+    assert board["total_pnl_usd"] == expected["total_pnl_usd"] == 10.0
+    assert board["open_positions"] == expected["open_positions"]
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 from services.portfolio import (
     compute_portfolio,
     fetch_portfolio,
+    fetch_prices,
     parse_balances,
     quote_from_pair,
 )
@@ -157,3 +158,16 @@ def test_fetch_portfolio_fills_missing_entry_from_last_buy():
 
     assert snapshot["total_pnl_usd"] == 100.0
     client.get_all_orders.assert_called_once_with(symbol="BTCUSDT", limit=100)
+
+
+def test_fetch_prices_batches_symbols_in_one_request():
+    client = MagicMock()
+    client.get_symbol_ticker.return_value = [
+        {"symbol": "BTCUSDT", "price": "50000"},
+        {"symbol": "ETHUSDT", "price": "3000"},
+    ]
+
+    prices = fetch_prices(client, ["BTCUSDT", "ETHUSDT", "BTCUSDT", ""])
+
+    assert prices == {"BTCUSDT": 50000.0, "ETHUSDT": 3000.0}
+    client.get_symbol_ticker.assert_called_once_with(symbols='["BTCUSDT","ETHUSDT"]')
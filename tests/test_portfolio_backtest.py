@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from backtest.portfolio import PortfolioAsset, portfolio_backtest, signal_events
+from config.settings import RiskConfig
+from services.candle_frame import CandleFrame
+from tests.backtestRunner import backtestRunner
+
+HOUR = 3_600_000
+EPOCH = 1_704_067_200_000  # 2024-01-01 UTC
+
+
+def _candles(closes, start_hour=0) -> CandleFrame:
+    closes = np.asarray(closes, dtype=float)
+    values = np.stack([closes, closes, closes + 1, closes - 1, np.full(len(closes), 100.0)])
+    open_time = EPOCH + (np.arange(len(closes)) + start_hour) * HOUR
+    return CandleFrame(values, open_time)
+
+
+def _scripted(signals_by_first_close):
+    """Strategy whose per-candle signals are looked up by the series' first close."""
+
+    def strategy(stock_data, verbose=False, **_kwargs):
+        return None
+
+    def signal_series(stock_data, **_kwargs):
+        return np.asarray(signals_by_first_close[stock_data["close_price"].iloc[0]], dtype=float)
+
+    strategy.signal_series = signal_series
+    return strategy
+
+
+NAN = np.nan
+
+
+def test_signal_events_keeps_only_flips():
+    bars, buys = signal_events(np.array([NAN, 0, 1, 1, NAN, 1, 0, 0, 1]))
+
+    assert bars.tolist() == [2, 6, 8]
+    assert buys.tolist() == [True, False, True]
+
+
+def test_assets_share_one_quote_balance():
+    strategy = _scripted({100.0: [NAN, 1, NAN, 0], 50.0: [NAN, 1, NAN, 0]})
+    assets = [
+        PortfolioAsset("BTCUSDT", _candles([100, 100, 110, 110]), traded_percentage=50),
+        PortfolioAsset("ETHUSDT", _candles([50, 50, 50, 50]), traded_percentage=50),
+    ]
+
+    result = portfolio_backtest(assets, strategy, initial_balance=1000, fee_rate=0, slippage=0)
+
+    buys = [t for t in result.trades if t["side"] == "BUY"]
+    # The second buy sizes off what the first one left.
+    assert [t["quantity"] * t["price"] for t in buys] == [pytest.approx(500), pytest.approx(250)]
+    assert result.final_equity == pytest.approx(1050)
+    # 550 BTC + 250 ETH marked against 1050 of equity.
+    assert result.max_exposure_pct == pytest.approx(800 / 1050 * 100)
+
+
+def test_sells_free_quote_for_buys_at_the_same_candle():
+    strategy = _scripted({100.0: [NAN, 1, 0, NAN], 50.0: [NAN, NAN, 1, NAN]})
+    assets = [
+        PortfolioAsset("BTCUSDT", _candles([100, 100, 100, 100])),
+        PortfolioAsset("ETHUSDT", _candles([50, 50, 50, 50])),
+    ]
+
+    result = portfolio_backtest(assets, strategy, fee_rate=0, slippage=0)
+
+    assert [(t["operation_code"], t["side"]) for t in result.trades] == [
+        ("BTCUSDT", "BUY"),
+        ("BTCUSDT", "SELL"),
+        ("ETHUSDT", "BUY"),
+    ]
+    assert result.blocked == []
+
+
+def test_timeline_merges_assets_listed_at_different_times():
+    strategy = _scripted({100.0: [NAN] * 4, 50.0: [NAN, 1]})
+    assets = [
+        PortfolioAsset("BTCUSDT", _candles([100, 101, 102, 103])),
+        PortfolioAsset("ETHUSDT", _candles([50, 60], start_hour=3)),
+    ]
+
+    result = portfolio_backtest(assets, strategy, fee_rate=0, slippage=0)
+
+    assert len(result.timeline) == 5
+    assert result.equity_curve[:4].tolist() == [1000.0] * 4
+    assert result.asset_exposure["ETHUSDT"][-1] == pytest.approx(1.0)
+    assert result.asset_exposure["BTCUSDT"][-1] == 0.0
+
+
+def test_daily_trade_limit_blocks_orders_per_asset():
+    strategy = _scripted({100.0: [NAN, 1, 0, 1, 0]})
+    assets = [PortfolioAsset("BTCUSDT", _candles([100, 100, 100, 100, 100]))]
+
+    result = portfolio_backtest(
+        assets, strategy, risk=RiskConfig(max_trades_per_day=2), fee_rate=0, slippage=0
+    )
+
+    assert [t["side"] for t in result.trades] == ["BUY", "SELL"]
+    assert {b["reason"] for b in result.blocked} == {"max trades per day reached"}
+
+
+def test_single_asset_matches_backtest_runner():
+    closes = 100 + 10 * np.sin(np.arange(120) / 6)
+    signals = np.where(np.diff(closes, prepend=closes[0]) > 0, 1.0, 0.0)
+    signals[0] = NAN
+    strategy = _scripted({closes[0]: signals})
+    candles = _candles(closes)
+
+    expected = backtestRunner(
+        stock_data=candles.to_frame(), strategy_function=strategy, periods=120, verbose=False
+    )
+    result = portfolio_backtest(
+        [PortfolioAsset("BTCUSDT", candles)],
+        strategy,
+        risk=RiskConfig(max_daily_loss_usdt=1e9),
+    )
+
+    assert len(result.trades) == expected["trades"]
+    assert result.max_drawdown_pct == pytest.approx(expected["max_drawdown_pct"], rel=1e-3)
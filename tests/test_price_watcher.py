@@ -0,0 +1,124 @@
+import threading
+
+import pandas as pd
+
+from backtest.replay import build_replay_engine
+from core.price_watcher import PriceWatcher
+from persistence.state_store import StateStore
+
+
+def _flat(n: int, price: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "close_price": [price] * n,
+            "open_price": [price] * n,
+            "high_price": [price + 1] * n,
+            "low_price": [price - 1] * n,
+            "volume": [1000.0] * n,
+        }
+    )
+
+
+def _holding_engine(tmp_path, prices: pd.DataFrame, **kwargs):
+    bot, engine = build_replay_engine(
+        prices,
+        store=StateStore(tmp_path / "watch.db"),
+        quote_balance=0.0,
+        base_balance=0.1,
+        stop_loss_pct=2.0,
+        **kwargs,
+    )
+    engine.bootstrap()
+    bot.last_buy_price = 100.0
+    return bot, engine
+
+
+def test_watcher_fires_stop_loss_on_live_price(tmp_path):
+    data = _flat(5, 100.0)
+    data.loc[3, "close_price"] = 97.0  # last closed candle already below the stop
+    bot, engine = _holding_engine(tmp_path, data)
+    watcher = PriceWatcher(engine)
+
+    assert watcher.on_price(99.0) is None
+    assert bot.actual_trade_position is True
+
+    assert watcher.on_price(97.5) == "stop_loss"
+    assert bot.actual_trade_position is False
+    assert bot.broker.orders[-1]["side"] == "SELL"
+    assert watcher.on_price(90.0) is None
+
+
+def test_watcher_fires_take_profit_on_live_price(tmp_path):
+    bot, engine = _holding_engine(tmp_path, _flat(5, 100.0))
+    engine.risk_manager.take_profit_at = [5.0]
+    engine.risk_manager.take_profit_amount = [50.0]
+    watcher = PriceWatcher(engine)
+
+    assert watcher.on_price(104.0) is None
+    assert watcher.on_price(105.5) == "take_profit"
+    assert bot.take_profit_index == 1
+    assert float(bot.broker.orders[-1]["executedQty"]) == 0.05
+
+
+def test_watcher_refreshes_balance_after_an_exit(tmp_path):
+    bot, engine = _holding_engine(tmp_path, _flat(5, 1000.0))
+    bot.last_buy_price = 1000.0
+    engine.risk_manager.take_profit_at = [5.0, 10.0]
+    engine.risk_manager.take_profit_amount = [50.0, 50.0]
+    sell = bot.sellMarketOrder
+
+    def sell_keeping_stale_balance(quantity=None):
+        # Like BinanceTraderBot: a fill does not touch last_stock_account_balance.
+        stale = bot.last_stock_account_balance
+        order = sell(quantity)
+        bot.last_stock_account_balance = stale
+        return order
+
+    bot.sellMarketOrder = sell_keeping_stale_balance
+    watcher = PriceWatcher(engine)
+
+    assert watcher.on_price(1055.0) == "take_profit"
+    assert bot.last_stock_account_balance == 0.05
+    assert watcher.on_price(1105.0) == "take_profit"
+    assert float(bot.broker.orders[-1]["executedQty"]) == 0.025
+    assert bot.last_stock_account_balance == 0.025
+    assert bot.actual_trade_position is True
+
+
+def test_watcher_skips_while_cycle_runs(tmp_path):
+    data = _flat(5, 100.0)
+    data.loc[3, "close_price"] = 97.0
+    bot, engine = _holding_engine(tmp_path, data)
+    watcher = PriceWatcher(engine)
+    results = []
+
+    with engine._cycle_lock:
+        thread = threading.Thread(target=lambda: results.append(watcher.on_price(90.0)))
+        thread.start()
+        thread.join()
+
+    assert results == [None]
+    assert bot.actual_trade_position is True
+
+
+def test_polling_mode_reads_price_source(tmp_path):
+    data = _flat(5, 100.0)
+    data.loc[3, "close_price"] = 97.0
+    bot, engine = _holding_engine(tmp_path, data)
+    fired = threading.Event()
+    watcher = PriceWatcher(engine, poll_seconds=0.01, price_source=lambda: 90.0)
+    original = engine.check_exit_price
+
+    def check(price):
+        action = original(price)
+        if action:
+            fired.set()
+        return action
+
+    engine.check_exit_price = check
+    watcher.start()
+    try:
+        assert fired.wait(5)
+    finally:
+        watcher.stop()
+    assert bot.actual_trade_position is False
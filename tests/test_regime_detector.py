@@ -95,3 +95,13 @@ def test_channel_levels_exposed(detector):
         assert result.resistance is not None
         assert result.resistance > result.support
         assert result.channel_width_pct > 0
+
+
+def test_indicator_stream_matches_batch(detector):
+    from indicators.streaming import IndicatorStream
+
+    for data in (_make_range_data(), _make_trend_data()):
+        batch = detector.evaluate(data)
+        streamed = detector.evaluate(data, indicators=IndicatorStream().sync(data))
+        assert streamed.regime == batch.regime
+        assert streamed.score == batch.score
@@ -1,9 +1,12 @@
+import sqlite3
 import tempfile
+import threading
+import time
 from pathlib import Path
 
 import pytest
 
-from persistence.state_store import BotState, StateStore
+from persistence.state_store import BUSY_TIMEOUT_MS, MEMORY_DB, MIGRATIONS, BotState, StateStore
 
 
 def test_state_persistence_and_reconcile():
@@ -99,3 +102,268 @@ def test_daily_risk_roundtrip_and_derived(tmp_path):
     assert derived["loss_usdt"] == pytest.approx(15.0)
     assert store.derived_daily_risk("2026-08-21", "BTCUSDT")["trades"] == 0
 
+
+
+def test_memory_store_keeps_one_database():
+    store = StateStore(":memory:")
+
+    store.save_state(BotState(operation_code="BTCUSDT", last_buy_price=42.0))
+    store.set_meta("k", "v")
+
+    assert store.load_state("BTCUSDT").last_buy_price == 42.0
+    assert store.get_meta("k") == "v"
+
+
+def test_connections_are_pooled_per_thread_in_wal_mode(tmp_path):
+    store = StateStore(tmp_path / "pool.db")
+    conn = store._connect()
+    other = []
+    worker = threading.Thread(target=lambda: other.append(store._connect()))
+    worker.start()
+    worker.join()
+
+    assert store._connect() is conn
+    assert other[0] is not conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == BUSY_TIMEOUT_MS
+
+
+def test_readers_do_not_wait_for_an_open_write(tmp_path):
+    store = StateStore(tmp_path / "wal.db")
+    store.save_state(BotState(operation_code="BTCUSDT", last_buy_price=100))
+    writing, release = threading.Event(), threading.Event()
+
+    def writer():
+        conn = store._connect()
+        with conn:
+            conn.execute("UPDATE bot_state SET last_buy_price = 200")
+            writing.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    writing.wait(5)
+    started = time.monotonic()
+    seen = store.load_state("BTCUSDT").last_buy_price
+    elapsed = time.monotonic() - started
+    release.set()
+    thread.join()
+
+    assert seen == 100
+    assert elapsed < 1
+    assert store.load_state("BTCUSDT").last_buy_price == 200
+
+
+def test_close_releases_connections_and_store_reconnects(tmp_path):
+    store = StateStore(tmp_path / "close.db")
+    conn = store._connect()
+
+    store.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    store.set_meta("k", "v")
+    assert store.get_meta("k") == "v"
+    assert store._connect() is not conn
+
+
+def test_connections_of_finished_threads_are_closed(tmp_path):
+    store = StateStore(tmp_path / "threads.db")
+    opened = []
+
+    def request():
+        opened.append(store._connect())
+        store.load_state("BTCUSDT")
+
+    for _ in range(50):
+        worker = threading.Thread(target=request)
+        worker.start()
+        worker.join()
+
+    assert len(store._pool) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+    assert store.load_state("BTCUSDT").operation_code == "BTCUSDT"
+
+
+def test_memory_store_shares_one_database_across_threads():
+    store = StateStore(MEMORY_DB)
+    store.set_meta("k", "v")
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(store.get_meta("k")))
+    worker.start()
+    worker.join()
+
+    assert seen == ["v"]
+
+
+def test_batch_coalesces_state_saves_until_it_exits(tmp_path):
+    store = StateStore(tmp_path / "batch.db")
+    reader = StateStore(tmp_path / "batch.db")
+
+    with store.batch():
+        store.save_state(BotState(operation_code="BTCUSDT", take_profit_index=1))
+        with store.batch():
+            store.save_state(BotState(operation_code="BTCUSDT", take_profit_index=2))
+        store.save_state(BotState(operation_code="ETHUSDT", last_buy_price=10))
+        assert store.load_state("BTCUSDT").take_profit_index == 2
+        assert reader.load_state("BTCUSDT").take_profit_index == 0
+
+    assert reader.load_state("BTCUSDT").take_profit_index == 2
+    assert reader.load_state("ETHUSDT").last_buy_price == 10
+    assert store.flush() == 0
+
+
+def test_order_records_flush_pending_states_durably(tmp_path):
+    store = StateStore(tmp_path / "durable.db")
+    reader = StateStore(tmp_path / "durable.db")
+
+    with store.batch():
+        store.save_state(BotState(operation_code="BTCUSDT", actual_trade_position=True))
+        assert store.log_order("BTCUSDT", {"orderId": 1, "side": "BUY", "status": "FILLED"})
+        # Committed before the batch ends, together with the state it belongs to.
+        assert len(reader.list_orders()) == 1
+        assert reader.load_state("BTCUSDT").actual_trade_position is True
+
+    assert store._connect().execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_failed_writes_keep_pending_states_queued(tmp_path):
+    store = StateStore(tmp_path / "retry.db")
+    conn = store._connect()
+    conn.execute(
+        "CREATE TRIGGER reject_orders BEFORE INSERT ON orders_log "
+        "BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+    )
+    conn.execute(
+        "CREATE TRIGGER reject_states BEFORE INSERT ON bot_state "
+        "WHEN NEW.take_profit_index = 2 BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+    )
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with store.batch():
+            store.save_state(BotState(operation_code="BTCUSDT", take_profit_index=1))
+            store.log_order("BTCUSDT", {"orderId": 1, "side": "BUY", "status": "FILLED"})
+    with pytest.raises(sqlite3.IntegrityError):
+        with store.batch():
+            store.save_state(BotState(operation_code="ETHUSDT", take_profit_index=2))
+
+    assert store.load_state("BTCUSDT").take_profit_index == 1
+    conn.execute("DROP TRIGGER reject_states")
+    assert store.flush() == 1
+    reader = StateStore(tmp_path / "retry.db")
+    assert reader.load_state("BTCUSDT").take_profit_index == 1
+    assert reader.load_state("ETHUSDT").take_profit_index == 2
+
+
+def test_flush_interval_writes_state_in_the_background(tmp_path):
+    store = StateStore(tmp_path / "timer.db", flush_interval=0.05)
+    reader = StateStore(tmp_path / "timer.db")
+
+    store.save_state(BotState(operation_code="BTCUSDT", take_profit_index=3))
+    deadline = time.monotonic() + 5
+    while reader.load_state("BTCUSDT").take_profit_index != 3 and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert reader.load_state("BTCUSDT").take_profit_index == 3
+    store.save_state(BotState(operation_code="ETHUSDT", take_profit_index=1))
+    store.close()
+    assert reader.load_state("ETHUSDT").take_profit_index == 1
+
+
+def test_background_flush_survives_a_failed_write(tmp_path):
+    store = StateStore(tmp_path / "timer.db", flush_interval=0.05)
+    reader = StateStore(tmp_path / "timer.db")
+    write_pending = store._write_pending
+    failures = []
+
+    def fail_once(conn):
+        if not failures:
+            failures.append(True)
+            raise sqlite3.OperationalError("database is locked")
+        return write_pending(conn)
+
+    store._write_pending = fail_once
+    store.save_state(BotState(operation_code="BTCUSDT", take_profit_index=3))
+    deadline = time.monotonic() + 5
+    while reader.load_state("BTCUSDT").take_profit_index != 3 and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert failures
+    assert reader.load_state("BTCUSDT").take_profit_index == 3
+    store.save_state(BotState(operation_code="ETHUSDT", take_profit_index=1))
+    deadline = time.monotonic() + 5
+    while reader.load_state("ETHUSDT").take_profit_index != 1 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert reader.load_state("ETHUSDT").take_profit_index == 1
+    store.close()
+
+
+def _query_plans(store, call):
+    """EXPLAIN QUERY PLAN of every SELECT ``call`` runs, with its bound values."""
+    conn = store._connect()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+    plans = []
+    for sql in statements:
+        if sql.lstrip().upper().startswith("SELECT"):
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+            plans.append(" | ".join(row["detail"] for row in rows))
+    return plans
+
+
+def _store_with_orders(tmp_path):
+    store = StateStore(tmp_path / "plans.db")
+    for i in range(20):
+        store.log_order(
+            "BTCUSDT" if i % 2 else "ETHUSDT",
+            {"orderId": i, "side": "BUY", "status": "FILLED"},
+            created_at=f"2026-08-{i + 1:02d}T10:00:00+00:00",
+        )
+    return store
+
+
+def test_migrations_are_versioned_and_replayable(tmp_path):
+    store = StateStore(tmp_path / "versions.db")
+    conn = store._connect()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+
+    # A pre-versioning database reruns every step without failing.
+    conn.execute("PRAGMA user_version = 0")
+    StateStore(tmp_path / "versions.db")
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    indexes = {row["name"] for row in conn.execute("PRAGMA index_list(orders_log)")}
+    assert {"idx_orders_log_status_created", "idx_orders_log_created"} <= indexes
+
+
+def test_list_orders_queries_use_indexes(tmp_path):
+    store = _store_with_orders(tmp_path)
+
+    by_status = _query_plans(store, lambda: store.list_orders(since="2026-08-10"))
+    any_status = _query_plans(store, lambda: store.list_orders(status=None, since="2026-08-10"))
+
+    assert "USING INDEX idx_orders_log_status_created" in by_status[0]
+    assert "USING INDEX idx_orders_log_created" in any_status[0]
+    assert "TEMP B-TREE" not in by_status[0] + any_status[0]
+    assert len(store.list_orders(since="2026-08-10")) == 11
+    assert len(store.list_orders(status=None)) == 20
+
+
+def test_derived_daily_risk_uses_covering_indexes(tmp_path):
+    store = _store_with_orders(tmp_path)
+    store.record_outcome(
+        {"kind": "stop_loss", "operation_code": "BTCUSDT", "pnl_usd": -4.0,
+         "occurred_at": "2026-08-02T11:00:00+00:00"}
+    )
+
+    plans = _query_plans(store, lambda: store.derived_daily_risk("2026-08-02", "BTCUSDT"))
+
+    assert "USING COVERING INDEX idx_orders_log_operation_status_created" in plans[0]
+    assert "USING COVERING INDEX idx_trade_outcomes_operation_day" in plans[1]
+    assert store.derived_daily_risk("2026-08-02", "BTCUSDT") == {"trades": 1, "loss_usdt": 4.0}
+    assert store.derived_daily_risk("2026-08-03", "BTCUSDT") == {"trades": 0, "loss_usdt": 0.0}
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.adx import adx
+from indicators.atr import atr, compute_trailing_stop, compute_ut_position
+from indicators.ema import ema
+from indicators.macd import macd
+from indicators.rsi import rsi
+from indicators.streaming import (
+    IndicatorStream,
+    StreamingADX,
+    StreamingATR,
+    StreamingEMA,
+    StreamingMACD,
+    StreamingRSI,
+    StreamingSMA,
+    StreamingTrailingStop,
+    StreamingVortex,
+    iter_candles,
+)
+from indicators.vortex import vortex
+
+
+def _random_ohlc(n: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    spread = rng.uniform(0.2, 2.0, n)
+    return pd.DataFrame(
+        {
+            "open_time": pd.date_range("2024-01-01", periods=n, freq="4h", tz="UTC"),
+            "open_price": close + rng.normal(0, 0.3, n),
+            "high_price": close + spread,
+            "low_price": close - spread,
+            "close_price": close,
+            "volume": rng.uniform(500, 1500, n),
+        }
+    )
+
+
+def _streamed(indicator, frame):
+    return np.array([indicator.update(candle) for candle in iter_candles(frame)])
+
+
+BATCH_CASES = [
+    (lambda: StreamingEMA(20), lambda df: ema(df["close_price"], 20)),
+    (lambda: StreamingSMA(30), lambda df: df["close_price"].rolling(30).mean()),
+    (lambda: StreamingSMA(20, "volume"), lambda df: df["volume"].rolling(20).mean()),
+    (lambda: StreamingRSI(14), lambda df: rsi(df["close_price"], 14, last_only=False)),
+    (lambda: StreamingATR(14), lambda df: atr(df, window=14)),
+    (lambda: StreamingADX(14), lambda df: adx(df, period=14)),
+    (lambda: StreamingMACD(12, 26, 9), lambda df: macd(df["close_price"], 12, 26, 9)[0]),
+    (lambda: StreamingVortex(14), lambda df: vortex(df, 14, positive=True)),
+    (lambda: StreamingVortex(14, positive=False), lambda df: vortex(df, 14, positive=False)),
+]
+
+
+@pytest.mark.parametrize("factory,batch", BATCH_CASES)
+def test_streaming_matches_batch_indicator(factory, batch):
+    frame = _random_ohlc(300)
+    expected = batch(frame).to_numpy(dtype=float)
+    np.testing.assert_allclose(_streamed(factory(), frame), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_streaming_trailing_stop_matches_batch():
+    frame = _random_ohlc(400)
+    indicator = StreamingTrailingStop(atr_period=14, multiplier=2.5)
+    positions = []
+    stops = []
+    for candle in iter_candles(frame):
+        stops.append(indicator.update(candle))
+        positions.append(indicator.position)
+    expected = compute_trailing_stop(frame["close_price"], atr(frame, 14), 2.5)
+    np.testing.assert_allclose(stops, expected.to_numpy(), rtol=1e-9)
+    np.testing.assert_array_equal(positions, compute_ut_position(frame["close_price"], expected))
+
+
+@pytest.mark.parametrize("factory,_batch", BATCH_CASES)
+def test_revise_replaces_forming_candle(factory, _batch):
+    frame = _random_ohlc(120)
+    candles = list(iter_candles(frame))
+    forming = dict(candles[-1], close_price=candles[-1]["close_price"] + 5)
+
+    revised = factory()
+    for candle in candles[:-1]:
+        revised.update(candle)
+    revised.update(forming)
+    revised.revise(candles[-1])
+
+    direct = factory().seed(frame)
+    assert revised.value == pytest.approx(direct.value, rel=1e-12, nan_ok=True)
+    assert revised.tail(3) == pytest.approx(direct.tail(3), rel=1e-12, nan_ok=True)
+
+
+def test_indicator_stream_syncs_sliding_window_by_open_time():
+    full = _random_ohlc(260)
+    stream = IndicatorStream()
+    stream.sync(full.iloc[:200].reset_index(drop=True))
+    adx_state = stream.adx(14)
+
+    forming = full.iloc[:201].reset_index(drop=True).copy()
+    forming.loc[200, "close_price"] += 3
+    stream.sync(forming.iloc[1:].reset_index(drop=True))
+    stream.sync(full.iloc[5:230].reset_index(drop=True))
+
+    assert stream.adx(14) is adx_state
+    assert adx_state.count == 230
+    expected = adx(full.iloc[:230], period=14)
+    assert adx_state.value == pytest.approx(float(expected.iloc[-1]), rel=1e-9)
+    assert adx_state.tail(3) == pytest.approx(expected.iloc[-3:].tolist(), rel=1e-9)
+
+
+def test_indicator_stream_reseeds_on_unrelated_frame():
+    stream = IndicatorStream()
+    stream.sync(_random_ohlc(100, seed=1))
+    stream.rsi(14)
+    other = _random_ohlc(80, seed=2)
+    other["open_time"] = other["open_time"] + pd.Timedelta(days=365)
+    stream.sync(other)
+    expected = rsi(other["close_price"], 14, last_only=True)
+    assert stream.rsi(14).value == pytest.approx(expected, rel=1e-9)
+    assert stream.rsi(14).count == 80
+
+
+def test_indicator_stream_positional_sync_without_open_time():
+    full = _random_ohlc(150).drop(columns=["open_time"])
+    stream = IndicatorStream()
+    stream.sync(full.iloc[:100])
+    ema_state = stream.ema(20)
+    stream.sync(full.iloc[:150])
+    assert ema_state.count == 150
+    assert ema_state.value == pytest.approx(float(ema(full["close_price"], 20).iloc[-1]))
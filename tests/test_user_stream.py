@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+from websockets.sync.server import serve
+
+from services.user_stream import AccountState, UserDataStream
+
+
+def _execution(order_id: int, status: str, side: str = "BUY", **fields) -> dict:
+    event = {
+        "e": "executionReport",
+        "E": 1_000,
+        "s": "BTCUSDT",
+        "S": side,
+        "o": "LIMIT",
+        "q": "0.010",
+        "p": "50000",
+        "X": status,
+        "i": order_id,
+        "z": "0",
+        "Z": "0",
+        "O": 900,
+        "T": 1_000,
+    }
+    event.update(fields)
+    return event
+
+
+def _account(btc: str = "0.0", usdt: str = "1000.0", update_time: int = 500) -> dict:
+    return {
+        "updateTime": update_time,
+        "balances": [
+            {"asset": "BTC", "free": btc, "locked": "0.0"},
+            {"asset": "USDT", "free": usdt, "locked": "0.0"},
+        ],
+    }
+
+
+def test_account_state_tracks_orders_balances_and_fills():
+    state = AccountState()
+    state.load_snapshot(_account(), {"BTCUSDT": []}, {"BTCUSDT": []})
+
+    state.apply(_execution(7, "NEW"))
+    assert [order["orderId"] for order in state.open_orders("BTCUSDT")] == [7]
+
+    state.apply(_execution(7, "FILLED", z="0.010", Z="501.0", T=2_000))
+    state.apply(
+        {"e": "outboundAccountPosition", "u": 2_000, "B": [{"a": "BTC", "f": "0.01", "l": "0"}]}
+    )
+    state.apply(
+        {"e": "outboundAccountPosition", "u": 100, "B": [{"a": "BTC", "f": "9", "l": "0"}]}
+    )
+
+    assert state.open_orders("BTCUSDT") == []
+    assert state.last_fill_price("BTCUSDT", "BUY") == 50100.0
+    balances = {row["asset"]: row for row in state.account_data()["balances"]}
+    assert balances["BTC"]["free"] == "0.01"
+    assert balances["USDT"]["free"] == "1000.0"
+
+
+def test_snapshot_uses_last_filled_order_per_side():
+    orders = [
+        {"side": "BUY", "status": "FILLED", "time": 1, "executedQty": "1", "cummulativeQuoteQty": "90"},
+        {"side": "BUY", "status": "FILLED", "time": 3, "executedQty": "1", "cummulativeQuoteQty": "95"},
+        {"side": "SELL", "status": "CANCELED", "time": 4, "executedQty": "0", "cummulativeQuoteQty": "0"},
+    ]
+    state = AccountState()
+    state.load_snapshot(_account(), {}, {"BTCUSDT": orders})
+    assert state.last_fill_price("BTCUSDT", "BUY") == 95.0
+    assert state.last_fill_price("BTCUSDT", "SELL") == 0.0
+
+    state.apply(_execution(9, "FILLED", z="1", Z="80", T=2))
+    assert state.last_fill_price("BTCUSDT", "BUY") == 95.0
+
+
+class StandInUserStream:
+    def __init__(self):
+        self.outbox: list[str] = []
+        self.paths: list[str] = []
+        self._drop = threading.Event()
+        self._server = serve(self._handler, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self._server.socket.getsockname()[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def _handler(self, connection):
+        self.paths.append(connection.request.path)
+        self._drop.clear()
+        while not self._drop.is_set():
+            while self.outbox:
+                connection.send(self.outbox.pop(0))
+            time.sleep(0.01)
+
+    def drop(self):
+        self._drop.set()
+
+    def close(self):
+        self.drop()
+        self._server.shutdown()
+
+
+def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_stream_reconciles_on_connect_and_after_reconnect():
+    server = StandInUserStream()
+    client = MagicMock()
+    client.stream_get_listen_key.side_effect = ["key-1", "key-2"]
+    client.get_account.side_effect = [_account(usdt="1000.0"), _account(usdt="750.0")]
+    client.get_open_orders.return_value = []
+    client.get_all_orders.return_value = []
+    stream = UserDataStream(client, ["BTCUSDT"], ws_url=server.url, reconnect_delay=0.05)
+    stream.start()
+    try:
+        _wait_for(lambda: stream.is_live)
+        assert server.paths == ["/ws/key-1"]
+        assert client.get_account.call_count == 1
+
+        server.outbox.append(json.dumps(_execution(11, "NEW")))
+        _wait_for(lambda: stream.state.open_orders("BTCUSDT"))
+
+        server.drop()
+        _wait_for(lambda: len(server.paths) == 2 and stream.is_live)
+        assert server.paths[1] == "/ws/key-2"
+        assert client.get_account.call_count == 2
+        balances = {row["asset"]: row for row in stream.state.account_data()["balances"]}
+        assert balances["USDT"]["free"] == "750.0"
+        assert stream.state.open_orders("BTCUSDT") == []
+    finally:
+        stream.stop()
+        server.close()
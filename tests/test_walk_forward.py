@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.sweep import SweepSpec
+from backtest.walk_forward import stitch_equity, walk_forward, window_bounds
+from services.candle_frame import CandleFrame
+from strategies.atr_trend import getAtrTrendStrategy
+from tests.backtestRunner import backtestRunner
+
+
+def _candles(n: int = 600) -> CandleFrame:
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0.05, 1.5, n))
+    frame = pd.DataFrame(
+        {
+            "close_price": close,
+            "open_price": close - 0.3,
+            "high_price": close + 1.0,
+            "low_price": close - 1.0,
+            "volume": rng.uniform(100, 1000, n),
+        }
+    )
+    return CandleFrame.from_frame(frame)
+
+
+def _spec() -> SweepSpec:
+    return SweepSpec(
+        strategy="atr_trend",
+        grid={"atr_multiplier": [1.5, 3.0], "trend_sma_period": [20, 50]},
+        fixed={"atr_period": 10},
+    )
+
+
+def test_window_bounds_roll_by_test_size():
+    assert window_bounds(100, train_size=50, test_size=20) == [(0, 50, 70), (20, 70, 90)]
+    assert window_bounds(60, train_size=50, test_size=20) == []
+    with pytest.raises(ValueError):
+        window_bounds(100, train_size=50, test_size=20, step=10)
+
+
+def test_warmup_candles_do_not_trade():
+    frame = _candles(300).to_frame()
+    kwargs = {"atr_period": 10, "trend_sma_period": 20}
+
+    result = backtestRunner(frame, getAtrTrendStrategy, periods=300, verbose=False, warmup=200, **kwargs)
+
+    assert len(result["equity_curve"]) == 101
+    assert result["equity_curve"][0] == 1000
+
+
+def test_walk_forward_picks_best_training_params_and_stitches_oos():
+    candles = _candles()
+    frame = candles.to_frame()
+
+    result = walk_forward(_spec(), candles, train_size=300, test_size=100, max_workers=2)
+
+    assert [w.test_start for w in result.windows] == [300, 400, 500]
+    assert len(result.equity_curve) == 1 + 3 * 100
+
+    window = result.windows[1]
+    train = frame.iloc[window.train_start : window.test_start]
+    scores = {
+        (params["atr_multiplier"], params["trend_sma_period"]): backtestRunner(
+            train, getAtrTrendStrategy, periods=len(train), verbose=False, atr_period=10, **params
+        )["sharpe_approx"]
+        for params in _spec().combinations()
+    }
+    assert window.train["sharpe_approx"] == max(scores.values())
+
+    oos = backtestRunner(
+        frame.iloc[window.train_start : window.test_end],
+        getAtrTrendStrategy,
+        periods=window.test_end - window.train_start,
+        verbose=False,
+        warmup=window.test_start - window.train_start,
+        atr_period=10,
+        **window.params,
+    )
+    assert window.test["final_balance"] == pytest.approx(oos["final_balance"])
+
+
+def test_stitch_equity_compounds_windows():
+    class Window:
+        def __init__(self, curve):
+            self.test = {"equity_curve": curve}
+
+    curve = stitch_equity([Window([1000, 1100]), Window([1000, 900, 950])], 1000)
+
+    assert curve == pytest.approx([1000, 1100, 990, 1045])